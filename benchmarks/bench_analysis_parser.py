@@ -0,0 +1,148 @@
+"""
+AnalysisParser.parse のベンチマーク
+
+100KB以上の分析結果テキスト（前後に波括弧を含む文章と複数のコードブロックを含む）を
+生成し、従来の find/rfind による抽出と1回走査の抽出の処理時間を比較する。
+
+実行方法:
+    python -m benchmarks.bench_analysis_parser
+"""
+
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+from src.analysis import analysis_parser
+from src.analysis.analysis_parser import AnalysisParser
+
+# 生成する分析結果の問題点の件数（おおよそ100KB / 500KB / 1MB）
+FINDING_COUNTS = [400, 2000, 4000]
+
+# 計測の繰り返し回数
+REPEAT = 5
+
+
+def build_output(finding_count: int, with_example: bool) -> str:
+    """
+    ベンチマーク用の分析結果テキストを生成
+
+    Args:
+        finding_count: 問題点の件数
+        with_example: 分析結果の前に波括弧を含む文章と例示のコードブロックを含めるかどうか
+
+    Returns:
+        分析結果テキスト
+    """
+    findings = [
+        {
+            "category": "マルチAZ構成",
+            "severity": "高",
+            "description": f"module.app.aws_db_instance.db[{i}] は単一AZ構成です {{multi_az = false}}",
+            "recommendation": 'multi_az = true を設定してください（"Multi-AZ" 配置）',
+        }
+        for i in range(finding_count)
+    ]
+    result = {
+        "overview": "可用性の評価結果です。",
+        "availability_score": 62,
+        "findings": findings,
+        "recommendations": [{"priority": "高", "description": "RDSをマルチAZ構成にする"}],
+    }
+    prefix = (
+        "以下の形式 {overview, findings} で回答します。例:\n"
+        '```json\n{"example": {"key": "value"}}\n```\n'
+        if with_example
+        else ""
+    )
+    return (
+        prefix
+        + "分析結果:\n```json\n"
+        + json.dumps(result, ensure_ascii=False, indent=2)
+        + "\n```\n"
+    )
+
+
+def legacy_parse(analysis_text: str) -> Dict[str, Any]:
+    """
+    従来の find/rfind による抽出（比較用）
+
+    Args:
+        analysis_text: 分析結果テキスト
+
+    Returns:
+        解析結果
+    """
+    try:
+        result: Dict[str, Any] = json.loads(analysis_text)
+        return result
+    except json.JSONDecodeError:
+        json_start = analysis_text.find("```json")
+        if json_start >= 0:
+            json_end = analysis_text.rfind("```")
+            json_text = analysis_text[json_start + 7 : json_end].strip()
+        else:
+            json_start = analysis_text.find("{")
+            json_end = analysis_text.rfind("}") + 1
+            json_text = analysis_text[json_start:json_end].strip()
+        try:
+            result = json.loads(json_text)
+            return result
+        except json.JSONDecodeError:
+            return {"raw_analysis": analysis_text}
+
+
+def measure(func: Callable[[str], Dict[str, Any]], text: str) -> float:
+    """
+    関数の平均実行時間（ミリ秒）を計測
+
+    Args:
+        func: 計測する関数
+        text: 関数に渡すテキスト
+
+    Returns:
+        平均実行時間（ミリ秒）
+    """
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        func(text)
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示"""
+    parser = AnalysisParser()
+    orjson_module = analysis_parser.orjson
+    rows: List[str] = []
+
+    cases = [(count, with_example) for with_example in (False, True) for count in FINDING_COUNTS]
+    for count, with_example in cases:
+        text = build_output(count, with_example)
+        legacy_ok = "findings" in legacy_parse(text)
+        assert len(parser.parse(text)["findings"]) == count
+
+        legacy_ms = measure(legacy_parse, text)
+        analysis_parser.orjson = None
+        json_ms = measure(parser.parse, text)
+        analysis_parser.orjson = orjson_module
+        orjson_ms = measure(parser.parse, text) if orjson_module is not None else float("nan")
+
+        rows.append(
+            f"{'あり' if with_example else 'なし':>4}  "
+            f"{len(text.encode('utf-8')) / 1024:>6.0f}KB  "
+            f"{legacy_ms:>9.2f}ms {'(失敗)' if not legacy_ok else '      '}  "
+            f"{json_ms:>9.2f}ms  {orjson_ms:>9.2f}ms"
+        )
+
+    print("例示    サイズ     従来方式            1回走査+json  1回走査+orjson")
+    for row in rows:
+        print(row)
+
+    # 途中で途切れたJSON（候補をすべてデコードしても分析結果が見つからない最悪ケース）
+    text = build_output(FINDING_COUNTS[-1], True)[:-10]
+    assert "raw_analysis" in parser.parse(text)
+    size_kb = len(text.encode("utf-8")) / 1024
+    print(f"途中で途切れたJSON（{size_kb:.0f}KB）: 1回走査 {measure(parser.parse, text):.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+HTMLレポートの生成（ReportGenerator.export_as_html）のベンチマーク
+
+1k / 10k / 50k 件の問題点を含む合成の分析結果から、文字列の連結（html += ...）で
+ページ全体を作成してから書き出す方式（従来の方式）と、セクションごとにバッファ付きの
+ファイルへ直接書き出す方式でHTMLレポートを生成し、処理時間とメモリ使用量のピークを比較する。
+2つの方式の出力は同じになることを確認する。あわせて、問題点をJSONとして埋め込む表示方式
+（paginated）の処理時間とファイルサイズを計測する。
+
+実行方法:
+    python -m benchmarks.bench_html_report
+"""
+
+import html
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.reporting import html_templates as templates
+from src.reporting.report_generator import ReportGenerator
+
+# 生成する問題点の件数
+FINDING_COUNTS = [1000, 10000, 50000]
+
+# 計測の繰り返し回数
+REPEAT = 3
+
+# 問題点の値の候補（エスケープが必要な文字を含む）
+CATEGORIES = ["単一AZ構成", "バックアップ", "Auto Scaling", "ロードバランサー", "監視"]
+SEVERITIES = ["高", "中", "低"]
+DESCRIPTIONS = [
+    "aws_db_instance.main[{i}] の multi_az が false に設定されています。",
+    "module.app.aws_autoscaling_group.web[{i}] の min_size が 1 です。",
+    "aws_lb.public[{i}] のサブネットが <var.subnets> に依存しており、AZ数を確認できません。",
+    'aws_dynamodb_table.sessions[{i}] で point_in_time_recovery が "無効" です。',
+]
+RECOMMENDATIONS = [
+    "multi_az = true を設定してください。",
+    "min_size を 2 以上にし、複数のAZにまたがるサブネットを指定してください。",
+    "バックアップの保持期間 (backup_retention_period) を 7 日以上 & 自動化してください。",
+]
+
+
+def build_results(finding_count: int, seed: int = 0) -> Dict[str, Any]:
+    """
+    ベンチマーク用の分析結果を生成
+
+    Args:
+        finding_count: 問題点の件数
+        seed: 乱数のシード
+
+    Returns:
+        AvailabilityChecker.analyze_with_bedrockの戻り値と同じ形式のデータ
+    """
+    rng = random.Random(seed)
+    findings = [
+        {
+            "category": rng.choice(CATEGORIES),
+            "severity": rng.choice(SEVERITIES),
+            "description": rng.choice(DESCRIPTIONS).format(i=i),
+            "recommendation": rng.choice(RECOMMENDATIONS),
+        }
+        for i in range(finding_count)
+    ]
+    recommendations = [
+        {
+            "priority": rng.choice(SEVERITIES),
+            "description": rng.choice(RECOMMENDATIONS),
+            "terraform_example": 'resource "aws_db_instance" "main" {\n  multi_az = true\n}',
+        }
+        for _ in range(20)
+    ]
+    return {
+        "availability_score": 42,
+        "overview": "合成データによるベンチマーク用の分析結果です。",
+        "findings": findings,
+        "recommendations": recommendations,
+        "model_usage": {"model_id": "benchmark", "tier": "standard", "latency": 1.0},
+    }
+
+
+def concatenated_html(generator: ReportGenerator, results: Dict[str, Any]) -> str:
+    """
+    文字列の連結でページ全体を作成（比較用の従来の方式）
+
+    Args:
+        generator: 重要度のCSSクラスの取得に使用するReportGenerator
+        results: 分析結果
+
+    Returns:
+        生成されたHTML文字列
+    """
+    page = templates.PAGE_HEADER.render(max_width="1200px")
+    score = results["availability_score"]
+    score_class = "score-high" if score >= 80 else "score-medium" if score >= 50 else "score-low"
+    page += templates.SCORE.render(score_class=score_class, score=score)
+    page += templates.OVERVIEW.render(overview=results["overview"])
+
+    page += templates.FINDINGS_START.render()
+    for finding in results["findings"]:
+        severity = finding["severity"]
+        severity_class = generator._get_severity_class(severity)
+        page += f"""
+                <tr>
+                    <td>{html.escape(finding["category"])}</td>
+                    <td class="{severity_class}">{html.escape(severity)}</td>
+                    <td>{html.escape(finding["description"])}</td>
+                    <td>{html.escape(finding["recommendation"])}</td>
+                </tr>
+"""
+    page += templates.FINDINGS_END.render()
+
+    page += templates.RECOMMENDATIONS_START.render()
+    for i, rec in enumerate(results["recommendations"], 1):
+        priority = rec["priority"]
+        page += templates.RECOMMENDATION_START.render(
+            index=i,
+            priority_class=generator._get_severity_class(priority),
+            priority=priority,
+            description=rec["description"],
+        )
+        page += templates.RECOMMENDATION_EXAMPLE.render(example=rec["terraform_example"])
+        page += templates.RECOMMENDATION_END.render()
+    page += templates.RECOMMENDATIONS_END.render()
+
+    usage = results["model_usage"]
+    page += templates.PAGE_FOOTER_START.render()
+    page += templates.MODEL_USAGE.render(
+        model_id=usage["model_id"],
+        tier=usage["tier"],
+        latency=f" / 所要時間: {usage['latency']:.1f}秒",
+    )
+    page += templates.PAGE_FOOTER_END.render()
+    return page
+
+
+def export_concatenated(
+    generator: ReportGenerator, results: Dict[str, Any], output_file: str
+) -> None:
+    """
+    従来の方式でHTMLを作成してファイルに書き出す（比較用）
+
+    Args:
+        generator: ReportGenerator
+        results: 分析結果
+        output_file: 出力ファイルのパス
+    """
+    content = concatenated_html(generator, results)
+    with open(output_file, "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def measure(func: Callable[[], Any]) -> Tuple[float, float]:
+    """
+    関数の平均実行時間（ミリ秒）とメモリ使用量のピーク（MB）を計測
+
+    メモリ使用量はtracemallocの影響を受けないよう、時間の計測とは別に1回だけ実行して求める。
+
+    Args:
+        func: 計測する関数
+
+    Returns:
+        平均実行時間（ミリ秒）とメモリ使用量のピーク（MB）
+    """
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        func()
+    elapsed = (time.perf_counter() - start) / REPEAT * 1000
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示"""
+    rows: List[str] = []
+    paginated_rows: List[str] = []
+    with tempfile.TemporaryDirectory() as directory:
+        generator = ReportGenerator(output_dir=directory, html_mode="table")
+        concatenated_file = os.path.join(directory, "concatenated.html")
+        streamed_file = os.path.join(directory, "streamed.html")
+        paginated_file = os.path.join(directory, "paginated.html")
+
+        for count in FINDING_COUNTS:
+            results = build_results(count)
+
+            concat_ms, concat_mb = measure(
+                lambda: export_concatenated(generator, results, concatenated_file)
+            )
+            stream_ms, stream_mb = measure(
+                lambda: generator.export_as_html(results, streamed_file)
+            )
+            paginated_ms, paginated_mb = measure(
+                lambda: generator.export_as_html(results, paginated_file, "paginated")
+            )
+            with open(concatenated_file, encoding="utf-8") as f:
+                expected = f.read()
+            with open(streamed_file, encoding="utf-8") as f:
+                assert f.read() == expected
+
+            size_mb = os.path.getsize(streamed_file) / 1024 / 1024
+            rows.append(
+                f"{count:>7}  {size_mb:>8.1f}MB  "
+                f"{concat_ms:>9.1f}ms  {stream_ms:>9.1f}ms  {concat_ms / stream_ms:>5.1f}x  "
+                f"{concat_mb:>9.1f}MB  {stream_mb:>9.1f}MB"
+            )
+            paginated_size_mb = os.path.getsize(paginated_file) / 1024 / 1024
+            paginated_rows.append(
+                f"{count:>7}  {paginated_size_mb:>8.1f}MB  "
+                f"{paginated_ms:>9.1f}ms  {paginated_mb:>9.1f}MB"
+            )
+
+    print("HTMLレポートの生成（文字列の連結 / ストリーミング）")
+    print("問題点数  ファイル     連結      ストリーム   比率   連結(ピーク)  ストリーム(ピーク)")
+    for row in rows:
+        print(row)
+    print()
+    print("問題点をJSONとして埋め込む表示方式（paginated）")
+    print("問題点数  ファイル      生成      ピーク")
+    for row in paginated_rows:
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
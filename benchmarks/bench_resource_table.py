@@ -0,0 +1,235 @@
+"""
+列指向のリソーステーブル（ResourceTable）のベンチマーク
+
+1k / 10k / 100k 件のリソースを含む合成データを生成し、RuleEngine の組み込みのルールを
+リソースブロックの辞書を1件ずつ判定する方式と、列指向のテーブルの演算で判定する方式で
+評価して処理時間を比較する。1回の評価では列の作成（辞書の走査）が処理時間の大半を占めるため、
+作成済みのテーブルに対してルールの判定のみを行う時間と、単純な条件
+（multi_azがfalseのaws_db_instance）の抽出時間もあわせて比較する。
+
+実行方法:
+    python -m benchmarks.bench_resource_table
+"""
+
+import random
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.analysis.rule_engine import DEFAULT_RULES, RuleEngine
+from src.terraform.resource_table import ResourceTable
+
+# 生成するリソースの件数
+RESOURCE_COUNTS = [1000, 10000, 100000]
+
+# 計測の繰り返し回数
+REPEAT = 3
+
+# 属性が存在しないことを表す値
+ABSENT = object()
+
+# 未解決の参照
+UNRESOLVED = {"__attribute__": "var.value"}
+
+# リソースタイプごとの属性値の候補（判定できない値や文字列表現を含む）
+ATTRIBUTE_VARIANTS: Dict[str, Dict[str, List[Any]]] = {
+    "aws_db_instance": {
+        "multi_az": [True, False, "true", "false", UNRESOLVED, ABSENT],
+        "backup_retention_period": [0, 7, "0", "14", UNRESOLVED, ABSENT],
+        "replicate_source_db": [ABSENT, ABSENT, ABSENT, "db-source", "${var.source}", None],
+    },
+    "aws_autoscaling_group": {
+        "min_size": [1, 2, 3, "1", UNRESOLVED, ABSENT],
+        "vpc_zone_identifier": [["a"], ["a", "b"], [UNRESOLVED], UNRESOLVED, ABSENT],
+        "availability_zones": [["ap-northeast-1a"], ["a", "c"], ABSENT, ABSENT],
+    },
+    "aws_dynamodb_table": {
+        "point_in_time_recovery": [
+            {"enabled": True},
+            {"enabled": False},
+            {"enabled": "${var.pitr}"},
+            {},
+            [],
+            UNRESOLVED,
+            ABSENT,
+        ],
+    },
+    "aws_lambda_function": {
+        "reserved_concurrent_executions": [-1, 0, 10, "5", "-1", UNRESOLVED, ABSENT],
+        "dead_letter_config": [{"target_arn": "arn:sqs"}, {"target_arn": None}, {}, [], ABSENT],
+    },
+    "aws_lb": {
+        "subnets": [["a"], ["a", "b"], ["${var.subnet}"], UNRESOLVED, ABSENT],
+        "subnet_mapping": [{"subnet_id": "a"}, [{"subnet_id": "a"}, {"subnet_id": "b"}], ABSENT],
+    },
+    # ルールの対象外のリソース
+    "aws_security_group": {"description": ["web", "db", ABSENT]},
+    "aws_s3_bucket": {"bucket": ["logs", "assets", UNRESOLVED]},
+}
+
+
+def build_estate(resource_count: int, seed: int = 0) -> Dict[str, Any]:
+    """
+    ベンチマーク用の解析結果を生成
+
+    Args:
+        resource_count: リソースの件数
+        seed: 乱数のシード
+
+    Returns:
+        tfparseの解析結果と同じ形式のデータ
+    """
+    rng = random.Random(seed)
+    resource_types = list(ATTRIBUTE_VARIANTS)
+    data: Dict[str, Any] = {}
+    for i in range(resource_count):
+        resource_type = resource_types[i % len(resource_types)]
+        name = f"r{i}"
+        block: Dict[str, Any] = {
+            "__tfmeta": {
+                "path": f"module.m{i % 50}.{resource_type}.{name}",
+                "filename": f"modules/m{i % 50}/main.tf",
+                "type": "resource",
+            },
+            "id": f"{resource_type}-{i}",
+        }
+        for attribute, variants in ATTRIBUTE_VARIANTS[resource_type].items():
+            value = rng.choice(variants)
+            if value is not ABSENT:
+                block[attribute] = value
+        data.setdefault(resource_type, []).append(block)
+    return data
+
+
+def measure(func: Callable[[], Any]) -> Tuple[float, Any]:
+    """
+    関数の平均実行時間（ミリ秒）を計測
+
+    Args:
+        func: 計測する関数
+
+    Returns:
+        平均実行時間（ミリ秒）と最後の戻り値
+    """
+    result = None
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        result = func()
+    return (time.perf_counter() - start) / REPEAT * 1000, result
+
+
+def single_az_by_dict(data: Dict[str, Any]) -> List[str]:
+    """
+    multi_azがfalseのaws_db_instanceを辞書を1件ずつ調べて抽出（比較用）
+
+    Args:
+        data: 解析結果
+
+    Returns:
+        アドレスのリスト
+    """
+    return [
+        block["__tfmeta"]["path"]
+        for block in data.get("aws_db_instance", [])
+        if block.get("multi_az") in (False, "false")
+    ]
+
+
+def checks_by_dict(table: ResourceTable) -> int:
+    """
+    リソース単位の判定関数ですべてのリソースを判定（比較用）
+
+    Args:
+        table: 作成済みのテーブル（リソースブロックの参照に使用）
+
+    Returns:
+        問題があると判定した件数
+    """
+    count = 0
+    for rule in DEFAULT_RULES:
+        type_table = table.get(rule.resource_type)
+        if rule.check is None or type_table is None:
+            continue
+        count += sum(1 for block in type_table.blocks if rule.check(block))
+    return count
+
+
+def checks_by_columns(table: ResourceTable) -> int:
+    """
+    列指向のテーブルによる判定関数ですべてのリソースを判定
+
+    Args:
+        table: 作成済みのテーブル（列も作成済みのもの）
+
+    Returns:
+        問題があると判定した件数
+    """
+    count = 0
+    for rule in DEFAULT_RULES:
+        type_table = table.get(rule.resource_type)
+        if rule.check_columns is None or type_table is None:
+            continue
+        count += rule.check_columns(type_table)[0].count()
+    return count
+
+
+def main() -> None:
+    """ベンチマークを実行して結果を表示"""
+    engine = RuleEngine(language="en", disabled_rules=[])
+    rows: List[str] = []
+    check_rows: List[str] = []
+    predicate_rows: List[str] = []
+
+    for count in RESOURCE_COUNTS:
+        data = build_estate(count)
+
+        dict_ms, by_dict = measure(lambda: engine.evaluate(data, columnar=False))
+        columnar_ms, by_columns = measure(lambda: engine.evaluate(data, columnar=True))
+        assert by_dict["findings"] == by_columns["findings"]
+        assert by_dict["covered"] == by_columns["covered"]
+
+        build_ms, table = measure(lambda: ResourceTable.from_terraform_data(data))
+        rows.append(
+            f"{count:>7}  {len(by_dict['findings']):>7}  "
+            f"{dict_ms:>10.1f}ms  {columnar_ms:>10.1f}ms  {dict_ms / columnar_ms:>5.1f}x  "
+            f"{build_ms:>8.1f}ms"
+        )
+
+        # 作成済みのテーブルに対するルールの判定のみ
+        checks_by_columns(table)
+        dict_ms, expected_count = measure(lambda: checks_by_dict(table))
+        columnar_ms, actual_count = measure(lambda: checks_by_columns(table))
+        assert expected_count == actual_count
+        check_rows.append(
+            f"{count:>7}  {actual_count:>7}  "
+            f"{dict_ms:>10.2f}ms  {columnar_ms:>10.2f}ms  {dict_ms / columnar_ms:>5.1f}x"
+        )
+
+        # 作成済みのテーブルに対する条件の抽出
+        db = table["aws_db_instance"]
+        db.column("multi_az", "bool")
+        scan_ms, expected = measure(lambda: single_az_by_dict(data))
+        column_ms, actual = measure(lambda: db.where(db.column("multi_az", "bool").is_false()))
+        assert expected == actual
+        predicate_rows.append(
+            f"{count:>7}  {len(actual):>7}  {scan_ms:>10.3f}ms  {column_ms:>10.3f}ms  "
+            f"{scan_ms / column_ms:>5.1f}x"
+        )
+
+    print("ルールによる評価（組み込みのルールすべて）")
+    print("リソース数  問題点数     辞書を走査  列指向テーブル   比率  テーブル作成")
+    for row in rows:
+        print(row)
+    print()
+    print("ルールの判定のみ（テーブルと列は作成済み）")
+    print("リソース数  問題点数     辞書を走査  列指向テーブル   比率")
+    for row in check_rows:
+        print(row)
+    print()
+    print("条件の抽出（multi_azがfalseのaws_db_instance、テーブル作成済み）")
+    print("リソース数    件数     辞書を走査  列指向テーブル   比率")
+    for row in predicate_rows:
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -31,6 +31,9 @@ setup(
             "flake8>=6.0.0",
             "mypy>=1.0.0",
         ],
+        "fast": [
+            "orjson>=3.6.0",
+        ],
     },
     python_requires=">=3.7",
     classifiers=[
@@ -3,13 +3,110 @@ Bedrockからのレスポンスを解析するモジュール
 """
 
 import json
-from typing import Dict, Any, cast
+import re
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Type
 
 from rich.console import Console
 
+try:
+    import orjson
+except ImportError:  # orjsonがない場合は標準のjsonモジュールを使用する
+    orjson = None  # type: ignore
+
 # Richコンソールを初期化
 console = Console()
 
+# 分析結果の必須キーと値の型
+REQUIRED_FIELD_TYPES: Dict[str, Tuple[Type[Any], ...]] = {
+    "overview": (str,),
+    "availability_score": (int, float),
+    "findings": (list,),
+    "recommendations": (list,),
+}
+
+# JSONオブジェクトの内側で走査が必要な字句（波括弧または文字列リテラル全体）
+# 閉じられていない文字列リテラルはテキストの終わりまでを1つの字句とする
+_OBJECT_TOKEN_PATTERN = re.compile(r'[{}]|"[^"\\]*(?:\\.[^"\\]*)*"?', re.DOTALL)
+
+# 開き括弧の位置からJSONをデコードするためのデコーダー
+_DECODER = json.JSONDecoder()
+
+
+def loads_json(text: str) -> Any:
+    """
+    JSONテキストをデコードする（orjsonがインストールされている場合はorjsonを使用）
+
+    Args:
+        text: JSONテキスト
+
+    Returns:
+        デコードした値
+
+    Raises:
+        ValueError: JSONとして正しくない場合
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def iter_json_objects(text: str) -> Iterator[Tuple[int, int, Any]]:
+    """
+    テキストに含まれるJSONオブジェクトのうち、他のオブジェクトに含まれないものを出現順に返す
+
+    テキストを先頭から1回だけ走査する。オブジェクトの外側で見つけた開き括弧からは、
+    まず標準のJSONデコーダーでそのままデコードを試みる（正しいJSONであれば
+    内側を走査せずに読み飛ばせる）。デコードできない場合は、文字列リテラル内の
+    波括弧とエスケープを考慮して対応する閉じ括弧を探し、閉じた範囲を外側から順に
+    デコードする（文章中の波括弧の内側や途中で途切れたJSONの内側にあるオブジェクトも候補になる）。
+
+    Args:
+        text: 対象のテキスト
+
+    Yields:
+        (開始位置, 終了位置, デコードした値)のタプル
+    """
+    index = text.find("{")
+    while index >= 0:
+        try:
+            value, end = _DECODER.raw_decode(text, index)
+        except ValueError:
+            end = -1
+        if end >= 0:
+            yield index, end, value
+            index = text.find("{", end)
+            continue
+
+        # 対応する閉じ括弧までを走査し、閉じた範囲を記録する
+        spans: List[Tuple[int, int]] = []
+        open_positions = [index]
+        index += 1
+        while open_positions:
+            match = _OBJECT_TOKEN_PATTERN.search(text, index)
+            if match is None:
+                index = len(text)
+                break
+            start, index = match.span()
+            token = text[start]
+            if token == "{":
+                open_positions.append(start)
+            elif token == "}":
+                spans.append((open_positions.pop(), index))
+            # 文字列リテラルは内側の波括弧ごと読み飛ばす
+
+        # 閉じた順に並んでいるため開始位置で並べ替え、デコードできた範囲の内側は除く
+        decoded_end = -1
+        for start, end in sorted(spans):
+            if start < decoded_end:
+                continue
+            try:
+                value = loads_json(text[start:end])
+            except ValueError:
+                continue
+            decoded_end = end
+            yield start, end, value
+        index = text.find("{", index)
+
 
 class AnalysisParser:
     """
@@ -29,6 +126,9 @@ class AnalysisParser:
         """
         Bedrockからのテキストレスポンスを解析し、構造化されたデータに変換
 
+        テキストに含まれるJSONオブジェクトの候補を列挙し、
+        分析結果の必須キーを最も多く含むものを採用する。
+
         Args:
             analysis_text: Bedrockからのレスポンステキスト
 
@@ -36,43 +136,73 @@ class AnalysisParser:
             解析された構造化データ
         """
         try:
-            # まず、JSON全体をパースしてみる
-            try:
-                # 最初に単純にJSONとしてパースを試みる
-                analysis_result = json.loads(analysis_text)
-                return cast(Dict[str, Any], analysis_result)
-            except json.JSONDecodeError:
-                # 単純なJSONではない場合、JSONブロックを探す
-                json_start = analysis_text.find("```json")
-                if json_start >= 0:
-                    json_end = analysis_text.rfind("```")
-                    json_text = analysis_text[json_start + 7 : json_end].strip()
-                else:
-                    # ```jsonが見つからない場合、{から始まるJSONを探す
-                    json_start = analysis_text.find("{")
-                    json_end = analysis_text.rfind("}") + 1
-                    if json_start >= 0 and json_end > json_start:
-                        json_text = analysis_text[json_start:json_end].strip()
-                    else:
-                        # JSONが見つからない場合
-                        return {"raw_analysis": analysis_text}
-
-                # JSON解析を試みる
-                try:
-                    analysis_result = json.loads(json_text)
-                    return cast(Dict[str, Any], analysis_result)
-                except json.JSONDecodeError as je:
-                    # JSON解析に失敗した場合のデバッグ情報
-                    if self.debug:
-                        console.print(f"[bold red]JSON解析エラー: {je}[/bold red]")
-                        console.print(f"解析対象テキスト: {json_text[:100]}...")
-                    return {"raw_analysis": analysis_text}
+            best: Optional[Dict[str, Any]] = None
+            best_score = 0
+            for candidate in self._iter_json_candidates(analysis_text):
+                score = sum(1 for key in REQUIRED_FIELD_TYPES if key in candidate)
+                if score > best_score:
+                    best, best_score = candidate, score
+                # すべての必須キーを含む候補が見つかった場合は走査を終了する
+                if score == len(REQUIRED_FIELD_TYPES):
+                    break
+
+            if best is None:
+                # 分析結果のJSONが見つからない場合
+                if self.debug:
+                    console.print("[bold red]JSON解析エラー: 分析結果のJSONが見つかりません[/bold red]")
+                    console.print(f"解析対象テキスト: {analysis_text[:100]}...")
+                return {"raw_analysis": analysis_text}
+            return best
         except Exception as e:
             # 何らかの予期せぬエラーが発生した場合
             if self.debug:
                 console.print(f"[bold red]解析エラー: {e}[/bold red]")
             return {"raw_analysis": analysis_text}
 
+    def _iter_json_candidates(self, text: str) -> Iterator[Dict[str, Any]]:
+        """
+        テキストに含まれるJSONオブジェクトの候補を出現順に返す
+
+        Args:
+            text: 対象のテキスト
+
+        Yields:
+            デコードしたJSONオブジェクト
+        """
+        # 指示どおりJSONのみが返された場合はテキスト全体をデコードする
+        stripped = text.strip()
+        if stripped.startswith("{"):
+            try:
+                value = loads_json(stripped)
+            except ValueError as e:
+                if self.debug:
+                    console.print(f"[bold red]JSON解析エラー: {e}[/bold red]")
+            else:
+                if isinstance(value, dict):
+                    yield value
+                    return
+
+        for _, _, value in iter_json_objects(text):
+            if isinstance(value, dict):
+                yield value
+
+    def find_invalid_fields(self, results: Dict[str, Any]) -> List[str]:
+        """
+        分析結果のうち、存在しないか形式が正しくない必須キーを取得
+
+        Args:
+            results: 検証する分析結果
+
+        Returns:
+            存在しないか形式が正しくない必須キーのリスト（必須キーの順序）
+        """
+        return [
+            key
+            for key, expected_types in REQUIRED_FIELD_TYPES.items()
+            if not isinstance(results.get(key), expected_types)
+            or isinstance(results.get(key), bool)
+        ]
+
     def validate_analysis_results(self, results: Dict[str, Any]) -> bool:
         """
         分析結果が必要な形式に従っているかを検証
@@ -83,7 +213,7 @@ class AnalysisParser:
         Returns:
             検証結果（True=有効、False=無効）
         """
-        required_keys = ["overview", "availability_score", "findings", "recommendations"]
+        required_keys = list(REQUIRED_FIELD_TYPES)
 
         # 必須キーの存在確認
         for key in required_keys:
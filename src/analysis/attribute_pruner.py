@@ -0,0 +1,399 @@
+"""
+プロンプトに含めるTerraformリソースの属性を可用性に関係するものに絞り込むモジュール
+"""
+
+from typing import Any, Dict, List, Optional, Set
+
+from src.config import get_settings
+from src.terraform.resource_utils import PRUNED_ADDRESS_KEY, resource_address
+
+# リソースタイプごとの可用性評価に関係する属性（設定ファイルで上書き・追加可能）
+DEFAULT_ATTRIBUTE_ALLOWLISTS: Dict[str, List[str]] = {
+    "aws_instance": [
+        "instance_type",
+        "availability_zone",
+        "subnet_id",
+        "placement_group",
+        "monitoring",
+        "disable_api_termination",
+        "instance_initiated_shutdown_behavior",
+    ],
+    "aws_autoscaling_group": [
+        "min_size",
+        "max_size",
+        "desired_capacity",
+        "availability_zones",
+        "vpc_zone_identifier",
+        "health_check_type",
+        "health_check_grace_period",
+        "target_group_arns",
+        "capacity_rebalance",
+        "mixed_instances_policy",
+        "launch_template",
+    ],
+    "aws_db_instance": [
+        "engine",
+        "engine_version",
+        "instance_class",
+        "multi_az",
+        "availability_zone",
+        "db_subnet_group_name",
+        "backup_retention_period",
+        "backup_window",
+        "deletion_protection",
+        "skip_final_snapshot",
+        "replicate_source_db",
+        "storage_type",
+        "max_allocated_storage",
+    ],
+    "aws_rds_cluster": [
+        "engine",
+        "engine_mode",
+        "availability_zones",
+        "db_subnet_group_name",
+        "backup_retention_period",
+        "deletion_protection",
+        "global_cluster_identifier",
+        "replication_source_identifier",
+        "serverlessv2_scaling_configuration",
+    ],
+    "aws_rds_cluster_instance": [
+        "cluster_identifier",
+        "instance_class",
+        "availability_zone",
+        "promotion_tier",
+    ],
+    "aws_elasticache_replication_group": [
+        "automatic_failover_enabled",
+        "multi_az_enabled",
+        "num_cache_clusters",
+        "num_node_groups",
+        "replicas_per_node_group",
+        "preferred_cache_cluster_azs",
+        "snapshot_retention_limit",
+    ],
+    "aws_elasticache_cluster": [
+        "num_cache_nodes",
+        "az_mode",
+        "preferred_availability_zones",
+        "snapshot_retention_limit",
+    ],
+    "aws_lb": [
+        "load_balancer_type",
+        "internal",
+        "subnets",
+        "subnet_mapping",
+        "enable_cross_zone_load_balancing",
+        "enable_deletion_protection",
+        "idle_timeout",
+    ],
+    "aws_lb_target_group": [
+        "port",
+        "protocol",
+        "target_type",
+        "health_check",
+        "deregistration_delay",
+    ],
+    "aws_lb_listener": ["load_balancer_arn", "port", "protocol", "default_action"],
+    "aws_lb_target_group_attachment": ["target_group_arn", "target_id", "port"],
+    "aws_vpc": ["cidr_block"],
+    "aws_subnet": [
+        "vpc_id",
+        "availability_zone",
+        "availability_zone_id",
+        "cidr_block",
+        "map_public_ip_on_launch",
+    ],
+    "aws_nat_gateway": ["subnet_id", "allocation_id", "connectivity_type"],
+    "aws_internet_gateway": ["vpc_id"],
+    "aws_route_table": ["vpc_id", "route"],
+    "aws_route_table_association": ["subnet_id", "route_table_id"],
+    "aws_eip": ["domain", "vpc", "instance"],
+    "aws_dynamodb_table": [
+        "billing_mode",
+        "read_capacity",
+        "write_capacity",
+        "point_in_time_recovery",
+        "replica",
+        "stream_enabled",
+        "deletion_protection_enabled",
+    ],
+    "aws_lambda_function": [
+        "runtime",
+        "memory_size",
+        "timeout",
+        "reserved_concurrent_executions",
+        "dead_letter_config",
+        "vpc_config",
+        "architectures",
+    ],
+    "aws_lambda_event_source_mapping": [
+        "batch_size",
+        "maximum_retry_attempts",
+        "bisect_batch_on_function_error",
+        "destination_config",
+    ],
+    "aws_s3_bucket": ["versioning", "replication_configuration", "object_lock_enabled"],
+    "aws_s3_bucket_versioning": ["bucket", "versioning_configuration"],
+    "aws_s3_bucket_replication_configuration": ["bucket", "rule"],
+    "aws_api_gateway_stage": ["stage_name", "cache_cluster_enabled", "xray_tracing_enabled"],
+    "aws_api_gateway_method_settings": ["stage_name", "method_path", "settings"],
+    "aws_ecs_service": [
+        "desired_count",
+        "launch_type",
+        "capacity_provider_strategy",
+        "deployment_circuit_breaker",
+        "deployment_minimum_healthy_percent",
+        "deployment_maximum_percent",
+        "network_configuration",
+        "load_balancer",
+        "ordered_placement_strategy",
+    ],
+    "aws_efs_file_system": ["availability_zone_name", "throughput_mode", "lifecycle_policy"],
+    "aws_efs_mount_target": ["file_system_id", "subnet_id"],
+    "aws_sqs_queue": [
+        "fifo_queue",
+        "redrive_policy",
+        "message_retention_seconds",
+        "visibility_timeout_seconds",
+    ],
+    "aws_kinesis_stream": ["shard_count", "retention_period", "stream_mode_details"],
+    "aws_route53_record": [
+        "type",
+        "set_identifier",
+        "health_check_id",
+        "alias",
+        "failover_routing_policy",
+        "weighted_routing_policy",
+        "latency_routing_policy",
+    ],
+    "aws_route53_health_check": ["type", "failure_threshold", "request_interval"],
+    "aws_backup_plan": ["rule"],
+    "aws_backup_selection": ["plan_id", "resources"],
+    "aws_cloudwatch_metric_alarm": [
+        "namespace",
+        "metric_name",
+        "comparison_operator",
+        "threshold",
+        "alarm_actions",
+    ],
+}
+
+
+class AttributePruner:
+    """
+    Terraformの解析結果から可用性評価に不要な属性を取り除くクラス
+
+    許可リストが定義されているリソースタイプは許可された属性のみを残し、
+    それ以外のリソースタイプは除外リストに含まれる属性を取り除く。
+    tfparseが参照先に割り当てるIDはリソースのアドレスに置き換える。
+    """
+
+    def __init__(self, prompt_settings: Optional[Dict[str, Any]] = None) -> None:
+        """
+        AttributePrunerの初期化
+
+        Args:
+            prompt_settings: プロンプト設定（Noneの場合は設定から取得）
+        """
+        if prompt_settings is None:
+            prompt_settings = get_settings()["prompt"]
+
+        self.allowlists: Dict[str, Set[str]] = {
+            resource_type: set(attributes)
+            for resource_type, attributes in DEFAULT_ATTRIBUTE_ALLOWLISTS.items()
+        }
+        custom_allowlists = prompt_settings.get("attribute_allowlists") or {}
+        for resource_type, attributes in custom_allowlists.items():
+            self.allowlists[resource_type] = set(attributes or [])
+
+        self.common_attributes = set(prompt_settings.get("common_attributes") or [])
+        self.drop_attributes = set(prompt_settings.get("drop_attributes") or [])
+        self.drop_block_types = set(prompt_settings.get("drop_block_types") or [])
+
+    def prune(self, terraform_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Terraformの解析結果から不要な属性を取り除く
+
+        Args:
+            terraform_data: tfparseの解析結果
+
+        Returns:
+            属性を絞り込んだ解析結果（元のデータは変更しない）。
+            既に絞り込まれたブロックはそのまま含まれる。
+        """
+        addresses = self._collect_addresses(terraform_data)
+        pruned: Dict[str, Any] = {}
+
+        for block_type, blocks in terraform_data.items():
+            if block_type in self.drop_block_types:
+                continue
+            if not isinstance(blocks, list):
+                continue
+
+            allowlist = self.allowlists.get(block_type)
+            pruned_blocks = []
+            for block in blocks:
+                if not isinstance(block, dict):
+                    continue
+                # 絞り込み済みのブロックはそのまま使用する
+                if PRUNED_ADDRESS_KEY in block:
+                    pruned_blocks.append(block)
+                    continue
+                pruned_block: Dict[str, Any] = {
+                    PRUNED_ADDRESS_KEY: resource_address(block_type, block)
+                }
+                for key, value in block.items():
+                    if not self._keep_attribute(key, allowlist):
+                        continue
+                    value = self._prune_value(value, addresses)
+                    if value is None or value == [] or value == {}:
+                        continue
+                    pruned_block[key] = value
+                pruned_blocks.append(pruned_block)
+
+            if pruned_blocks:
+                pruned[block_type] = pruned_blocks
+
+        return pruned
+
+    def _keep_attribute(self, key: str, allowlist: Optional[Set[str]]) -> bool:
+        """
+        属性をプロンプトに残すかどうかを判定
+
+        Args:
+            key: 属性名
+            allowlist: リソースタイプの許可リスト（未定義の場合はNone）
+
+        Returns:
+            残す場合はTrue
+        """
+        if key == "__tfmeta":
+            return False
+        if allowlist is not None:
+            return key in allowlist or key in self.common_attributes
+        return key not in self.drop_attributes
+
+    def _prune_value(self, value: Any, addresses: Dict[str, str]) -> Any:
+        """
+        属性値を再帰的に整理する
+
+        ネストしたブロックのメタ情報やIDを取り除き、
+        参照先のIDをリソースのアドレスに置き換える。
+
+        Args:
+            value: 属性値
+            addresses: tfparseのIDからリソースのアドレスへの対応表
+
+        Returns:
+            整理された属性値
+        """
+        if isinstance(value, str):
+            return addresses.get(value, value)
+
+        if isinstance(value, list):
+            return [self._prune_value(item, addresses) for item in value]
+
+        if isinstance(value, dict):
+            # 参照先のブロック全体が展開されている場合はアドレスのみにする
+            block_id = value.get("id")
+            if isinstance(block_id, str) and block_id in addresses:
+                return addresses[block_id]
+
+            result = {}
+            for key, item in value.items():
+                if key in ("__tfmeta", "id") or key in self.drop_attributes:
+                    continue
+                item = self._prune_value(item, addresses)
+                if item is None or item == [] or item == {}:
+                    continue
+                result[key] = item
+            return result
+
+        return value
+
+    def strip_references(
+        self, pruned_data: Dict[str, Any], references: Dict[str, List[str]]
+    ) -> Dict[str, Any]:
+        """
+        属性を絞り込んだ解析結果から、指定した参照を取り除く
+
+        参照関係を依存関係グラフの要約としてプロンプトに含める場合に、要約に含めた参照のみを
+        属性から取り除くために使用する。
+
+        Args:
+            pruned_data: pruneで属性を絞り込んだ解析結果
+            references: 参照元のアドレスごとの、取り除く参照先のアドレスのリスト
+
+        Returns:
+            参照を取り除いた解析結果（元のデータは変更しない）
+        """
+        stripped: Dict[str, Any] = {}
+        for block_type, blocks in pruned_data.items():
+            if not isinstance(blocks, list):
+                stripped[block_type] = blocks
+                continue
+            stripped_blocks = []
+            for block in blocks:
+                targets = (
+                    references.get(block.get(PRUNED_ADDRESS_KEY, ""))
+                    if isinstance(block, dict)
+                    else None
+                )
+                if not targets:
+                    stripped_blocks.append(block)
+                    continue
+                stripped_block = self._strip_value(block, set(targets))
+                stripped_block[PRUNED_ADDRESS_KEY] = block[PRUNED_ADDRESS_KEY]
+                stripped_blocks.append(stripped_block)
+            stripped[block_type] = stripped_blocks
+        return stripped
+
+    def _strip_value(self, value: Any, targets: Set[str]) -> Any:
+        """
+        属性値から参照先のアドレスを再帰的に取り除く
+
+        Args:
+            value: 属性値
+            targets: 取り除く参照先のアドレス
+
+        Returns:
+            参照先を取り除いた属性値（値全体が参照先の場合はNone）
+        """
+        if isinstance(value, str):
+            return None if value in targets else value
+
+        if isinstance(value, list):
+            items = [self._strip_value(item, targets) for item in value]
+            return [item for item in items if item is not None]
+
+        if isinstance(value, dict):
+            result = {}
+            for key, item in value.items():
+                item = self._strip_value(item, targets)
+                if item is None or item == [] or item == {}:
+                    continue
+                result[key] = item
+            return result
+
+        return value
+
+    @staticmethod
+    def _collect_addresses(terraform_data: Dict[str, Any]) -> Dict[str, str]:
+        """
+        tfparseのIDとリソースのアドレスの対応表を作成
+
+        Args:
+            terraform_data: tfparseの解析結果
+
+        Returns:
+            IDからアドレスへの対応表
+        """
+        addresses: Dict[str, str] = {}
+        for block_type, blocks in terraform_data.items():
+            if not isinstance(blocks, list):
+                continue
+            for block in blocks:
+                if isinstance(block, dict) and isinstance(block.get("id"), str):
+                    addresses[block["id"]] = resource_address(block_type, block)
+        return addresses
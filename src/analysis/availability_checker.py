@@ -2,14 +2,40 @@
 Terraformリソースの可用性チェックを行うメインモジュール
 """
 
-from typing import Dict, Any, Optional
+import os
+import time
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from rich.console import Console
 
 from src.client.bedrock_client import BedrockClient
+from src.analysis.attribute_pruner import AttributePruner
+from src.analysis.chunked_analyzer import AnalysisChunk, ChunkedAnalyzer, merge_chunk_results
+from src.analysis.module_analyzer import ModuleAnalyzer
 from src.analysis.prompt_generator import PromptGenerator
 from src.analysis.analysis_parser import AnalysisParser
+from src.analysis.resource_collapser import expand_findings
+from src.analysis.resource_graph import ResourceGraph
+from src.analysis.rule_engine import RuleEngine
+from src.analysis.snapshot_store import (
+    SnapshotStore,
+    diff_resources,
+    related_addresses,
+    resource_blocks,
+)
+from src.analysis.stream_parser import IncrementalAnalysisParser
 from src.ui.console_renderer import ConsoleRenderer
+from src.reporting.partial_report_writer import PartialReportWriter
 from src.reporting.report_generator import ReportGenerator
+from src.analysis.token_estimator import estimate_max_output_tokens
 from src.config import get_settings
+from src.terraform.resource_utils import count_resources, resource_address
+
+# Richコンソールを初期化
+console = Console()
+
+# モデルの区分の表示名
+TIER_LABELS = {"fast": "高速モデル", "standard": "標準モデル"}
 
 
 class AvailabilityChecker:
@@ -23,6 +49,14 @@ class AvailabilityChecker:
         region_name: Optional[str] = None,
         language: Optional[str] = None,
         debug: Optional[bool] = None,
+        chunked: Optional[str] = None,
+        cache_mode: Optional[str] = None,
+        stream: Optional[bool] = None,
+        fast_model_id: Optional[str] = None,
+        rules_only: Optional[bool] = None,
+        rules_residual: Optional[bool] = None,
+        module_analysis: Optional[bool] = None,
+        full: bool = False,
     ) -> None:
         """
         AvailabilityCheckerの初期化
@@ -32,50 +66,846 @@ class AvailabilityChecker:
             region_name: AWSリージョン名（Noneの場合は設定から取得）
             language: 使用言語（Noneの場合は設定から取得）
             debug: デバッグモードを有効にするかどうか（Noneの場合は設定から取得）
+            chunked: 分割分析のモード（auto/on/off）（Noneの場合は設定から取得）
+            cache_mode: Bedrockレスポンスキャッシュのモード（Noneの場合は設定から取得）
+            stream: ストリーミングでレスポンスを受信するかどうか（Noneの場合は設定から取得）
+            fast_model_id: 小規模な入力の分析に使用する高速モデルのID
+                （指定した場合はモデルの振り分けを有効にする）
+            rules_only: ルールのみで評価し、Bedrockを呼び出さないかどうか
+                （Noneの場合は設定から取得）
+            rules_residual: すべてのルールで判定できたリソースをBedrockに送信しないかどうか
+                （Noneの場合は設定から取得）
+            module_analysis: モジュールのインスタンスごとに分析し、同じ内容のモジュールの
+                分析結果を共有するかどうか（Noneの場合は設定から取得）
+            full: 前回の分析結果を使用せず、すべてのリソースを分析するかどうか
         """
         settings = get_settings()
         
         # デバッグ設定
         self.debug = debug if debug is not None else settings["app"]["debug"]
+
+        # 分割分析の設定
+        analysis_settings = settings["analysis"]
+        self.chunked = chunked or analysis_settings["chunked"]
+        self.max_prompt_tokens = analysis_settings["max_prompt_tokens"]
+        self.output_token_settings = analysis_settings["output_tokens"]
+        self.repair_settings = analysis_settings["repair"]
+        self.incremental_parse = analysis_settings["incremental_parse"]
+        self.module_analysis = (
+            module_analysis
+            if module_analysis is not None
+            else analysis_settings["modules"]["enabled"]
+        )
+
+        # 差分の分析の設定
+        incremental_settings = analysis_settings["incremental"]
+        self.full = full
+        self.max_changed_ratio = incremental_settings["max_changed_ratio"]
+        self.snapshot_store: Optional[SnapshotStore] = (
+            SnapshotStore() if incremental_settings["enabled"] else None
+        )
+
+        # ルールによる評価の設定
+        rule_settings = analysis_settings["rules"]
+        self.rules_only = rules_only if rules_only is not None else rule_settings["only"]
+        self.rules_residual = (
+            rules_residual if rules_residual is not None else rule_settings["residual_only"]
+        )
+        self.rule_engine: Optional[RuleEngine] = (
+            RuleEngine(language=language)
+            if rule_settings["enabled"] or self.rules_only or self.rules_residual
+            else None
+        )
+        self.partial_report_filename = settings["output"]["partial_report_filename"]
+        self.graph_settings = settings["prompt"]["graph"]
+
+        # ストリーミングの設定
+        self.stream = stream if stream is not None else settings["aws"]["streaming"]
         
+        # モデルの振り分けの設定
+        self.routing = settings["aws"]["routing"]
+        self.routing_enabled = bool(fast_model_id) or self.routing["enabled"]
+
         # 各コンポーネントの初期化
-        self.bedrock_client = BedrockClient(model_id=model_id, region_name=region_name)
+        self.bedrock_client = BedrockClient(
+            model_id=model_id, region_name=region_name, cache_mode=cache_mode
+        )
+        self.fast_client: Optional[BedrockClient] = None
+        if self.routing_enabled:
+            self.fast_client = BedrockClient(
+                model_id=fast_model_id or self.routing["fast_model_id"],
+                region_name=region_name,
+                cache_mode=cache_mode,
+                read_timeout=self.routing["fast_read_timeout"],
+            )
         self.prompt_generator = PromptGenerator(language=language)
         self.analysis_parser = AnalysisParser(debug=self.debug)
         self.console_renderer = ConsoleRenderer()
         self.report_generator = ReportGenerator(output_dir=settings["output"]["directory"])
+        self.chunked_analyzer = ChunkedAnalyzer(
+            self.prompt_generator, self.bedrock_client, self._parse_response, stream=self.stream
+        )
+        self.module_analyzer: Optional[ModuleAnalyzer] = (
+            ModuleAnalyzer(
+                self.prompt_generator, self.bedrock_client, self._parse_response, stream=self.stream
+            )
+            if self.module_analysis
+            else None
+        )
 
-    def analyze_with_bedrock(self, terraform_data: Dict[str, Any]) -> Dict[str, Any]:
+    def analyze_with_bedrock(
+        self,
+        terraform_data: Dict[str, Any],
+        partial_report_file: Optional[str] = None,
+        root: Optional[str] = None,
+        focus: Optional[Set[str]] = None,
+    ) -> Dict[str, Any]:
         """
         Bedrockを使用してTerraformリソースの可用性を分析
         
         Args:
             terraform_data: 分析対象のTerraformデータ
+            partial_report_file: ストリーミング受信中の項目を逐次保存するファイルのパス
+                （Noneの場合は出力ディレクトリに作成）
+            root: Terraformルートのパス（指定した場合は前回の分析結果との差分のみを分析し、
+                今回の分析結果を保存する）
+            focus: 分析の対象とするリソースのアドレス（指定した場合は、これらのリソースと
+                参照関係で直接つながるリソースのみを分析し、前回の分析結果は使用しない）
+            
+        Returns:
+            分析結果
+        """
+        if focus is not None:
+            terraform_data = self._focus_resources(terraform_data, focus)
+            # 一部のリソースのみの分析結果は前回の分析結果として保存しない
+            root = None
+
+        if self.rule_engine is None:
+            graph = self._build_graph(terraform_data)
+            return self._analyze_with_snapshot(
+                terraform_data, None, partial_report_file, graph, root
+            )
+
+        # Bedrockを呼び出す前にルールで評価
+        start_time = time.time()
+        evaluation = self.rule_engine.evaluate(terraform_data)
+        console.print(
+            f"ルールによる評価: [bold]{len(evaluation['findings'])}[/bold]件の問題点 "
+            f"(リソース {evaluation['resource_count']}件, "
+            f"すべてのルールで判定済み {len(evaluation['covered'])}件) "
+            f"[dim]{(time.time() - start_time) * 1000:.0f}ミリ秒[/dim]"
+        )
+        rule_result = self.rule_engine.create_result(evaluation)
+        if self.rules_only:
+            return rule_result
+
+        # 依存関係グラフは送信しないリソースを除く前の解析結果全体から作成する
+        graph = self._build_graph(terraform_data)
+        residual_count = evaluation["resource_count"]
+        if self.rules_residual:
+            # すべてのルールで判定できたリソースを除いてBedrockに送信する
+            terraform_data = RuleEngine.exclude_resources(terraform_data, evaluation["covered"])
+            residual_count = count_resources(terraform_data)
+            if residual_count == 0:
+                console.print("すべてのリソースをルールで判定できたため、Bedrockによる分析は行いません")
+                return rule_result
+
+        results = self._analyze_with_snapshot(
+            terraform_data, evaluation["findings"], partial_report_file, graph, root
+        )
+        return self._merge_rule_result(results, rule_result, evaluation, residual_count)
+
+    def _focus_resources(self, terraform_data: Dict[str, Any], focus: Set[str]) -> Dict[str, Any]:
+        """
+        指定したリソースと、参照関係で直接つながるリソースのみに解析結果を絞り込む
+        
+        Args:
+            terraform_data: tfparseの解析結果
+            focus: 対象とするリソースのアドレス
+            
+        Returns:
+            絞り込んだ解析結果（元のデータは変更しない）
+        """
+        graph = ResourceGraph.from_terraform_data(terraform_data)
+        targets = set(focus)
+        for address in focus:
+            targets.update(graph.adjacency.get(address, []))
+        others = set(graph.adjacency) - targets
+        console.print(
+            f"変更されたリソース: [bold]{len(focus)}[/bold]件 "
+            f"(参照関係で直接つながるリソースを含めて {len(targets)}件 / 全 {graph.node_count}件)"
+        )
+        return RuleEngine.exclude_resources(terraform_data, others)
+
+    def _merge_rule_result(
+        self,
+        results: Dict[str, Any],
+        rule_result: Dict[str, Any],
+        evaluation: Dict[str, Any],
+        residual_count: int,
+    ) -> Dict[str, Any]:
+        """
+        Bedrockの分析結果にルールで検出した問題点を統合する
+        
+        Args:
+            results: Bedrockの分析結果
+            rule_result: ルールによる評価結果（分析結果と同じ形式）
+            evaluation: RuleEngine.evaluateの戻り値
+            residual_count: Bedrockに送信したリソース数
+            
+        Returns:
+            統合した分析結果
+        """
+        covered_count = evaluation["resource_count"] - residual_count
+        results["rules"] = {
+            "findings": len(rule_result["findings"]),
+            "covered_resources": len(evaluation["covered"]),
+            "residual_only": self.rules_residual,
+        }
+        if "error" in results or "raw_analysis" in results:
+            results["rule_findings"] = rule_result["findings"]
+            return results
+
+        results["findings"] = rule_result["findings"] + list(results.get("findings", []))
+        score = results.get("availability_score")
+        if self.rules_residual and covered_count > 0 and isinstance(score, (int, float)):
+            # Bedrockに送信しなかったリソースはルールによるスコアで重み付けする
+            results["availability_score"] = round(
+                (rule_result["availability_score"] * covered_count + score * residual_count)
+                / (covered_count + residual_count)
+            )
+        return results
+
+    def _build_graph(self, terraform_data: Dict[str, Any]) -> Optional[ResourceGraph]:
+        """
+        解析結果から依存関係グラフを作成し、単一障害点の候補を求める
+        
+        Args:
+            terraform_data: tfparseの解析結果
+            
+        Returns:
+            ResourceGraph（prompt.graph.enabledが無効な場合はNone）
+        """
+        if not self.graph_settings["enabled"]:
+            return None
+
+        start_time = time.time()
+        graph = ResourceGraph.from_terraform_data(terraform_data)
+        console.print(
+            f"依存関係グラフ: リソース {graph.node_count}件, 参照 {graph.edge_count}件, "
+            f"単一障害点の候補 [bold]{len(graph.articulation_points)}[/bold]件 "
+            f"[dim]{(time.time() - start_time) * 1000:.0f}ミリ秒[/dim]"
+        )
+        return graph
+
+    def _analyze_with_model(
+        self,
+        terraform_data: Dict[str, Any],
+        known_findings: Optional[List[Dict[str, Any]]],
+        partial_report_file: Optional[str],
+        graph: Optional[ResourceGraph] = None,
+    ) -> Dict[str, Any]:
+        """
+        Bedrockを使用してTerraformリソースの可用性を分析
+        
+        Args:
+            terraform_data: 分析対象のTerraformデータ
+            known_findings: ルールで検出済みの問題点
+            partial_report_file: ストリーミング受信中の項目を逐次保存するファイルのパス
+            graph: 解析結果全体の依存関係グラフ（プロンプトに要約を含める）
+            
+        Returns:
+            分析結果（依存関係グラフを指定した場合は、単一障害点の候補をgraphキーに含む）
+        """
+        results = self._analyze_prompt_or_chunks(
+            terraform_data, known_findings, partial_report_file, graph
+        )
+        self._expand_collapsed_findings(results, terraform_data, graph)
+        self._attach_graph_summary(results, graph)
+        return results
+
+    def _attach_graph_summary(
+        self, results: Dict[str, Any], graph: Optional[ResourceGraph]
+    ) -> None:
+        """
+        分析結果に単一障害点の候補を追加する
+        
+        Args:
+            results: 分析結果（変更される）
+            graph: 解析結果全体の依存関係グラフ（Noneの場合は何もしない）
+        """
+        if graph is None:
+            return
+        summary = graph.summary(max_items=self.graph_settings["max_items"])
+        results["graph"] = {key: value for key, value in summary.items() if key != "references"}
+
+    def _analyze_with_snapshot(
+        self,
+        terraform_data: Dict[str, Any],
+        known_findings: Optional[List[Dict[str, Any]]],
+        partial_report_file: Optional[str],
+        graph: Optional[ResourceGraph],
+        root: Optional[str],
+    ) -> Dict[str, Any]:
+        """
+        前回の分析結果がある場合は差分のみを分析し、分析に成功した場合は結果を保存する
+        
+        Args:
+            terraform_data: 分析対象のTerraformデータ
+            known_findings: ルールで検出済みの問題点
+            partial_report_file: ストリーミング受信中の項目を逐次保存するファイルのパス
+            graph: 解析結果全体の依存関係グラフ
+            root: Terraformルートのパス（Noneの場合は常にすべてのリソースを分析する）
+            
+        Returns:
+            分析結果（差分のみを分析した場合は、差分の件数をincrementalキーに含む）
+        """
+        if self.snapshot_store is None or root is None:
+            return self._analyze_with_model(
+                terraform_data, known_findings, partial_report_file, graph
+            )
+
+        key = SnapshotStore.make_key(
+            root,
+            [
+                self.bedrock_client.model_id,
+                self.prompt_generator.language,
+                self.rules_residual,
+                self.module_analysis,
+            ],
+        )
+        # tfparseのIDは実行ごとに変わるため、参照をアドレスに置き換えたブロックで比較する
+        pruner = self.prompt_generator.pruner or AttributePruner()
+        resources = resource_blocks(pruner.prune(terraform_data))
+        snapshot = None if self.full else self.snapshot_store.load(key)
+
+        results = None
+        if snapshot is not None:
+            results = self._analyze_incremental(
+                terraform_data, resources, snapshot, known_findings, partial_report_file, graph
+            )
+        if results is None:
+            results = self._analyze_with_model(
+                terraform_data, known_findings, partial_report_file, graph
+            )
+        # 一部のグループの分析に失敗した結果は次回の差分分析に使用しない
+        if "error" not in results and "raw_analysis" not in results and not results.get("partial"):
+            self.snapshot_store.save(key, resources, results)
+        return results
+
+    def _analyze_incremental(
+        self,
+        terraform_data: Dict[str, Any],
+        resources: Dict[str, Any],
+        snapshot: Dict[str, Any],
+        known_findings: Optional[List[Dict[str, Any]]],
+        partial_report_file: Optional[str],
+        graph: Optional[ResourceGraph],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        追加・変更されたリソースのみを分析し、前回の問題点のうち引き続き有効なものと統合する
+        
+        Args:
+            terraform_data: 分析対象のTerraformデータ
+            resources: 今回のアドレスごとの属性を絞り込んだリソースブロック
+            snapshot: 前回の分析結果のスナップショット
+            known_findings: ルールで検出済みの問題点
+            partial_report_file: ストリーミング受信中の項目を逐次保存するファイルのパス
+            graph: 解析結果全体の依存関係グラフ
+            
+        Returns:
+            統合した分析結果（変更が多い・プロンプトが大きすぎる場合はNone）
+        """
+        diff = diff_resources(snapshot["resources"], resources)
+        targets = set(diff["added"]) | set(diff["changed"])
+        console.print(
+            f"前回の分析との差分: 追加 {len(diff['added'])}件, 変更 {len(diff['changed'])}件, "
+            f"削除 {len(diff['removed'])}件, 変更なし {len(diff['unchanged'])}件"
+        )
+        # 削除による影響（冗長性の低下など）を評価するため、削除されたリソースと
+        # 参照関係にあったリソースも分析する
+        related = [
+            address
+            for address in related_addresses(snapshot["resources"], resources, diff["removed"])
+            if address not in targets
+        ]
+        targets.update(related)
+        if len(targets) > len(resources) * self.max_changed_ratio:
+            console.print("変更されたリソースが多いため、すべてのリソースを分析します")
+            return None
+        if diff["removed"] and not targets:
+            console.print("削除されたリソースの影響を評価するため、すべてのリソースを分析します")
+            return None
+
+        # 追加・変更・削除されたリソース（と削除されたリソースの参照関係にあったリソース）に
+        # 関する前回の問題点と推奨事項は除く。対象リソースを特定できないものは、
+        # 変更があれば古くなっている可能性があるため再利用せず、プロンプトに含めて再確認する
+        stale = targets | set(diff["removed"])
+        previous = dict(snapshot["result"])
+        findings, unattributed = _split_stale(previous.get("findings", []), stale)
+        recommendations, unattributed_recommendations = _split_stale(
+            previous.get("recommendations", []), stale
+        )
+        previous["findings"] = findings
+        previous["recommendations"] = recommendations
+        stats = {
+            "added": len(diff["added"]),
+            "changed": len(diff["changed"]),
+            "removed": len(diff["removed"]),
+            "unchanged": len(diff["unchanged"]),
+            "related": len(related),
+            "reused_findings": len(findings),
+            "dropped_findings": len(snapshot["result"].get("findings", [])) - len(findings),
+            "rechecked_findings": len(unattributed),
+            "dropped_recommendations": len(snapshot["result"].get("recommendations", []))
+            - len(recommendations),
+        }
+
+        if not targets:
+            console.print("追加・変更・削除されたリソースがないため、前回の分析結果を使用します")
+            previous["incremental"] = stats
+            self._attach_graph_summary(previous, graph)
+            return previous
+
+        # 追加・変更されたリソースのみのプロンプトを作成
+        # 参照を解決するため、リソースを選ぶ前に解析結果全体の属性を絞り込む
+        pruner = self.prompt_generator.pruner
+        data = (
+            pruner.prune(terraform_data)
+            if pruner is not None
+            else terraform_data
+        )
+        changed_data: Dict[str, Any] = {}
+        for resource_type, blocks in data.items():
+            if not isinstance(blocks, list):
+                continue
+            selected = [
+                block
+                for block in blocks
+                if isinstance(block, dict)
+                and resource_address(resource_type, block) in targets
+            ]
+            if selected:
+                changed_data[resource_type] = selected
+        changed_findings = (
+            [finding for finding in known_findings if finding.get("resource") in targets]
+            if known_findings
+            else None
+        )
+        prompt, token_stats = self.prompt_generator.create_incremental_prompt(
+            changed_data,
+            previous,
+            diff,
+            changed_findings,
+            graph,
+            unattributed,
+            unattributed_recommendations,
+            related,
+        )
+        self.console_renderer.print_token_savings(token_stats)
+        if token_stats.get("prompt_tokens", 0) > self.max_prompt_tokens:
+            console.print("差分のプロンプトが大きすぎるため、すべてのリソースを分析します")
+            return None
+
+        tier = self._select_tier(token_stats.get("prompt_tokens", 0), len(targets))
+        max_tokens = estimate_max_output_tokens(len(targets), self.output_token_settings)
+        if partial_report_file is None:
+            partial_report_file = os.path.join(
+                self.report_generator.output_dir, self.partial_report_filename
+            )
+        new_results = self._analyze_prompt(prompt, tier, max_tokens, partial_report_file)
+        if "error" in new_results or "raw_analysis" in new_results:
+            return new_results
+        self._expand_collapsed_findings(new_results, changed_data, graph)
+
+        # 前回の問題点と統合し、評価とスコアは今回のシステム全体の評価を使用する
+        previous_chunk = AnalysisChunk("previous")
+        previous_chunk.resource_count = len(diff["unchanged"])
+        changed_chunk = AnalysisChunk("changed")
+        changed_chunk.resource_count = len(targets)
+        results = merge_chunk_results([changed_chunk, previous_chunk], [new_results, previous])
+        results.pop("chunks", None)
+        results["overview"] = new_results.get("overview", "")
+        results["availability_score"] = new_results.get("availability_score")
+        for name in ("model_usage", "collapsed"):
+            if name in new_results:
+                results[name] = new_results[name]
+        results["incremental"] = stats
+        self._attach_graph_summary(results, graph)
+        return results
+
+    def _expand_collapsed_findings(
+        self,
+        results: Dict[str, Any],
+        terraform_data: Dict[str, Any],
+        graph: Optional[ResourceGraph],
+    ) -> None:
+        """
+        代表にまとめて送信したリソースの問題点に、同じ構成のすべてのリソースのアドレスを付与する
+        
+        Args:
+            results: Bedrockの分析結果（変更される）
+            terraform_data: 分析対象のTerraformデータ
+            graph: プロンプトの作成に使用した依存関係グラフ
+        """
+        findings = results.get("findings")
+        if not isinstance(findings, list):
+            return
+        groups = self.prompt_generator.collapsed_groups(terraform_data, graph)
+        if not groups:
+            return
+        expanded = expand_findings(findings, groups)
+        results["collapsed"] = {
+            "groups": len(groups),
+            "resources": sum(len(group.addresses) for group in groups),
+            "expanded_findings": expanded,
+        }
+
+    def _analyze_prompt_or_chunks(
+        self,
+        terraform_data: Dict[str, Any],
+        known_findings: Optional[List[Dict[str, Any]]],
+        partial_report_file: Optional[str],
+        graph: Optional[ResourceGraph],
+    ) -> Dict[str, Any]:
+        """
+        モジュール単位、またはプロンプトの大きさに応じて一括・分割して分析
+        
+        Args:
+            terraform_data: 分析対象のTerraformデータ
+            known_findings: ルールで検出済みの問題点
+            partial_report_file: ストリーミング受信中の項目を逐次保存するファイルのパス
+            graph: 解析結果全体の依存関係グラフ
             
         Returns:
             分析結果
         """
-        # プロンプトの作成
-        prompt = self.prompt_generator.create_availability_prompt(terraform_data)
+        # モジュールのインスタンスごとに分析（モジュールのリソースがない場合は通常の分析）
+        if self.module_analyzer is not None:
+            start_time = time.time()
+            module_results = self.module_analyzer.analyze(terraform_data, known_findings, graph)
+            if module_results is not None:
+                module_results["model_usage"] = {
+                    "tier": "standard",
+                    "model_id": self.bedrock_client.model_id,
+                    "latency": time.time() - start_time,
+                    "fallback_from": None,
+                }
+                return module_results
+
+        # 属性の絞り込みは一度だけ行い、一括・分割のどちらの分析にも使用する
+        pruner = self.prompt_generator.pruner
+        data = pruner.prune(terraform_data) if pruner is not None else terraform_data
+
+        # プロンプトの作成（常に分割する場合は一括のプロンプトを作成しない）
+        prompt = ""
+        token_stats: Dict[str, int] = {}
+        if self.chunked != "on":
+            prompt, token_stats = self.prompt_generator.create_availability_prompt(
+                data, known_findings, graph, original_data=terraform_data
+            )
+            self.console_renderer.print_token_savings(token_stats)
+
+        # プロンプトが大きすぎる場合は分割して分析
+        if self.chunked == "on" or (
+            self.chunked == "auto"
+            and token_stats.get("prompt_tokens", 0) > self.max_prompt_tokens
+        ):
+            start_time = time.time()
+            results = self.chunked_analyzer.analyze(data, known_findings, graph)
+            results["model_usage"] = {
+                "tier": "standard",
+                "model_id": self.bedrock_client.model_id,
+                "latency": time.time() - start_time,
+                "fallback_from": None,
+            }
+            return results
+
+        # 入力の規模に応じてモデルと最大出力トークン数を選択
+        resource_count = count_resources(terraform_data)
+        tier = self._select_tier(token_stats.get("prompt_tokens", 0), resource_count)
+        max_tokens = estimate_max_output_tokens(resource_count, self.output_token_settings)
+        if partial_report_file is None:
+            partial_report_file = os.path.join(
+                self.report_generator.output_dir, self.partial_report_filename
+            )
+        return self._analyze_prompt(prompt, tier, max_tokens, partial_report_file)
+
+    def _select_tier(self, prompt_tokens: int, resource_count: int) -> str:
+        """
+        プロンプトのトークン数とリソース数から分析に使用するモデルの区分を選択
+        
+        Args:
+            prompt_tokens: プロンプトの概算トークン数
+            resource_count: 分析対象のリソース数
+            
+        Returns:
+            モデルの区分（fast: 高速モデル / standard: 標準モデル）
+        """
+        if self.fast_client is None:
+            return "standard"
+
+        tier = (
+            "fast"
+            if prompt_tokens <= self.routing["max_prompt_tokens"]
+            and resource_count <= self.routing["max_resources"]
+            else "standard"
+        )
+        console.print(
+            f"モデル選択: [bold]{TIER_LABELS[tier]}[/bold] ({self._client_for(tier).model_id}) "
+            f"- プロンプト {prompt_tokens:,}トークン, リソース {resource_count}件"
+        )
+        return tier
+
+    def _client_for(self, tier: str) -> BedrockClient:
+        """
+        モデルの区分に対応するBedrockClientを取得
+        
+        Args:
+            tier: モデルの区分（fast/standard）
+            
+        Returns:
+            BedrockClient
+        """
+        if tier == "fast" and self.fast_client is not None:
+            return self.fast_client
+        return self.bedrock_client
+
+    def _analyze_prompt(
+        self,
+        prompt: str,
+        tier: str = "standard",
+        max_tokens: int = 4096,
+        partial_report_file: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        プロンプトをBedrockに送信し、レスポンスを解析する
+        
+        タイムアウトした場合は、設定に応じてもう一方の区分のモデルで再実行する。
+        
+        Args:
+            prompt: 送信するプロンプト
+            tier: 使用するモデルの区分（fast/standard）
+            max_tokens: 1回の呼び出しで生成する最大トークン数
+            partial_report_file: ストリーミング受信中の項目を逐次保存するファイルのパス
+            
+        Returns:
+            分析結果（使用したモデルと所要時間をmodel_usageキーに含む）
+        """
+        fallback_from = None
+        response, stream_parser = self._invoke(prompt, tier, max_tokens, partial_report_file)
+
+        if (
+            "error" in response
+            and response.get("timeout")
+            and self.fast_client is not None
+            and self.routing["fallback_on_timeout"]
+        ):
+            fallback_from = tier
+            tier = "standard" if tier == "fast" else "fast"
+            console.print(
+                f"[bold yellow]警告: {TIER_LABELS[fallback_from]}がタイムアウトしたため、"
+                f"{TIER_LABELS[tier]}で再実行します[/bold yellow]"
+            )
+            response, stream_parser = self._invoke(prompt, tier, max_tokens, partial_report_file)
 
-        # Bedrockを使用して分析
-        response = self.bedrock_client.invoke(prompt)
+        results = self._parse_response(response, self._client_for(tier), stream_parser)
+        results["model_usage"] = {
+            "tier": tier,
+            "model_id": self._client_for(tier).model_id,
+            "latency": response.get("elapsed_time"),
+            "time_to_first_token": response.get("metrics", {}).get("time_to_first_token"),
+            "fallback_from": fallback_from,
+            "max_tokens": max_tokens,
+            "continuations": response.get("continuations", 0),
+        }
+        return results
 
+    def _invoke(
+        self,
+        prompt: str,
+        tier: str,
+        max_tokens: int,
+        partial_report_file: Optional[str] = None,
+    ) -> Tuple[Dict[str, Any], Optional[IncrementalAnalysisParser]]:
+        """
+        指定した区分のモデルでBedrockを呼び出す
+        
+        ストリーミングの場合は受信中のテキストを逐次解析し、閉じた問題点と推奨事項を
+        表示に反映してファイルに保存する。呼び出しに失敗した場合のみファイルを残す。
+        
+        Args:
+            prompt: 送信するプロンプト
+            tier: 使用するモデルの区分（fast/standard）
+            max_tokens: 1回の呼び出しで生成する最大トークン数
+            partial_report_file: 受信中の項目を逐次保存するファイルのパス（Noneの場合は保存しない）
+            
+        Returns:
+            BedrockClientのレスポンスと、逐次解析に使用したIncrementalAnalysisParser
+            （逐次解析しない場合はNone）
+        """
+        stream_parser = (
+            IncrementalAnalysisParser() if self.stream and self.incremental_parse else None
+        )
+        writer = (
+            PartialReportWriter(partial_report_file)
+            if stream_parser is not None and partial_report_file
+            else None
+        )
+
+        # ストリーミングの場合は受信中の進捗を表示
+        with self.console_renderer.stream_progress(enabled=self.stream) as progress:
+
+            def on_delta(delta: str) -> None:
+                progress.update(delta)
+                if stream_parser is None:
+                    return
+                resets = stream_parser.resets
+                items = stream_parser.feed(delta)
+                if stream_parser.resets != resets:
+                    # 別の分析結果のオブジェクトに切り替わった場合は保存済みの項目を破棄する
+                    if writer is not None:
+                        writer.reset()
+                    progress.show_items(stream_parser.items)
+                if items:
+                    if writer is not None:
+                        writer.write(items)
+                    progress.show_items(stream_parser.items)
+
+            try:
+                response = self._client_for(tier).invoke(
+                    prompt, max_tokens=max_tokens, stream=self.stream, on_delta=on_delta
+                )
+            except BaseException:
+                # 中断された場合も受信済みの項目を残す
+                if writer is not None:
+                    writer.close(keep=True)
+                raise
+
+        if writer is not None:
+            partial_report_file = writer.close(keep="error" in response)
+            if partial_report_file is not None:
+                response["partial_report_file"] = partial_report_file
+        return response, stream_parser
+
+    def _parse_response(
+        self,
+        response: Dict[str, Any],
+        client: Optional[BedrockClient] = None,
+        stream_parser: Optional[IncrementalAnalysisParser] = None,
+    ) -> Dict[str, Any]:
+        """
+        Bedrockのレスポンスを解析して分析結果を作成する
+        
+        形式が正しくないキーがある場合は、そのキーのみを補完用のプロンプトで要求して統合する。
+        
+        Args:
+            response: BedrockClientのレスポンス
+            client: 補完用のプロンプトを送信するBedrockClient（Noneの場合は標準モデル）
+            stream_parser: 受信中のテキストを逐次解析したIncrementalAnalysisParser
+            
+        Returns:
+            分析結果
+        """
         # エラーチェック
         if "error" in response:
-            return {"error": response["error"]}
+            error_result: Dict[str, Any] = {"error": response["error"]}
+            # ストリーミングの途中で失敗した場合は受信済みの項目を含める
+            if stream_parser is not None and any(stream_parser.items.values()):
+                error_result["partial_result"] = stream_parser.partial_result()
+            if response.get("partial_report_file"):
+                error_result["partial_report_file"] = response["partial_report_file"]
+            return error_result
 
-        # レスポンスの解析
+        # レスポンスの解析（逐次解析できなかった場合はテキスト全体を解析する）
         analysis_text = response["text"]
-        analysis_result = self.analysis_parser.parse(analysis_text)
+        if stream_parser is not None:
+            analysis_result = stream_parser.finish(analysis_text, self.analysis_parser)
+        else:
+            analysis_result = self.analysis_parser.parse(analysis_text)
 
         # 検証
         if not self.analysis_parser.validate_analysis_results(analysis_result):
-            # 検証に失敗した場合は生のテキストを返す
-            return {"raw_analysis": analysis_text}
+            # 構造化された部分がある場合は不足している項目のみを補完する
+            repaired = self._repair_result(analysis_result, client or self.bedrock_client)
+            if repaired is None:
+                # 補完できない場合は生のテキストを返し、同じレスポンスをキャッシュから使用しない
+                (client or self.bedrock_client).discard_cached(response)
+                return {"raw_analysis": analysis_text}
+            return repaired
 
         return analysis_result
 
+    def _repair_result(
+        self, analysis_result: Any, client: BedrockClient
+    ) -> Optional[Dict[str, Any]]:
+        """
+        分析結果のうち不足している・形式が正しくない項目をBedrockに要求して補完する
+        
+        Args:
+            analysis_result: 検証に失敗した分析結果
+            client: 補完用のプロンプトを送信するBedrockClient
+            
+        Returns:
+            補完した分析結果（補完できない場合はNone）
+        """
+        if (
+            not self.repair_settings["enabled"]
+            or not isinstance(analysis_result, dict)
+            or "raw_analysis" in analysis_result
+        ):
+            return None
+
+        invalid_fields = self.analysis_parser.find_invalid_fields(analysis_result)
+        valid_part = {
+            key: value for key, value in analysis_result.items() if key not in invalid_fields
+        }
+        console.print(
+            f"[bold yellow]分析結果の項目が不足しているため補完を要求します: "
+            f"{', '.join(invalid_fields)}[/bold yellow]"
+        )
+
+        prompt = self.prompt_generator.create_repair_prompt(valid_part, invalid_fields)
+        response = client.invoke(
+            prompt, max_tokens=self.repair_settings["max_tokens"], stream=False
+        )
+        if "error" in response:
+            return None
+
+        repair = self.analysis_parser.parse(response["text"])
+        if not isinstance(repair, dict):
+            client.discard_cached(response)
+            return None
+
+        # 要求した項目のうち形式が正しいもののみを統合する
+        merged = dict(valid_part)
+        for field in invalid_fields:
+            if field in repair:
+                merged[field] = repair[field]
+        if not self.analysis_parser.validate_analysis_results(merged):
+            return None
+
+        merged["repaired_fields"] = invalid_fields
+        return merged
+
+    def print_retry_stats(self) -> None:
+        """
+        Bedrock呼び出しの再試行と同時実行数の統計をコンソールに表示
+        """
+        self.console_renderer.print_retry_stats(self.bedrock_client.get_retry_stats())
+
+    def get_module_cache_stats(self) -> Optional[Dict[str, int]]:
+        """
+        モジュール単位の分析結果のキャッシュのヒット数とミス数を取得
+        
+        Returns:
+            hitsとmissesを含む辞書（モジュール単位の分析が無効な場合はNone）
+        """
+        if self.module_analyzer is None:
+            return None
+        cache = self.module_analyzer.cache
+        return {"hits": cache.hits, "misses": cache.misses}
+
     def print_analysis_results(self, results: Dict[str, Any]) -> None:
         """
         分析結果をコンソールに表示
@@ -98,15 +928,45 @@ class AvailabilityChecker:
         """
         return self.report_generator.save_json_report(results, output_file)
 
-    def export_as_html(self, results: Dict[str, Any], output_file: str) -> str:
+    def export_as_html(
+        self, results: Dict[str, Any], output_file: str, mode: Optional[str] = None
+    ) -> str:
         """
         分析結果をHTMLファイルとして出力
         
         Args:
             results: HTMLに変換する分析結果
             output_file: 出力HTMLファイルのパス
+            mode: 問題点の表示方式（auto/table/paginated）（Noneの場合は設定から取得）
             
         Returns:
             保存したファイルのフルパス
         """
-        return self.report_generator.export_as_html(results, output_file)
+        return self.report_generator.export_as_html(results, output_file, mode)
+
+
+def _split_stale(
+    items: List[Dict[str, Any]], stale: Set[str]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    前回の問題点・推奨事項を、引き続き有効なものと対象リソースを特定できないものに分ける
+
+    Args:
+        items: 前回の問題点または推奨事項（resourcesキーに対象リソースのアドレスを含む）
+        stale: 追加・変更・削除されたリソースのアドレス
+
+    Returns:
+        対象リソースが変更されていないもののリストと、対象リソースを特定できないもののリスト
+        （変更がない場合は空）。対象リソースが変更されたものはいずれにも含めない
+    """
+    valid: List[Dict[str, Any]] = []
+    unattributed: List[Dict[str, Any]] = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        addresses = item.get("resources") or []
+        if stale and not addresses:
+            unattributed.append(item)
+        elif stale.isdisjoint(addresses):
+            valid.append(item)
+    return valid, unattributed
@@ -0,0 +1,370 @@
+"""
+大規模なTerraformデータを分割して分析し、結果を統合するモジュール
+"""
+
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from rich.console import Console
+
+from src.analysis.prompt_generator import PromptGenerator
+from src.analysis.resource_graph import ResourceGraph
+from src.analysis.token_estimator import estimate_max_output_tokens, estimate_tokens
+from src.client.bedrock_client import BedrockClient
+from src.config import get_settings
+from src.terraform.resource_utils import (
+    DATA_ADDRESS_PATTERN,
+    NON_RESOURCE_BLOCK_TYPES,
+    module_path,
+    resource_address,
+)
+
+# Richコンソールを初期化
+console = Console()
+
+# 優先度・重要度の並び順
+PRIORITY_ORDER = {"高": 0, "high": 0, "中": 1, "medium": 1, "低": 2, "low": 2}
+
+
+class AnalysisChunk:
+    """
+    1回のBedrock呼び出しで分析するリソースのグループ
+    """
+
+    def __init__(self, label: str) -> None:
+        """
+        AnalysisChunkの初期化
+
+        Args:
+            label: グループの名前（モジュール名やリソースタイプ）
+        """
+        self.label = label
+        self.data: Dict[str, List[Dict[str, Any]]] = {}
+        self.tokens = 0
+        self.resource_count = 0
+
+    def add(self, block_type: str, block: Dict[str, Any], tokens: int) -> None:
+        """
+        ブロックをグループに追加
+
+        Args:
+            block_type: ブロックタイプ（リソースタイプ）
+            block: ブロック
+            tokens: ブロックの概算トークン数
+        """
+        self.data.setdefault(block_type, []).append(block)
+        self.tokens += tokens
+        if block_type not in NON_RESOURCE_BLOCK_TYPES and not DATA_ADDRESS_PATTERN.search(
+            resource_address(block_type, block)
+        ):
+            self.resource_count += 1
+
+
+class ChunkPlanner:
+    """
+    Terraformデータをトークン数の上限に収まるグループに分割するクラス
+
+    まずモジュール単位でグループ化し、上限を超えるモジュールはリソースタイプ単位、
+    さらに上限を超えるリソースタイプはブロック単位で分割する。
+    小さなグループは上限の範囲内で1つのグループにまとめる。
+    """
+
+    def __init__(self, max_chunk_tokens: int) -> None:
+        """
+        ChunkPlannerの初期化
+
+        Args:
+            max_chunk_tokens: 1グループあたりの最大トークン数（概算）
+        """
+        self.max_chunk_tokens = max_chunk_tokens
+
+    def plan(self, terraform_data: Dict[str, Any]) -> List[AnalysisChunk]:
+        """
+        Terraformデータをグループに分割
+
+        Args:
+            terraform_data: 分割するTerraformデータ（属性を絞り込み済みのもの）
+
+        Returns:
+            グループのリスト
+        """
+        # モジュールごと・リソースタイプごとにブロックを分類
+        modules: Dict[str, Dict[str, List[Tuple[Dict[str, Any], int]]]] = {}
+        for block_type, blocks in terraform_data.items():
+            if not isinstance(blocks, list):
+                continue
+            for block in blocks:
+                if not isinstance(block, dict):
+                    continue
+                module = module_path(resource_address(block_type, block)) or "(root)"
+                tokens = estimate_tokens(
+                    json.dumps(block, separators=(",", ":"), ensure_ascii=False, default=str)
+                )
+                modules.setdefault(module, {}).setdefault(block_type, []).append((block, tokens))
+
+        # モジュール単位のグループを作成（上限を超える場合はさらに分割）
+        groups: List[AnalysisChunk] = []
+        for module in sorted(modules):
+            groups.extend(self._split_module(module, modules[module]))
+
+        # 小さなグループを上限の範囲内でまとめる
+        chunks: List[AnalysisChunk] = []
+        for group in groups:
+            target = next(
+                (c for c in chunks if c.tokens + group.tokens <= self.max_chunk_tokens), None
+            )
+            if target is None:
+                chunks.append(group)
+                continue
+            target.label = f"{target.label}, {group.label}"
+            for block_type, blocks in group.data.items():
+                target.data.setdefault(block_type, []).extend(blocks)
+            target.tokens += group.tokens
+            target.resource_count += group.resource_count
+
+        return chunks
+
+    def _split_module(
+        self, module: str, types: Dict[str, List[Tuple[Dict[str, Any], int]]]
+    ) -> List[AnalysisChunk]:
+        """
+        モジュールのブロックを上限に収まるグループに分割
+
+        Args:
+            module: モジュール名
+            types: リソースタイプごとの(ブロック, トークン数)のリスト
+
+        Returns:
+            グループのリスト
+        """
+        total = sum(tokens for blocks in types.values() for _, tokens in blocks)
+        if total <= self.max_chunk_tokens:
+            chunk = AnalysisChunk(module)
+            for block_type, blocks in types.items():
+                for block, tokens in blocks:
+                    chunk.add(block_type, block, tokens)
+            return [chunk]
+
+        chunks: List[AnalysisChunk] = []
+        current: Optional[AnalysisChunk] = None
+        for block_type in sorted(types):
+            for block, tokens in types[block_type]:
+                if current is None or current.tokens + tokens > self.max_chunk_tokens:
+                    current = AnalysisChunk(module)
+                    chunks.append(current)
+                current.add(block_type, block, tokens)
+
+        for chunk in chunks:
+            chunk.label = f"{module} ({', '.join(chunk.data)})"
+        return chunks
+
+
+class ChunkedAnalyzer:
+    """
+    Terraformデータをグループごとに並列分析し、結果を統合するクラス
+    """
+
+    def __init__(
+        self,
+        prompt_generator: PromptGenerator,
+        bedrock_client: BedrockClient,
+        parse_response: Callable[[Dict[str, Any]], Dict[str, Any]],
+        max_chunk_tokens: Optional[int] = None,
+        workers: Optional[int] = None,
+        stream: Optional[bool] = None,
+    ) -> None:
+        """
+        ChunkedAnalyzerの初期化
+
+        Args:
+            prompt_generator: プロンプトの生成に使用するPromptGenerator
+            bedrock_client: 分析に使用するBedrockClient
+            parse_response: Bedrockのレスポンスを解析して分析結果を返す関数
+            max_chunk_tokens: 1グループあたりの最大トークン数（Noneの場合は設定から取得）
+            workers: 並列に分析するグループの数（Noneの場合は設定から取得）
+            stream: ストリーミングでレスポンスを受信するかどうか（Noneの場合は設定から取得）
+        """
+        analysis_settings = get_settings()["analysis"]
+        self.prompt_generator = prompt_generator
+        self.bedrock_client = bedrock_client
+        self.parse_response = parse_response
+        self.planner = ChunkPlanner(max_chunk_tokens or analysis_settings["max_chunk_tokens"])
+        self.workers = workers or analysis_settings["chunk_workers"]
+        self.output_token_settings = analysis_settings["output_tokens"]
+        self.stream = stream
+
+    def analyze(
+        self,
+        terraform_data: Dict[str, Any],
+        known_findings: Optional[List[Dict[str, Any]]] = None,
+        graph: Optional[ResourceGraph] = None,
+    ) -> Dict[str, Any]:
+        """
+        Terraformデータを分割して分析し、統合した結果を返す
+
+        Args:
+            terraform_data: 分析対象のTerraformデータ（絞り込み済みのブロックはそのまま使用する）
+            known_findings: ルールで検出済みの問題点（各グループのプロンプトに含める）
+            graph: 解析結果全体の依存関係グラフ（各グループのリソースに関する要約を
+                プロンプトに含める）
+
+        Returns:
+            統合された分析結果（単一の分析結果と同じ形式）
+        """
+        pruner = self.prompt_generator.pruner
+        data = (
+            pruner.prune(terraform_data)
+            if pruner is not None
+            else terraform_data
+        )
+        chunks = self.planner.plan(data)
+        console.print(f"分割分析: [bold]{len(chunks)}[/bold]個のグループに分割しました")
+
+        # プロンプトは呼び出し元のスレッドで作成し、Bedrockの呼び出しのみを並列実行する
+        prompts = [
+            self.prompt_generator.create_availability_prompt(
+                c.data, _findings_for_chunk(c, known_findings or []), graph
+            )[0]
+            for c in chunks
+        ]
+        # 最大出力トークン数はリソース数が最も多いグループに合わせる
+        max_tokens = estimate_max_output_tokens(
+            max((c.resource_count for c in chunks), default=0), self.output_token_settings
+        )
+        responses = self.bedrock_client.invoke_many(
+            prompts, max_tokens=max_tokens, stream=self.stream, max_concurrency=self.workers
+        )
+        results = [self.parse_response(response) for response in responses]
+
+        return merge_chunk_results(chunks, results)
+
+
+def merge_chunk_results(
+    chunks: List[AnalysisChunk], results: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    グループごとの分析結果を1つの分析結果に統合する
+
+    問題点と推奨事項は重複を取り除き、可用性スコアはリソース数で重み付けした平均とする。
+
+    Args:
+        chunks: グループのリスト
+        results: グループごとの分析結果（chunksと同じ順序）
+
+    Returns:
+        統合された分析結果（一部のグループの分析に失敗した場合はpartialにTrue、
+        failed_chunksに失敗したグループのラベルのリストを設定する）
+    """
+    valid = [
+        (chunk, result)
+        for chunk, result in zip(chunks, results)
+        if "error" not in result and "raw_analysis" not in result
+    ]
+    chunk_summary = [
+        {
+            "label": chunk.label,
+            "resource_count": chunk.resource_count,
+            "availability_score": result.get("availability_score"),
+            "status": "error"
+            if "error" in result
+            else "unstructured"
+            if "raw_analysis" in result
+            else "ok",
+        }
+        for chunk, result in zip(chunks, results)
+    ]
+
+    # すべてのグループの分析に失敗した場合は最初の結果をそのまま返す
+    if not valid:
+        return results[0] if results else {"error": "分析対象のリソースがありません"}
+    failed_chunks = [summary["label"] for summary in chunk_summary if summary["status"] != "ok"]
+
+    # 可用性スコア（リソース数による加重平均）
+    weighted_sum = 0.0
+    total_weight = 0
+    for chunk, result in valid:
+        score = result.get("availability_score")
+        if isinstance(score, (int, float)):
+            weight = max(chunk.resource_count, 1)
+            weighted_sum += score * weight
+            total_weight += weight
+    score = round(weighted_sum / total_weight) if total_weight else 0
+
+    # 問題点（重複を除く）
+    findings: List[Dict[str, Any]] = []
+    seen_findings = set()
+    for _, result in valid:
+        for finding in result.get("findings", []):
+            key = (
+                _normalize(finding.get("category")),
+                _normalize(finding.get("severity")),
+                _normalize(finding.get("description")),
+            )
+            if key not in seen_findings:
+                seen_findings.add(key)
+                findings.append(finding)
+
+    # 推奨事項（重複を除き、優先度順に並べる）
+    recommendations: List[Dict[str, Any]] = []
+    seen_recommendations = set()
+    for _, result in valid:
+        for rec in result.get("recommendations", []):
+            rec_key = _normalize(rec.get("description"))
+            if rec_key not in seen_recommendations:
+                seen_recommendations.add(rec_key)
+                recommendations.append(rec)
+    recommendations.sort(key=lambda r: PRIORITY_ORDER.get(_normalize(r.get("priority")), 3))
+
+    overview = "\n".join(
+        f"[{chunk.label}] {result.get('overview', '')}" for chunk, result in valid
+    )
+
+    merged: Dict[str, Any] = {
+        "overview": overview,
+        "availability_score": score,
+        "findings": findings,
+        "recommendations": recommendations,
+        "chunks": chunk_summary,
+    }
+    # 一部のグループの分析に失敗した場合は、結果が不完全であることを明示する
+    if failed_chunks:
+        merged["partial"] = True
+        merged["failed_chunks"] = failed_chunks
+    return merged
+
+
+def _findings_for_chunk(
+    chunk: AnalysisChunk, findings: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """
+    問題点のうちグループに含まれるリソースのものを取得
+
+    Args:
+        chunk: グループ
+        findings: 問題点のリスト（resourceキーにリソースのアドレスを含む）
+
+    Returns:
+        グループに含まれるリソースの問題点のリスト
+    """
+    if not findings:
+        return []
+    addresses = {
+        resource_address(block_type, block)
+        for block_type, blocks in chunk.data.items()
+        for block in blocks
+    }
+    return [finding for finding in findings if finding.get("resource") in addresses]
+
+
+def _normalize(value: Any) -> str:
+    """
+    重複判定のために文字列を正規化する
+
+    Args:
+        value: 正規化する値
+
+    Returns:
+        小文字化し、連続する空白を1つにまとめた文字列
+    """
+    return re.sub(r"\s+", " ", str(value or "")).strip().lower()
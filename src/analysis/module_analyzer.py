@@ -0,0 +1,483 @@
+"""
+モジュールのインスタンスごとに分析し、結果をフィンガープリントでキャッシュするモジュール
+"""
+
+import copy
+import hashlib
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
+
+from rich.console import Console
+
+from src.analysis.chunked_analyzer import AnalysisChunk, merge_chunk_results
+from src.analysis.prompt_generator import PromptGenerator
+from src.analysis.resource_graph import ResourceGraph
+from src.analysis.token_estimator import estimate_max_output_tokens
+from src.cache.disk_cache import DiskCache
+from src.client.bedrock_client import BedrockClient
+from src.config import get_settings
+from src.terraform.resource_utils import count_resources, iter_resources, resource_address
+
+# Richコンソールを初期化
+console = Console()
+
+# キャッシュの形式のバージョン（分析結果の形式を変更した場合に更新する）
+MODULE_CACHE_VERSION = 1
+
+# アドレス先頭のモジュールのインスタンス（例: envs/dev:module.vpc[0]）
+MODULE_INSTANCE_PATTERN = re.compile(r"^((?:[^:]*:)?)(module\.[^.\[]+(?:\[[^\]]*\])?)\.")
+
+
+class ModuleVerdictCache:
+    """
+    モジュールのフィンガープリントをキーとして分析結果をキャッシュするクラス
+
+    同じプロセス内で同じフィンガープリントの分析が同時に要求された場合は、
+    最初の要求のみが分析し、他の要求はその結果を待って使用する。
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        ttl_seconds: Optional[float] = None,
+        max_size_mb: Optional[int] = None,
+        persist: Optional[bool] = None,
+    ) -> None:
+        """
+        ModuleVerdictCacheの初期化
+
+        Args:
+            directory: キャッシュディレクトリのパス（Noneの場合は設定から取得）
+            ttl_seconds: キャッシュの有効期間（秒）（Noneの場合は設定から取得）
+            max_size_mb: キャッシュの最大サイズ（MB）（Noneの場合は設定から取得）
+            persist: ディスクに保存するかどうか（Noneの場合は設定から取得。
+                保存しない場合もプロセス内では結果を共有する）
+        """
+        cache_settings = get_settings()["cache"]
+        module_settings = cache_settings["modules"]
+
+        self.store: Optional[DiskCache] = None
+        if persist if persist is not None else module_settings["enabled"]:
+            directory = (
+                directory
+                or module_settings.get("directory")
+                or os.path.join(cache_settings["directory"], "modules")
+            )
+            self.store = DiskCache(
+                directory,
+                max_size_bytes=(max_size_mb or module_settings["max_size_mb"]) * 1024 * 1024,
+                ttl_seconds=ttl_seconds or module_settings["ttl_seconds"],
+            )
+
+        self._lock = threading.Lock()
+        self._verdicts: Dict[str, Dict[str, Any]] = {}
+        self._pending: Dict[str, threading.Event] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model_id: str, prompt: str) -> str:
+        """
+        モジュールのフィンガープリントを作成
+
+        Args:
+            model_id: BedrockモデルID
+            prompt: インスタンスに依存する部分を取り除いたモジュールのプロンプト
+
+        Returns:
+            フィンガープリント
+        """
+        payload = f"{MODULE_CACHE_VERSION}\n{model_id}\n{prompt}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def try_acquire(self, key: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        キャッシュから分析結果を取得し、存在しない場合は分析する権利を得る
+
+        分析する権利を得た場合、呼び出し元は分析した後にputまたはreleaseを呼び出す必要がある。
+        他のスレッドが同じキーを分析中の場合は、waitで完了を待ってから再度呼び出す。
+
+        Args:
+            key: フィンガープリント
+
+        Returns:
+            キャッシュされた分析結果（存在しない場合はNone）と、分析する権利を得たかどうか
+        """
+        with self._lock:
+            verdict = self._verdicts.get(key)
+            if verdict is None and self.store is not None:
+                value = self.store.get(key)
+                if isinstance(value, dict):
+                    verdict = cast(Dict[str, Any], value)
+                    self._verdicts[key] = verdict
+            if verdict is not None:
+                self.hits += 1
+                return verdict, False
+            if key in self._pending:
+                return None, False
+            self._pending[key] = threading.Event()
+            self.misses += 1
+            return None, True
+
+    def wait(self, key: str) -> None:
+        """
+        他のスレッドによる分析が完了（または失敗）するまで待つ
+
+        Args:
+            key: フィンガープリント
+        """
+        with self._lock:
+            event = self._pending.get(key)
+        if event is not None:
+            event.wait()
+
+    def put(self, key: str, verdict: Dict[str, Any]) -> None:
+        """
+        分析結果を保存し、同じキーを待っているスレッドに通知する
+
+        Args:
+            key: フィンガープリント
+            verdict: 分析結果
+        """
+        with self._lock:
+            self._verdicts[key] = verdict
+        if self.store is not None:
+            try:
+                self.store.put(key, verdict)
+            except Exception as e:
+                # キャッシュへの保存に失敗しても分析結果は利用できるため警告のみ
+                print(f"警告: モジュールの分析結果のキャッシュ保存に失敗しました: {e}")
+        self.release(key)
+
+    def release(self, key: str) -> None:
+        """
+        分析する権利を解放する（分析に失敗した場合は待っているスレッドのいずれかが再度分析する）
+
+        Args:
+            key: フィンガープリント
+        """
+        with self._lock:
+            event = self._pending.pop(key, None)
+        if event is not None:
+            event.set()
+
+
+class ModuleAnalyzer:
+    """
+    モジュールのインスタンスごとの分析結果とモジュール横断の分析結果を統合するクラス
+
+    インスタンスのプロンプトからモジュールのアドレスとルートのパスを取り除いたものを
+    フィンガープリントとするため、同じソースに同じ入力を与えたモジュールは
+    ルートやモジュール名が異なっても1回の分析結果を共有する。
+    """
+
+    def __init__(
+        self,
+        prompt_generator: PromptGenerator,
+        bedrock_client: BedrockClient,
+        parse_response: Callable[[Dict[str, Any]], Dict[str, Any]],
+        cache: Optional[ModuleVerdictCache] = None,
+        workers: Optional[int] = None,
+        stream: Optional[bool] = None,
+    ) -> None:
+        """
+        ModuleAnalyzerの初期化
+
+        Args:
+            prompt_generator: プロンプトの生成に使用するPromptGenerator
+            bedrock_client: 分析に使用するBedrockClient
+            parse_response: Bedrockのレスポンスを解析して分析結果を返す関数
+            cache: 分析結果のキャッシュ（Noneの場合は設定から作成）
+            workers: 並列に分析するモジュールの数（Noneの場合は設定から取得）
+            stream: ストリーミングでレスポンスを受信するかどうか（Noneの場合は設定から取得）
+        """
+        settings = get_settings()
+        analysis_settings = settings["analysis"]
+        self.prompt_generator = prompt_generator
+        self.bedrock_client = bedrock_client
+        self.parse_response = parse_response
+        self.cache = cache or ModuleVerdictCache()
+        self.workers = workers or analysis_settings["chunk_workers"]
+        self.output_token_settings = analysis_settings["output_tokens"]
+        self.max_references = settings["prompt"]["graph"]["max_references"]
+        self.stream = stream
+
+    def analyze(
+        self,
+        terraform_data: Dict[str, Any],
+        known_findings: Optional[List[Dict[str, Any]]] = None,
+        graph: Optional[ResourceGraph] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        モジュールごとに分析し、モジュール横断の分析結果と統合する
+
+        Args:
+            terraform_data: 分析対象のTerraformデータ
+            known_findings: ルールで検出済みの問題点（各プロンプトに含める）
+            graph: 解析結果全体の依存関係グラフ
+
+        Returns:
+            統合された分析結果（modulesキーにモジュールごとの概要を含む）。
+            モジュールのリソースがない場合はNone
+        """
+        # 参照先のアドレスを解決するため、分割する前に全体の属性を絞り込む
+        pruner = self.prompt_generator.pruner
+        data = (
+            pruner.prune(terraform_data)
+            if pruner is not None
+            else terraform_data
+        )
+        root_data, instances = split_module_instances(data)
+        if not instances:
+            return None
+
+        # 同じフィンガープリントのインスタンスをまとめる
+        groups: Dict[str, Tuple[List[str], int, str]] = {}
+        for instance, instance_data in instances.items():
+            prompt = _relativize(
+                self.prompt_generator.create_availability_prompt(
+                    instance_data, _findings_for(instance_data, known_findings), graph
+                )[0],
+                instance,
+            )
+            key = ModuleVerdictCache.make_key(self.bedrock_client.model_id, prompt)
+            labels, resource_count, _ = groups.get(key, ([], 0, prompt))
+            labels.append(instance)
+            groups[key] = (labels, resource_count + count_resources(instance_data), prompt)
+
+        verdicts, analyzed = self._analyze_groups(groups)
+        console.print(
+            f"モジュール単位の分析: [bold]{len(instances)}[/bold]個のインスタンス "
+            f"(フィンガープリント {len(groups)}件, キャッシュ済み {len(groups) - len(analyzed)}件, "
+            f"新規に分析 {len(analyzed)}件)"
+        )
+
+        chunks: List[AnalysisChunk] = []
+        results: List[Dict[str, Any]] = []
+        module_summaries: List[Dict[str, Any]] = []
+        for key, (labels, resource_count, _) in groups.items():
+            chunk = AnalysisChunk(", ".join(labels))
+            chunk.resource_count = resource_count
+            result = copy.deepcopy(verdicts[key])
+            for finding in result.get("findings", []):
+                if isinstance(finding, dict):
+                    finding["module"] = chunk.label
+            chunks.append(chunk)
+            results.append(result)
+            module_summaries.append(
+                {
+                    "label": chunk.label,
+                    "fingerprint": key[:12],
+                    "resource_count": resource_count,
+                    "cached": key not in analyzed,
+                    "result": result,
+                }
+            )
+
+        # ルートのリソースとモジュール間の関係を小さなプロンプトで分析
+        cross_chunk = AnalysisChunk("(root)")
+        cross_chunk.resource_count = count_resources(root_data)
+        cross_prompt = self.prompt_generator.create_cross_module_prompt(
+            root_data,
+            module_summaries,
+            self._module_dependencies(graph) if graph is not None else [],
+            _findings_for(root_data, known_findings),
+            graph,
+        )
+        response = self.bedrock_client.invoke(
+            cross_prompt,
+            max_tokens=estimate_max_output_tokens(
+                cross_chunk.resource_count, self.output_token_settings
+            ),
+            stream=self.stream,
+        )
+        chunks.insert(0, cross_chunk)
+        results.insert(0, self.parse_response(response))
+
+        merged = merge_chunk_results(chunks, results)
+        chunk_summary = merged.pop("chunks", [])
+        if "error" not in merged and "raw_analysis" not in merged:
+            merged["modules"] = [
+                {
+                    "label": summary["label"],
+                    "fingerprint": summary["fingerprint"],
+                    "resource_count": summary["resource_count"],
+                    "availability_score": summary["result"].get("availability_score"),
+                    "cached": summary["cached"],
+                }
+                for summary in module_summaries
+            ]
+            if chunk_summary and chunk_summary[0]["status"] != "ok":
+                merged["cross_module_status"] = chunk_summary[0]["status"]
+        return merged
+
+    def _analyze_groups(
+        self, groups: Dict[str, Tuple[List[str], int, str]]
+    ) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+        """
+        キャッシュにないフィンガープリントのモジュールを並列に分析する
+
+        Args:
+            groups: フィンガープリントごとの(インスタンスのリスト, リソース数, プロンプト)
+
+        Returns:
+            フィンガープリントごとの分析結果と、新規に分析したフィンガープリントのリスト
+        """
+        verdicts: Dict[str, Dict[str, Any]] = {}
+        analyzed: List[str] = []
+        pending = list(groups)
+        while pending:
+            owned: List[str] = []
+            waiting: List[str] = []
+            for key in pending:
+                verdict, owner = self.cache.try_acquire(key)
+                if verdict is not None:
+                    verdicts[key] = verdict
+                elif owner:
+                    owned.append(key)
+                else:
+                    waiting.append(key)
+
+            try:
+                if owned:
+                    max_tokens = estimate_max_output_tokens(
+                        max(groups[key][1] for key in owned), self.output_token_settings
+                    )
+                    responses = self.bedrock_client.invoke_many(
+                        [groups[key][2] for key in owned],
+                        max_tokens=max_tokens,
+                        stream=self.stream,
+                        max_concurrency=self.workers,
+                    )
+                    for key, response in zip(owned, responses):
+                        result = self.parse_response(response)
+                        verdicts[key] = result
+                        analyzed.append(key)
+                        # 分析に失敗した結果はキャッシュしない
+                        if "error" not in result and "raw_analysis" not in result:
+                            self.cache.put(key, result)
+            finally:
+                for key in owned:
+                    self.cache.release(key)
+
+            # 他のスレッドが分析中のものは、権利を解放した後に完了を待ってから再度取得する
+            # （失敗した場合はこのスレッドが分析する）
+            for key in waiting:
+                self.cache.wait(key)
+            pending = waiting
+        return verdicts, analyzed
+
+    def _module_dependencies(self, graph: ResourceGraph) -> List[str]:
+        """
+        依存関係グラフからモジュール間（およびルートのリソースとモジュール間）の参照を求める
+
+        Args:
+            graph: 解析結果全体の依存関係グラフ
+
+        Returns:
+            「参照元 -> 参照先」の形式の行のリスト
+        """
+        dependencies: Dict[str, List[str]] = {}
+        for source, targets in graph.references.items():
+            source_module = module_instance(source) or source
+            for target in targets:
+                target_module = module_instance(target) or target
+                if source_module == target_module:
+                    continue
+                nodes = dependencies.setdefault(source_module, [])
+                if target_module not in nodes:
+                    nodes.append(target_module)
+        return [
+            f"{source} -> {', '.join(targets)}"
+            for source, targets in list(dependencies.items())[: self.max_references]
+        ]
+
+
+def module_instance(address: str) -> str:
+    """
+    リソースのアドレスから最上位のモジュールのインスタンスを取得
+
+    Args:
+        address: リソースのアドレス（例: module.vpc.module.subnets.aws_subnet.public[0]）
+
+    Returns:
+        最上位のモジュールのインスタンス（例: module.vpc）。
+        ルートモジュールのリソースの場合は空文字列
+    """
+    match = MODULE_INSTANCE_PATTERN.match(address)
+    if not match:
+        return ""
+    return f"{match.group(1)}{match.group(2)}"
+
+
+def split_module_instances(
+    terraform_data: Dict[str, Any]
+) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """
+    解析結果をルートモジュールのブロックと最上位のモジュールのインスタンスごとのブロックに分ける
+
+    Args:
+        terraform_data: 解析結果（属性を絞り込み済みのもの）
+
+    Returns:
+        ルートモジュールのブロックと、インスタンスごとのブロック
+        （リソースを含まないインスタンスはルートモジュールに含める）
+    """
+    root_data: Dict[str, Any] = {}
+    instances: Dict[str, Dict[str, Any]] = {}
+    for block_type, blocks in terraform_data.items():
+        if not isinstance(blocks, list):
+            continue
+        for block in blocks:
+            if not isinstance(block, dict):
+                continue
+            instance = module_instance(resource_address(block_type, block))
+            target = instances.setdefault(instance, {}) if instance else root_data
+            target.setdefault(block_type, []).append(block)
+
+    for instance in [key for key, data in instances.items() if not count_resources(data)]:
+        for block_type, blocks in instances.pop(instance).items():
+            root_data.setdefault(block_type, []).extend(blocks)
+    return root_data, instances
+
+
+def _relativize(prompt: str, instance: str) -> str:
+    """
+    プロンプトからインスタンスに依存する部分（モジュールのアドレスとルートのパス）を取り除く
+
+    Args:
+        prompt: インスタンスのリソースのみを含むプロンプト
+        instance: モジュールのインスタンス
+
+    Returns:
+        インスタンスのリソースをモジュール内の相対的なアドレスで表したプロンプト
+    """
+    prompt = prompt.replace(f"{instance}.", "")
+    root = MODULE_INSTANCE_PATTERN.match(f"{instance}.")
+    if root and root.group(1):
+        prompt = prompt.replace(root.group(1), "")
+    return prompt
+
+
+def _findings_for(
+    terraform_data: Dict[str, Any], findings: Optional[List[Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """
+    問題点のうち解析結果に含まれるリソースのものを取得
+
+    Args:
+        terraform_data: 解析結果
+        findings: 問題点のリスト（resourceキーにリソースのアドレスを含む）
+
+    Returns:
+        解析結果に含まれるリソースの問題点のリスト
+    """
+    if not findings:
+        return []
+    addresses = {
+        resource_address(resource_type, block)
+        for resource_type, block in iter_resources(terraform_data)
+    }
+    return [finding for finding in findings if finding.get("resource") in addresses]
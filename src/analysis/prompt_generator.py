@@ -2,10 +2,57 @@
 Bedrockへ送信するプロンプトを生成するモジュール
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import json
 
+from src.analysis.attribute_pruner import AttributePruner
+from src.analysis.resource_collapser import (
+    CollapsedGroup,
+    ResourceCollapser,
+    compact_addresses,
+)
+from src.analysis.resource_graph import ResourceGraph
+from src.analysis.token_estimator import estimate_tokens
 from src.config import get_settings
+from src.terraform.resource_utils import (
+    iter_resources,
+    relative_address,
+    resource_address,
+)
+
+# モジュール横断のプロンプトに含めるモジュールごとの問題点の最大件数
+MAX_SUMMARY_FINDINGS = 3
+
+# 差分の分析のプロンプトに含める前回の問題点の最大件数
+MAX_PREVIOUS_FINDINGS = 50
+
+# 補完用プロンプトで要求するキーの形式
+REPAIR_FIELD_SCHEMAS = {
+    "ja": {
+        "overview": '"インフラストラクチャの可用性に関する全体的な評価"',
+        "availability_score": "数値（0-100）",
+        "findings": (
+            '[{"category": "カテゴリ名", "severity": "高/中/低", '
+            '"description": "詳細な説明", "recommendation": "改善のための具体的な提案", '
+            '"resources": ["対象リソースのアドレス"]}]'
+        ),
+        "recommendations": '[{"priority": "高/中/低", "description": "推奨事項の詳細説明"}]',
+    },
+    "en": {
+        "overview": '"Overall assessment of the infrastructure\'s availability"',
+        "availability_score": "numeric value (0-100)",
+        "findings": (
+            '[{"category": "Category name", "severity": "high/medium/low", '
+            '"description": "Detailed description", '
+            '"recommendation": "Specific recommendations for improvement", '
+            '"resources": ["Addresses of the affected resources"]}]'
+        ),
+        "recommendations": (
+            '[{"priority": "high/medium/low", '
+            '"description": "Detailed description of the recommendation"}]'
+        ),
+    },
+}
 
 
 class PromptGenerator:
@@ -22,19 +69,48 @@ class PromptGenerator:
         """
         settings = get_settings()
         self.language = language or settings["app"]["language"]
+        prompt_settings = settings["prompt"]
+        self.compact_json = prompt_settings["compact_json"]
+        self.pruner: Optional[AttributePruner] = (
+            AttributePruner(prompt_settings) if prompt_settings["prune_attributes"] else None
+        )
+        self.graph_settings = prompt_settings["graph"]
+        self.collapser: Optional[ResourceCollapser] = (
+            ResourceCollapser(prompt_settings["collapse"])
+            if prompt_settings["collapse"]["enabled"]
+            else None
+        )
 
-    def create_availability_prompt(self, terraform_data: Dict[str, Any]) -> str:
+    def create_availability_prompt(
+        self,
+        terraform_data: Dict[str, Any],
+        known_findings: Optional[List[Dict[str, Any]]] = None,
+        graph: Optional[ResourceGraph] = None,
+        original_data: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[str, Dict[str, int]]:
         """
         可用性分析のためのプロンプトを作成
 
         Args:
-            terraform_data: 分析対象のTerraformデータ
+            terraform_data: 分析対象のTerraformデータ（絞り込み済みのブロックはそのまま使用する）
+            known_findings: ルールで検出済みの問題点（重複して報告しないよう指示する）
+            graph: 解析結果全体の依存関係グラフ（指定した場合は分析対象のリソースに関する
+                要約をプロンプトに含め、リソースの属性から参照を取り除く）
+            original_data: 絞り込み前のTerraformデータ（terraform_dataを呼び出し元で
+                絞り込んだ場合に指定する。トークン削減量の計算に使用）
 
         Returns:
-            生成されたプロンプト
+            生成されたプロンプトと、トークン削減量（original_tokens、prompt_tokens、
+            saved_tokens、collapsed_resources。Terraformデータが空の場合は空の辞書）
         """
         # Terraformデータをプロンプト用に整形
-        terraform_json = self._format_terraform_data(terraform_data)
+        data, collapsed = self._prepare_terraform_data(terraform_data, graph)
+        terraform_json, token_stats = self._format_terraform_data(
+            terraform_data if original_data is None else original_data, data, len(collapsed)
+        )
+        graph_section = self._format_graph_summary(graph, data, collapsed) if graph else ""
+        if collapsed:
+            graph_section = self._format_collapse_note() + graph_section
 
         # プロンプトテンプレート
         if self.language == "ja":
@@ -47,7 +123,7 @@ AWSのTerraformコードの可用性を評価してください。AWS Well-Archi
 ```json
 {terraform_json}
 ```
-
+{graph_section}
 評価項目:
 1. マルチAZ構成: リソースが複数のアベイラビリティーゾーンにデプロイされているか
 2. 単一障害点(SPOF): システム内に単一障害点が存在するか
@@ -80,7 +156,8 @@ AWSのTerraformコードの可用性を評価してください。AWS Well-Archi
       "category": "カテゴリ名（例: マルチAZ構成、SPOF、バックアップなど）",
       "severity": "高/中/低",
       "description": "詳細な説明",
-      "recommendation": "改善のための具体的な提案"
+      "recommendation": "改善のための具体的な提案",
+      "resources": ["対象リソースのアドレス（例: aws_db_instance.main。特定のリソースに限らない場合は空）"]
     }}
   ],
   "recommendations": [
@@ -106,7 +183,7 @@ Analyze the following Terraform resources in JSON format:
 ```json
 {terraform_json}
 ```
-
+{graph_section}
 Evaluation criteria:
 1. Multi-AZ Configuration: Are resources deployed across multiple Availability Zones?
 2. Single Points of Failure (SPOF): Are there any single points of failure in the system?
@@ -139,7 +216,8 @@ Please provide your analysis in the following JSON format:
       "category": "Category name (e.g., Multi-AZ, SPOF, Backup, etc.)",
       "severity": "high/medium/low",
       "description": "Detailed description",
-      "recommendation": "Specific recommendations for improvement"
+      "recommendation": "Specific recommendations for improvement",
+      "resources": ["Affected resource addresses, e.g., aws_db_instance.main (empty if none)"]
     }}
   ],
   "recommendations": [
@@ -155,19 +233,508 @@ Focus on important issues from a high availability perspective and prioritize im
 with the most significant impact.
 """
 
-        return system_prompt
+        if known_findings:
+            system_prompt += self._format_known_findings(known_findings)
+
+        return system_prompt, token_stats
+
+    def _format_collapse_note(self) -> str:
+        """
+        代表にまとめたリソースの説明をプロンプトに追加する形式に整形
+
+        Returns:
+            Terraformデータの後に追加するテキスト
+        """
+        if self.language == "ja":
+            return (
+                "\n`__count` を含むブロックは、名前やタグ以外の構成が同一の `__count` 件の"
+                "リソースを代表します（`__addresses` はすべてのリソースのアドレス）。"
+                "これらのリソースに当てはまる問題点は1件として報告し、descriptionに"
+                "代表のアドレスを含めてください。\n"
+            )
+        return (
+            "\nA block with `__count` represents `__count` resources whose configuration is "
+            "identical apart from names and tags (`__addresses` lists all of them). Report an "
+            "issue that applies to them once and include the representative's address in the "
+            "description.\n"
+        )
 
-    def _format_terraform_data(self, terraform_data: Dict[str, Any]) -> str:
+    def _format_graph_summary(
+        self,
+        graph: ResourceGraph,
+        terraform_data: Dict[str, Any],
+        collapsed: Optional[List[str]] = None,
+    ) -> str:
         """
-        Terraformデータを読みやすい形式に整形
+        依存関係グラフの要約をプロンプトに追加する形式に整形
+
+        Args:
+            graph: 解析結果全体の依存関係グラフ
+            terraform_data: 分析対象のTerraformデータ（要約に含めるリソースの特定に使用）
+            collapsed: 代表にまとめて省略したリソースのアドレス（まとめたリソースの参照も
+                要約に含める）
+
+        Returns:
+            Terraformデータの後に追加するテキスト
+        """
+        addresses = [
+            resource_address(resource_type, block)
+            for resource_type, block in iter_resources(terraform_data)
+        ]
+        addresses.extend(collapsed or [])
+        summary = graph.summary(addresses, self.graph_settings["max_items"])
+        reference_lines = [
+            f"{source} -> {', '.join(relative_address(source, target) for target in targets)}"
+            for source, targets in self._listed_references(graph, addresses)
+        ]
+        omitted = len(summary["references"]) - len(reference_lines)
+        spof_lines = [
+            f"- {item['resource']}: {item['separated']}" for item in summary["articulation_points"]
+        ]
+        bridge_lines = [
+            f"- {item['resources'][0]} -- {item['resources'][1]}: {item['separated']}"
+            for item in summary["bridges"]
+        ]
+
+        if self.language == "ja":
+            lines = [
+                "",
+                "リソース間の参照関係（ローカルで作成した依存関係グラフ。「参照元 -> 参照先」の形式で、"
+                "参照元と同じモジュールの参照先はモジュール部分を省略。"
+                "ここに含めた参照は上記のリソースの属性から省略しています）:",
+                *reference_lines,
+            ]
+            if omitted > 0:
+                lines.append(f"（ほか{omitted}件の参照元を省略）")
+            lines.append(
+                "単一障害点の候補（取り除くと依存関係グラフが分断されるリソース。"
+                "数値は切り離されるリソース数）:"
+            )
+            lines.extend(spof_lines or ["- なし"])
+            lines.append("唯一の接続となっている参照（数値は切り離されるリソース数）:")
+            lines.extend(bridge_lines or ["- なし"])
+            lines.append(
+                "単一障害点の評価では、この依存関係グラフの解析結果をもとに、"
+                "実際に障害の影響が及ぶものを判断してください。"
+            )
+        else:
+            lines = [
+                "",
+                "References between resources (dependency graph built locally, in "
+                '"source -> targets" form; targets in the same module as the source omit the '
+                "module prefix, and the references listed here are omitted from the attributes "
+                "above):",
+                *reference_lines,
+            ]
+            if omitted > 0:
+                lines.append(f"({omitted} more sources omitted)")
+            lines.append(
+                "Single point of failure candidates (resources whose removal disconnects the "
+                "dependency graph; the number is how many resources are cut off):"
+            )
+            lines.extend(spof_lines or ["- none"])
+            lines.append("References that are the only connection (number of resources cut off):")
+            lines.extend(bridge_lines or ["- none"])
+            lines.append(
+                "When evaluating single points of failure, use this dependency graph analysis "
+                "to decide which candidates actually affect availability."
+            )
+        return "\n".join(lines) + "\n"
+
+    def create_cross_module_prompt(
+        self,
+        terraform_data: Dict[str, Any],
+        module_summaries: List[Dict[str, Any]],
+        dependencies: List[str],
+        known_findings: Optional[List[Dict[str, Any]]] = None,
+        graph: Optional[ResourceGraph] = None,
+    ) -> str:
+        """
+        モジュールごとの分析結果を前提に、ルートモジュールのリソースとモジュール間の関係を
+        分析するためのプロンプトを作成
+
+        Args:
+            terraform_data: ルートモジュールのブロック（モジュールの呼び出しを含む）
+            module_summaries: モジュールごとの分析結果の概要（label、resource_count、resultを含む）
+            dependencies: モジュール間の参照（「参照元 -> 参照先」の形式の行）
+            known_findings: ルールで検出済みの問題点
+            graph: 解析結果全体の依存関係グラフ
+
+        Returns:
+            生成されたプロンプト
+        """
+        prompt, _ = self.create_availability_prompt(terraform_data, known_findings, graph)
+        module_lines: List[str] = []
+        for summary in module_summaries:
+            result = summary["result"]
+            module_lines.append(
+                f"- {summary['label']} ({summary['resource_count']}, "
+                f"{result.get('availability_score', '-')}): {result.get('overview', '')}"
+            )
+            for finding in result.get("findings", [])[:MAX_SUMMARY_FINDINGS]:
+                if isinstance(finding, dict):
+                    module_lines.append(
+                        f"  - [{finding.get('severity', '')}] {finding.get('description', '')}"
+                    )
+
+        if self.language == "ja":
+            lines = [
+                "",
+                "以下のモジュールは個別に分析済みです（括弧内はリソース数と可用性スコア）:",
+                *module_lines,
+                "モジュール間の参照:",
+                *(f"- {line}" for line in dependencies or ["なし"]),
+                "モジュール内の問題点は報告済みのため、findingsには上記のルートモジュールのリソースと、"
+                "モジュール間の構成（モジュールをまたぐ単一障害点や冗長性の偏りなど）に関する"
+                "問題点のみを含めてください。availability_scoreとoverviewは、モジュールの分析結果を"
+                "含めたシステム全体の評価としてください。",
+            ]
+        else:
+            lines = [
+                "",
+                "The following modules have already been analyzed individually "
+                "(resource count and availability score in parentheses):",
+                *module_lines,
+                "References between modules:",
+                *(f"- {line}" for line in dependencies or ["none"]),
+                "Issues within the modules have already been reported. Include in findings only "
+                "issues with the root module resources above and with how the modules are "
+                "combined (such as single points of failure or uneven redundancy across modules). "
+                "Base availability_score and overview on the whole system, including the module "
+                "results.",
+            ]
+        return prompt + "\n".join(lines) + "\n"
+
+    def create_incremental_prompt(
+        self,
+        terraform_data: Dict[str, Any],
+        previous: Dict[str, Any],
+        diff: Dict[str, List[str]],
+        known_findings: Optional[List[Dict[str, Any]]] = None,
+        graph: Optional[ResourceGraph] = None,
+        unattributed_findings: Optional[List[Dict[str, Any]]] = None,
+        unattributed_recommendations: Optional[List[Dict[str, Any]]] = None,
+        related: Optional[List[str]] = None,
+    ) -> Tuple[str, Dict[str, int]]:
+        """
+        前回の分析結果を前提に、追加・変更されたリソースのみを分析するためのプロンプトを作成
+
+        Args:
+            terraform_data: 追加・変更されたリソース（と削除されたリソースと参照関係にあった
+                リソース）のブロック
+            previous: 前回の分析結果（overview、availability_score、引き続き有効なfindingsを含む）
+            diff: 前回とのリソースの差分（added、changed、removed、unchangedを含む）
+            known_findings: 追加・変更されたリソースについてルールで検出済みの問題点
+            graph: 解析結果全体の依存関係グラフ
+            unattributed_findings: 対象リソースを特定できないため、再確認が必要な前回の問題点
+            unattributed_recommendations: 対象リソースを特定できないため、再確認が必要な
+                前回の推奨事項
+            related: 削除されたリソースと参照関係にあったため分析対象に含めたリソースのアドレス
+
+        Returns:
+            生成されたプロンプトと、追加・変更されたリソースのトークン削減量
+        """
+        prompt, token_stats = self.create_availability_prompt(
+            terraform_data, known_findings, graph
+        )
+        findings = [
+            finding for finding in previous.get("findings", []) if isinstance(finding, dict)
+        ]
+        finding_lines = _previous_finding_lines(findings)
+        omitted = len(findings) - len(finding_lines)
+        unattributed_lines = _previous_finding_lines(unattributed_findings or [])
+        recommendation_lines = _previous_finding_lines(unattributed_recommendations or [])
+        removed = compact_addresses(diff["removed"])
+        related_addresses = compact_addresses(related or [])
+
+        if self.language == "ja":
+            lines = [
+                "",
+                f"上記は前回の分析から追加・変更されたリソースのみです（変更のないリソース "
+                f"{len(diff['unchanged'])}件は前回分析済み）。",
+                f"前回の評価（可用性スコア {previous.get('availability_score', '-')}）: "
+                f"{previous.get('overview', '')}",
+                "前回の問題点のうち引き続き有効なもの:",
+                *(finding_lines or ["- なし"]),
+                *([f"- 他 {omitted}件"] if omitted else []),
+                f"削除されたリソース: {', '.join(removed) if removed else 'なし'}",
+                *(
+                    [
+                        "上記のうち次のリソースは変更されていませんが、削除されたリソースと参照関係に"
+                        f"あったため含めています: {', '.join(related_addresses)}"
+                    ]
+                    if related_addresses
+                    else []
+                ),
+                "前回の問題点は報告済みのため、findingsには追加・変更されたリソースと、"
+                "その変更やリソースの削除によって生じた問題点（冗長性の低下など）のみを"
+                "含めてください。availability_scoreとoverviewは、"
+                "前回の評価と変更内容を踏まえたシステム全体の評価としてください。",
+            ]
+            if unattributed_lines:
+                lines += [
+                    "次の前回の問題点は対象リソースを特定できないため、変更の影響を受けている"
+                    "可能性があります。変更後も当てはまるものは、findingsに改めて含めてください:",
+                    *unattributed_lines,
+                ]
+            if recommendation_lines:
+                lines += [
+                    "次の前回の推奨事項は対象リソースを特定できないため、変更後も当てはまるものは"
+                    "recommendationsに改めて含めてください:",
+                    *recommendation_lines,
+                ]
+        else:
+            lines = [
+                "",
+                f"The resources above are only those added or changed since the previous analysis "
+                f"({len(diff['unchanged'])} unchanged resources were analyzed previously).",
+                f"Previous assessment (availability score "
+                f"{previous.get('availability_score', '-')}): {previous.get('overview', '')}",
+                "Previous issues that are still valid:",
+                *(finding_lines or ["- none"]),
+                *([f"- {omitted} more"] if omitted else []),
+                f"Removed resources: {', '.join(removed) if removed else 'none'}",
+                *(
+                    [
+                        "The following resources above are unchanged but are included because "
+                        f"they were related to removed resources: {', '.join(related_addresses)}"
+                    ]
+                    if related_addresses
+                    else []
+                ),
+                "The previous issues have already been reported. Include in findings only issues "
+                "with the added or changed resources and issues caused by the changes or the "
+                "removals (such as reduced redundancy). Base "
+                "availability_score and overview on the whole system, taking the previous "
+                "assessment and the changes into account.",
+            ]
+            if unattributed_lines:
+                lines += [
+                    "The following previous issues could not be attributed to specific resources "
+                    "and may be affected by the changes. Include in findings again those that "
+                    "still apply:",
+                    *unattributed_lines,
+                ]
+            if recommendation_lines:
+                lines += [
+                    "The following previous recommendations could not be attributed to specific "
+                    "resources. Include in recommendations again those that still apply:",
+                    *recommendation_lines,
+                ]
+        return prompt + "\n".join(lines) + "\n", token_stats
+
+    def _format_known_findings(self, known_findings: List[Dict[str, Any]]) -> str:
+        """
+        ルールで検出済みの問題点をプロンプトに追加する形式に整形
+
+        Args:
+            known_findings: ルールで検出済みの問題点
+
+        Returns:
+            プロンプトの末尾に追加するテキスト
+        """
+        # 同じルールの問題点はアドレスをまとめて1行にする
+        resources_by_rule: Dict[str, List[str]] = {}
+        for finding in known_findings:
+            resources_by_rule.setdefault(str(finding.get("rule_id")), []).append(
+                str(finding.get("resource"))
+            )
+        lines = "\n".join(
+            f"- {rule_id}: {', '.join(compact_addresses(resources))}"
+            for rule_id, resources in resources_by_rule.items()
+        )
+        if self.language == "ja":
+            return (
+                "\n以下の問題点はルールによる評価で検出済みです。"
+                "findingsには含めず、それ以外の問題点を報告してください:\n"
+                f"{lines}\n"
+            )
+        return (
+            "\nThe following issues have already been detected by rule-based checks. "
+            "Do not include them in findings; report other issues only:\n"
+            f"{lines}\n"
+        )
+
+    def create_repair_prompt(self, partial_result: Dict[str, Any], fields: List[str]) -> str:
+        """
+        分析結果に不足している・形式が正しくないキーのみを要求する補完用のプロンプトを作成
+
+        Terraformデータは含めず、既に得られた分析結果を文脈として渡す。
+
+        Args:
+            partial_result: 既に得られた分析結果（正しい形式のキーのみ）
+            fields: 要求するキーのリスト
+
+        Returns:
+            生成されたプロンプト
+        """
+        schemas = REPAIR_FIELD_SCHEMAS["ja" if self.language == "ja" else "en"]
+        context = json.dumps(partial_result, ensure_ascii=False, indent=2, default=str)
+        schema = "{\n" + ",\n".join(f'  "{field}": {schemas[field]}' for field in fields) + "\n}"
+
+        if self.language == "ja":
+            return f"""
+AWSのTerraformコードの可用性分析の結果のうち、一部の項目が欠けているか形式が正しくありません。
+以下は既に得られている分析結果です:
+
+```json
+{context}
+```
+
+この分析結果と矛盾しないように、次の項目のみを以下のJSON形式で出力してください。
+他の項目や説明文は出力しないでください。
+
+```json
+{schema}
+```
+"""
+
+        return f"""
+Some fields of an availability analysis of AWS Terraform code are missing or malformed.
+Here is the analysis result obtained so far:
+
+```json
+{context}
+```
+
+Consistently with this result, output only the following fields in this JSON format.
+Do not output any other fields or explanations.
+
+```json
+{schema}
+```
+"""
+
+    def _prepare_terraform_data(
+        self, terraform_data: Dict[str, Any], graph: Optional[ResourceGraph] = None
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Terraformデータの属性を絞り込み、同じ構成のリソースを代表にまとめる
+
+        Args:
+            terraform_data: Terraformデータ
+            graph: 依存関係グラフ（指定した場合は他のブロックへの参照を属性から取り除き、
+                代表にまとめるかどうかはグラフの参照先で比較する）
+
+        Returns:
+            プロンプトに含めるデータと、代表にまとめて省略したリソースのアドレスのリスト
+        """
+        data = self._prune_terraform_data(terraform_data, graph)
+        if self.collapser is None:
+            return data, []
+        return self.collapser.collapse(data, graph)
+
+    def _prune_terraform_data(
+        self, terraform_data: Dict[str, Any], graph: Optional[ResourceGraph] = None
+    ) -> Dict[str, Any]:
+        """
+        Terraformデータの属性を絞り込み、依存関係グラフの要約に含める参照を属性から取り除く
+
+        要約から省略した参照元の参照や、リソース以外（データソース・モジュールなど）への参照は
+        グラフの要約に現れないため、アドレスとして属性に残す。
+
+        Args:
+            terraform_data: Terraformデータ
+            graph: 依存関係グラフ
+
+        Returns:
+            属性を絞り込んだデータ
+        """
+        if self.pruner is None:
+            return terraform_data
+        data = self.pruner.prune(terraform_data)
+        if graph is None:
+            return data
+        addresses = [
+            resource_address(resource_type, block) for resource_type, block in iter_resources(data)
+        ]
+        return self.pruner.strip_references(data, dict(self._listed_references(graph, addresses)))
+
+    def _listed_references(
+        self, graph: ResourceGraph, addresses: List[str]
+    ) -> List[Tuple[str, List[str]]]:
+        """
+        依存関係グラフの要約に含める参照を取得
+
+        Args:
+            graph: 依存関係グラフ
+            addresses: 分析対象のリソース（代表にまとめるリソースを含む）のアドレス
+
+        Returns:
+            参照元と参照先のリストの組のリスト（最大max_references件）
+        """
+        references = graph.summary(addresses, 0)["references"]
+        return list(references.items())[: self.graph_settings["max_references"]]
+
+    def collapsed_groups(
+        self, terraform_data: Dict[str, Any], graph: Optional[ResourceGraph] = None
+    ) -> List[CollapsedGroup]:
+        """
+        プロンプトで代表にまとめられるリソースのグループを取得（問題点の展開に使用）
 
         Args:
             terraform_data: Terraformデータ
+            graph: プロンプトの作成に使用した依存関係グラフ
+
+        Returns:
+            グループのリスト（まとめない設定の場合は空のリスト）
+        """
+        if self.collapser is None:
+            return []
+        return self.collapser.groups(self._prune_terraform_data(terraform_data, graph), graph)
+
+    def _format_terraform_data(
+        self, terraform_data: Dict[str, Any], data: Dict[str, Any], collapsed_count: int = 0
+    ) -> Tuple[str, Dict[str, int]]:
+        """
+        Terraformデータをプロンプト用の形式に整形
+
+        Args:
+            terraform_data: 絞り込み前のTerraformデータ（トークン削減量の計算に使用）
+            data: プロンプトに含めるデータ（_prepare_terraform_dataの結果）
+            collapsed_count: 代表にまとめて省略したリソース数
 
         Returns:
-            整形されたJSONテキスト
+            整形されたJSONテキストと、絞り込み前と比較したトークン削減量
         """
-        # JSONの整形（読みやすさのため）
-        if terraform_data:
-            return json.dumps(terraform_data, indent=2, ensure_ascii=False)
-        return "{}"
+        if not terraform_data:
+            return "{}", {}
+
+        # JSONの整形（compact_jsonが無効な場合は読みやすさのためインデントを付ける）
+        if self.compact_json:
+            formatted = json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
+        else:
+            formatted = json.dumps(data, indent=2, ensure_ascii=False, default=str)
+
+        # 絞り込み前（従来の形式）と比較したトークン削減量を求める
+        original_tokens = estimate_tokens(
+            json.dumps(terraform_data, indent=2, ensure_ascii=False, default=str)
+        )
+        formatted_tokens = estimate_tokens(formatted)
+        token_stats = {
+            "original_tokens": original_tokens,
+            "prompt_tokens": formatted_tokens,
+            "saved_tokens": original_tokens - formatted_tokens,
+            "collapsed_resources": collapsed_count,
+        }
+
+        return formatted, token_stats
+
+
+def _previous_finding_lines(findings: List[Dict[str, Any]]) -> List[str]:
+    """
+    差分の分析のプロンプトに含める前回の問題点・推奨事項の行を作成
+
+    Args:
+        findings: 前回の問題点または推奨事項のリスト
+
+    Returns:
+        問題点・推奨事項ごとの行（最大MAX_PREVIOUS_FINDINGS件）
+    """
+    lines = []
+    for finding in findings[:MAX_PREVIOUS_FINDINGS]:
+        resources = compact_addresses(list(finding.get("resources") or []))
+        target = f" ({', '.join(resources)})" if resources else ""
+        level = finding.get("severity", finding.get("priority", ""))
+        lines.append(f"- [{level}] {finding.get('description', '')}{target}")
+    return lines
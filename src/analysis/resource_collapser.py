@@ -0,0 +1,358 @@
+"""
+名前やタグのみが異なる同じ構成のリソースを1つの代表にまとめるモジュール
+"""
+
+import hashlib
+import json
+import re
+from typing import Any, Dict, List, Optional, Pattern, Set, Tuple
+
+from src.analysis.resource_graph import ResourceGraph
+from src.config import get_settings
+from src.terraform.resource_utils import (
+    NON_RESOURCE_BLOCK_TYPES,
+    relative_address,
+    resource_address,
+)
+
+# 代表のブロックにまとめたリソース数とアドレスを保持するキー
+COLLAPSED_COUNT_KEY = "__count"
+COLLAPSED_ADDRESSES_KEY = "__addresses"
+
+# 末尾にインデックスを持つアドレス（例: aws_lambda_function.worker[12]）
+INDEXED_ADDRESS_PATTERN = re.compile(r"^(.*)\[(\d+)\]$")
+
+
+class CollapsedGroup:
+    """
+    同じ構成のリソースのグループ
+    """
+
+    def __init__(self, resource_type: str, addresses: List[str]) -> None:
+        """
+        CollapsedGroupの初期化
+
+        Args:
+            resource_type: リソースタイプ
+            addresses: グループに含まれるリソースのアドレス（先頭が代表）
+        """
+        self.resource_type = resource_type
+        self.addresses = addresses
+        self._pattern: Optional[Pattern[str]] = None
+
+    @property
+    def representative(self) -> str:
+        """代表のリソースのアドレス"""
+        return self.addresses[0]
+
+    @property
+    def compact_addresses(self) -> List[str]:
+        """インデックスの連続する範囲をまとめたアドレスのリスト（例: fn[0..299]）"""
+        return compact_addresses(self.addresses)
+
+    def mentioned_in(self, text: str) -> bool:
+        """
+        テキストにグループのリソースのアドレスが含まれるかどうかを判定
+
+        Args:
+            text: 判定するテキスト
+
+        Returns:
+            含まれる場合はTrue
+        """
+        if self._pattern is None:
+            candidates = sorted(
+                set(self.addresses) | set(self.compact_addresses), key=len, reverse=True
+            )
+            self._pattern = re.compile(
+                r"(?<![\w.\-\[])(?:"
+                + "|".join(re.escape(candidate) for candidate in candidates)
+                + r")(?![\w\-\[])"
+            )
+        return self._pattern.search(text) is not None
+
+
+class ResourceCollapser:
+    """
+    属性を絞り込んだ解析結果から、名前など無視する属性以外が同一のリソースをまとめるクラス
+
+    リソースタイプごとに、無視する属性とアドレスを除いた属性値と参照先（参照元のモジュールからの
+    相対アドレス）のハッシュ（構成のハッシュ）でグループ化し、min_count件以上のグループは
+    先頭のリソースを代表としてリソース数とアドレスの一覧を付与した1つのブロックにする。
+    参照先を含めるため、異なるサブネットやNATゲートウェイを参照するリソースはまとめない。
+    """
+
+    def __init__(self, collapse_settings: Optional[Dict[str, Any]] = None) -> None:
+        """
+        ResourceCollapserの初期化
+
+        Args:
+            collapse_settings: prompt.collapseの設定（Noneの場合は設定から取得）
+        """
+        if collapse_settings is None:
+            collapse_settings = get_settings()["prompt"]["collapse"]
+        self.min_count = max(int(collapse_settings["min_count"]), 2)
+        self.ignore_attributes: Set[str] = set(collapse_settings.get("ignore_attributes") or [])
+
+    def collapse(
+        self, terraform_data: Dict[str, Any], graph: Optional[ResourceGraph] = None
+    ) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        同じ構成のリソースを代表のブロックにまとめる
+
+        Args:
+            terraform_data: 属性を絞り込んだ解析結果
+            graph: 依存関係グラフ（参照を属性から取り除いた場合に参照先の比較に使用）
+
+        Returns:
+            まとめた後の解析結果（元のデータは変更しない）と、代表にまとめて
+            省略したリソースのアドレスのリスト
+        """
+        collapsed: Dict[str, Any] = {}
+        omitted: List[str] = []
+        for block_type, blocks in terraform_data.items():
+            if block_type in NON_RESOURCE_BLOCK_TYPES or not isinstance(blocks, list):
+                collapsed[block_type] = blocks
+                continue
+            groups = self._group_blocks(block_type, blocks, graph)
+            result: List[Any] = []
+            for members in groups:
+                if len(members) < self.min_count:
+                    result.extend(members)
+                    continue
+                addresses = [resource_address(block_type, block) for block in members]
+                representative = dict(members[0])
+                representative[COLLAPSED_COUNT_KEY] = len(members)
+                representative[COLLAPSED_ADDRESSES_KEY] = compact_addresses(addresses)
+                result.append(representative)
+                omitted.extend(addresses[1:])
+            collapsed[block_type] = result
+        return collapsed, omitted
+
+    def groups(
+        self, terraform_data: Dict[str, Any], graph: Optional[ResourceGraph] = None
+    ) -> List[CollapsedGroup]:
+        """
+        代表にまとめられるリソースのグループを取得
+
+        Args:
+            terraform_data: 属性を絞り込んだ解析結果
+            graph: 依存関係グラフ（参照を属性から取り除いた場合に参照先の比較に使用）
+
+        Returns:
+            min_count件以上のリソースを含むグループのリスト
+        """
+        result: List[CollapsedGroup] = []
+        for block_type, blocks in terraform_data.items():
+            if block_type in NON_RESOURCE_BLOCK_TYPES or not isinstance(blocks, list):
+                continue
+            for members in self._group_blocks(block_type, blocks, graph):
+                if len(members) >= self.min_count:
+                    result.append(
+                        CollapsedGroup(
+                            block_type, [resource_address(block_type, block) for block in members]
+                        )
+                    )
+        return result
+
+    def _group_blocks(
+        self, block_type: str, blocks: List[Any], graph: Optional[ResourceGraph] = None
+    ) -> List[List[Any]]:
+        """
+        ブロックを構成のハッシュでグループ化する（最初に現れた順）
+
+        Args:
+            block_type: リソースタイプ
+            blocks: ブロックのリスト
+            graph: 依存関係グラフ（参照先の比較に使用）
+
+        Returns:
+            グループごとのブロックのリスト（辞書でないブロックは1件ずつのグループ）
+        """
+        groups: Dict[str, List[Any]] = {}
+        order: List[List[Any]] = []
+        for block in blocks:
+            # 辞書でないブロックとまとめ済みの代表はそのまま残す
+            if not isinstance(block, dict) or COLLAPSED_COUNT_KEY in block:
+                order.append([block])
+                continue
+            key = self._shape_key(block, resource_address(block_type, block), graph)
+            if key not in groups:
+                groups[key] = []
+                order.append(groups[key])
+            groups[key].append(block)
+        return order
+
+    def _shape_key(
+        self, block: Dict[str, Any], address: str, graph: Optional[ResourceGraph] = None
+    ) -> str:
+        """
+        ブロックの構成のハッシュを計算
+
+        Args:
+            block: 属性を絞り込んだブロック
+            address: ブロックのアドレス
+            graph: 依存関係グラフ
+
+        Returns:
+            無視する属性とアドレスを除いた属性値と参照先のハッシュ
+        """
+        shape: Dict[str, Any] = {
+            key: value
+            for key, value in block.items()
+            if not key.startswith("__") and key not in self.ignore_attributes
+        }
+        if graph is not None:
+            # 参照を属性から取り除いた場合も、参照先の異なるリソースはまとめない
+            shape["__references"] = sorted(
+                relative_address(address, target)
+                for target in graph.references.get(address, [])
+            )
+        payload = json.dumps(shape, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def expand_findings(findings: List[Any], groups: List[CollapsedGroup]) -> int:
+    """
+    代表のリソースに関する問題点に、同じ構成のすべてのリソースのアドレスを付与する
+
+    問題点のresource・resources・description・recommendationにグループのいずれかのアドレス
+    （まとめた形式を含む）が含まれる場合に、resourcesキーにグループ全体のアドレスを追加する。
+    モジュール単位の分析でモジュールのアドレスを省略した問題点は、moduleキーの
+    モジュールを補って判定する。
+
+    Args:
+        findings: 問題点のリスト（変更される）
+        groups: 代表にまとめたリソースのグループ
+
+    Returns:
+        アドレスを付与した問題点の数
+    """
+    if not groups:
+        return 0
+
+    expanded = 0
+    for finding in findings:
+        if not isinstance(finding, dict):
+            continue
+        value = finding.get("resources")
+        resources = [str(address) for address in value] if isinstance(value, list) else []
+        text = " ".join(
+            [str(finding.get(key) or "") for key in ("resource", "description", "recommendation")]
+            + resources
+        )
+        modules = [
+            module.strip() for module in str(finding.get("module") or "").split(",") if module
+        ]
+        seen = set(resources)
+        for group in groups:
+            if not (
+                group.mentioned_in(text)
+                or any(_mentioned_in_module(group, module, text) for module in modules)
+            ):
+                continue
+            for address in group.addresses:
+                if address not in seen:
+                    seen.add(address)
+                    resources.append(address)
+        if resources and resources != finding.get("resources"):
+            finding["resources"] = resources
+            expanded += 1
+    return expanded
+
+
+def format_resources(resources: Any, max_items: int = 10) -> str:
+    """
+    問題点の対象のリソースを表示用の文字列にする
+
+    インデックスの連続するアドレスは範囲の形式にまとめ、max_items件を超える分は件数のみ示す。
+
+    Args:
+        resources: 問題点のresourcesキーの値（アドレスのリスト）
+        max_items: 表示するアドレスの最大件数
+
+    Returns:
+        カンマ区切りのアドレス（対象のリソースがない場合は空文字列）
+    """
+    if not isinstance(resources, list) or not resources:
+        return ""
+    compacted = compact_addresses([str(address) for address in resources])
+    text = ", ".join(compacted[:max_items])
+    if len(compacted) > max_items:
+        text += f" ほか{len(compacted) - max_items}件"
+    return text
+
+
+def compact_addresses(addresses: List[str]) -> List[str]:
+    """
+    インデックスの連続するアドレスを範囲の形式にまとめる
+
+    Args:
+        addresses: アドレスのリスト
+
+    Returns:
+        まとめたアドレスのリスト（例: ["aws_lambda_function.fn[0..299]", "aws_lambda_function.x"]）
+    """
+    indexes: Dict[str, List[int]] = {}
+    order: List[Tuple[str, bool]] = []
+    for address in addresses:
+        match = INDEXED_ADDRESS_PATTERN.match(address)
+        if not match:
+            order.append((address, False))
+            continue
+        base = match.group(1)
+        if base not in indexes:
+            indexes[base] = []
+            order.append((base, True))
+        indexes[base].append(int(match.group(2)))
+
+    compacted: List[str] = []
+    for item, indexed in order:
+        if not indexed:
+            compacted.append(item)
+            continue
+        ranges: List[str] = []
+        values = sorted(set(indexes[item]))
+        start = previous = values[0]
+        for value in values[1:]:
+            if value == previous + 1:
+                previous = value
+                continue
+            ranges.append(_format_range(start, previous))
+            start = previous = value
+        ranges.append(_format_range(start, previous))
+        compacted.append(f"{item}[{','.join(ranges)}]")
+    return compacted
+
+
+def _format_range(start: int, end: int) -> str:
+    """
+    インデックスの範囲を文字列にする
+
+    Args:
+        start: 範囲の最初のインデックス
+        end: 範囲の最後のインデックス
+
+    Returns:
+        範囲の文字列（例: 0..299）
+    """
+    return str(start) if start == end else f"{start}..{end}"
+
+
+def _mentioned_in_module(group: CollapsedGroup, module: str, text: str) -> bool:
+    """
+    モジュールのアドレスを省略した形式でグループのアドレスがテキストに含まれるかを判定
+
+    Args:
+        group: グループ
+        module: モジュールのインスタンス（例: module.workers）
+        text: 判定するテキスト
+
+    Returns:
+        含まれる場合はTrue
+    """
+    prefix = f"{module}."
+    relative = [address[len(prefix):] for address in group.addresses if address.startswith(prefix)]
+    if not relative:
+        return False
+    return CollapsedGroup(group.resource_type, relative).mentioned_in(text)
@@ -0,0 +1,262 @@
+"""
+リソース間の参照関係のグラフから単一障害点（SPOF）の候補を求めるモジュール
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from src.terraform.resource_utils import iter_resources, resource_address
+
+
+class ResourceGraph:
+    """
+    tfparseの解析結果から作成する、リソースのアドレスを頂点とする参照関係のグラフ
+
+    tfparseは属性値の参照を参照先のブロックのIDに解決するため、属性値（ネストした
+    ブロックやdepends_onを含む）に他のリソースのIDが含まれる場合に辺を張る。
+    関節点（取り除くとグラフが分断される頂点）と橋（取り除くとグラフが分断される辺）を
+    単一障害点の候補とする。
+    """
+
+    def __init__(self) -> None:
+        """
+        ResourceGraphの初期化
+        """
+        # 参照元のアドレスごとの参照先のアドレス
+        self.references: Dict[str, List[str]] = {}
+        # アドレスごとの隣接するアドレス（参照の向きを区別しない）
+        self.adjacency: Dict[str, List[str]] = {}
+        self.resource_types: Dict[str, str] = {}
+        self._articulation_points: Optional[List[Dict[str, Any]]] = None
+        self._bridges: Optional[List[Dict[str, Any]]] = None
+
+    @classmethod
+    def from_terraform_data(cls, terraform_data: Dict[str, Any]) -> "ResourceGraph":
+        """
+        解析結果からグラフを作成
+
+        Args:
+            terraform_data: tfparseの解析結果
+
+        Returns:
+            ResourceGraph
+        """
+        graph = cls()
+        resources: List[Tuple[str, Dict[str, Any]]] = []
+        addresses_by_id: Dict[str, str] = {}
+        for resource_type, block in iter_resources(terraform_data):
+            address = resource_address(resource_type, block)
+            resources.append((address, block))
+            graph.resource_types[address] = resource_type
+            graph.adjacency[address] = []
+            block_id = block.get("id")
+            if isinstance(block_id, str):
+                addresses_by_id[block_id] = address
+
+        neighbours: Dict[str, Set[str]] = {address: set() for address in graph.adjacency}
+        for address, block in resources:
+            targets: List[str] = []
+            for key, value in block.items():
+                if key in ("__tfmeta", "id"):
+                    continue
+                for block_id in _iter_reference_ids(value, addresses_by_id):
+                    target = addresses_by_id[block_id]
+                    if target != address and target not in targets:
+                        targets.append(target)
+            if targets:
+                graph.references[address] = targets
+            for target in targets:
+                neighbours[address].add(target)
+                neighbours[target].add(address)
+
+        graph.adjacency = {address: sorted(nodes) for address, nodes in neighbours.items()}
+        return graph
+
+    @property
+    def node_count(self) -> int:
+        """頂点（リソース）の数"""
+        return len(self.adjacency)
+
+    @property
+    def edge_count(self) -> int:
+        """辺（参照関係）の数"""
+        return sum(len(nodes) for nodes in self.adjacency.values()) // 2
+
+    @property
+    def articulation_points(self) -> List[Dict[str, Any]]:
+        """
+        関節点のリスト（分断されるリソース数の多い順）
+
+        各要素は resource（アドレス）、type（リソースタイプ）、separated（取り除いたときに
+        最大の連結成分から切り離されるリソース数）、components（取り除いた後の連結成分の
+        大きさ）を含む。
+        """
+        if self._articulation_points is None:
+            self._analyze()
+        assert self._articulation_points is not None
+        return self._articulation_points
+
+    @property
+    def bridges(self) -> List[Dict[str, Any]]:
+        """
+        橋のリスト（分断されるリソース数の多い順）
+
+        各要素は resources（辺の両端のアドレス）と separated（取り除いたときに切り離される
+        小さい側のリソース数）を含む。
+        """
+        if self._bridges is None:
+            self._analyze()
+        assert self._bridges is not None
+        return self._bridges
+
+    def _analyze(self) -> None:
+        """
+        関節点と橋を求める（Tarjanのアルゴリズムを再帰なしで実行）
+        """
+        order: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        size: Dict[str, int] = {}
+        separated: Dict[str, List[int]] = {}
+        articulation_points: List[Dict[str, Any]] = []
+        bridges: List[Dict[str, Any]] = []
+
+        for root in self.adjacency:
+            if root in order:
+                continue
+            component: List[str] = [root]
+            component_bridges: List[Tuple[str, str, int]] = []
+            order[root] = low[root] = len(order)
+            size[root] = 1
+            stack: List[Tuple[str, Optional[str], Iterator[str]]] = [
+                (root, None, iter(self.adjacency[root]))
+            ]
+            while stack:
+                node, parent, neighbours = stack[-1]
+                child = None
+                for neighbour in neighbours:
+                    if neighbour == parent:
+                        continue
+                    if neighbour in order:
+                        low[node] = min(low[node], order[neighbour])
+                    else:
+                        child = neighbour
+                        break
+                if child is not None:
+                    order[child] = low[child] = len(order)
+                    size[child] = 1
+                    component.append(child)
+                    stack.append((child, node, iter(self.adjacency[child])))
+                    continue
+
+                stack.pop()
+                if parent is None:
+                    continue
+                low[parent] = min(low[parent], low[node])
+                size[parent] += size[node]
+                if low[node] >= order[parent]:
+                    separated.setdefault(parent, []).append(size[node])
+                if low[node] > order[parent]:
+                    component_bridges.append((parent, node, size[node]))
+
+            # 連結成分ごとに、取り除いた後の連結成分の大きさを求める
+            component_size = size[root]
+            for node in component:
+                components = list(separated.get(node, []))
+                if node == root:
+                    if len(components) < 2:
+                        continue
+                elif not components:
+                    continue
+                else:
+                    components.append(component_size - 1 - sum(components))
+                articulation_points.append(
+                    {
+                        "resource": node,
+                        "type": self.resource_types[node],
+                        "separated": sum(components) - max(components),
+                        "components": sorted(components, reverse=True),
+                    }
+                )
+            for parent, node, subtree in component_bridges:
+                bridges.append(
+                    {
+                        "resources": [parent, node],
+                        "separated": min(subtree, component_size - subtree),
+                    }
+                )
+
+        articulation_points.sort(key=lambda item: (-item["separated"], item["resource"]))
+        bridges.sort(key=lambda item: (-item["separated"], item["resources"]))
+        self._articulation_points = articulation_points
+        self._bridges = bridges
+
+    def summary(
+        self, addresses: Optional[Iterable[str]] = None, max_items: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        グラフの要約を取得
+
+        Args:
+            addresses: 要約に含めるリソースのアドレス（Noneの場合はすべて）。
+                参照元か参照先のいずれかが含まれる参照関係と、含まれる関節点・橋を返す
+            max_items: 関節点・橋それぞれの最大件数（Noneの場合はすべて）
+
+        Returns:
+            resource_count、reference_count、references（参照元ごとの参照先のリスト）、
+            articulation_points、bridges（切り離されるリソースが2件以上のもの）を含む辞書
+        """
+        targets = set(addresses) if addresses is not None else None
+        references: Dict[str, List[str]] = {}
+        for source, nodes in self.references.items():
+            if targets is not None and source not in targets:
+                nodes = [target for target in nodes if target in targets]
+            if nodes:
+                references[source] = nodes
+        articulation_points = [
+            item
+            for item in self.articulation_points
+            if targets is None or item["resource"] in targets
+        ]
+        # 末端のリソースへの参照（切り離されるのが1件のみ）は関節点の一覧と重複するため除く
+        bridges = [
+            item
+            for item in self.bridges
+            if item["separated"] > 1
+            and (targets is None or any(address in targets for address in item["resources"]))
+        ]
+        return {
+            "resource_count": self.node_count if targets is None else len(targets),
+            "reference_count": sum(len(nodes) for nodes in references.values()),
+            "references": references,
+            "articulation_points": articulation_points[:max_items],
+            "bridges": bridges[:max_items],
+        }
+
+
+def _iter_reference_ids(value: Any, addresses_by_id: Dict[str, str]) -> Iterator[str]:
+    """
+    属性値に含まれるリソースのIDを列挙する
+
+    Args:
+        value: 属性値
+        addresses_by_id: リソースのIDからアドレスへの対応表
+
+    Yields:
+        リソースのID
+    """
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            if item in addresses_by_id:
+                yield item
+        elif isinstance(item, list):
+            stack.extend(reversed(item))
+        elif isinstance(item, dict):
+            # 参照先のブロック全体が展開されている場合（depends_onなど）はIDのみを使用する
+            block_id = item.get("id")
+            if isinstance(block_id, str) and block_id in addresses_by_id:
+                yield block_id
+                continue
+            stack.extend(
+                reversed([child for key, child in item.items() if key not in ("__tfmeta", "id")])
+            )
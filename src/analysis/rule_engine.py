@@ -0,0 +1,793 @@
+"""
+Bedrockを呼び出さずにTerraformリソースの可用性をルールで評価するモジュール
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.config import get_settings
+from src.terraform.resource_table import Mask, ResourceTable, ResourceTypeTable
+from src.terraform.resource_utils import iter_resources, resource_address
+
+# 評価対象のリソース（アドレス, リソースブロック）
+Resource = Tuple[str, Dict[str, Any]]
+
+# リソース単位の判定関数（問題がある場合はTrue、ない場合はFalse、判定できない場合はNone）
+ResourceCheck = Callable[[Dict[str, Any]], Optional[bool]]
+
+# リソースタイプ単位の判定関数（問題があるリソースのアドレスと、判定できたリソースのアドレス）
+GroupCheck = Callable[[List[Resource], "RuleContext"], Tuple[List[str], Set[str]]]
+
+# 列指向のテーブルによる判定関数（問題がある行と、判定できた行）
+ColumnCheck = Callable[[ResourceTypeTable], Tuple[Mask, Mask]]
+
+# 重要度の表示名
+SEVERITY_LABELS = {
+    "ja": {"high": "高", "medium": "中", "low": "低"},
+    "en": {"high": "high", "medium": "medium", "low": "low"},
+}
+
+# ルールのみで評価する場合に、問題点1件ごとに可用性スコアから差し引く点数
+SEVERITY_PENALTIES = {"high": 15, "medium": 7, "low": 3}
+
+
+class RuleContext:
+    """
+    ルールの評価中に参照する、解析結果全体の索引
+
+    索引は最初に参照したときに作成する（参照するルールがない場合は作成しない）。
+    """
+
+    def __init__(self, terraform_data: Dict[str, Any]) -> None:
+        """
+        RuleContextの初期化
+
+        Args:
+            terraform_data: tfparseの解析結果
+        """
+        self.terraform_data = terraform_data
+        self._blocks_by_id: Optional[Dict[str, Tuple[str, Dict[str, Any]]]] = None
+
+    @property
+    def blocks_by_id(self) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """IDごとの(リソースタイプ, リソースブロック)"""
+        if self._blocks_by_id is None:
+            self._blocks_by_id = {}
+            for resource_type, block in iter_resources(self.terraform_data):
+                block_id = block.get("id")
+                if isinstance(block_id, str):
+                    self._blocks_by_id[block_id] = (resource_type, block)
+        return self._blocks_by_id
+
+    def resolve(self, value: Any) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        参照先のIDからリソースを取得
+
+        Args:
+            value: 参照先のID
+
+        Returns:
+            (リソースタイプ, リソースブロック)（見つからない場合はNone）
+        """
+        if isinstance(value, str):
+            return self.blocks_by_id.get(value)
+        return None
+
+
+class AvailabilityRule:
+    """
+    リソースタイプごとに登録する可用性のルール
+
+    リソース単位の判定関数（check）か、同じタイプのリソースをまとめて判定する関数
+    （check_group）のいずれかを指定する。リソース単位の判定関数と同じ結果を列全体に対する
+    演算で求める関数（check_columns）を追加すると、リソース数が多い場合はそちらで評価する。
+    """
+
+    def __init__(
+        self,
+        rule_id: str,
+        resource_type: str,
+        severity: str,
+        category: Dict[str, str],
+        description: Dict[str, str],
+        recommendation: Dict[str, str],
+        check: Optional[ResourceCheck] = None,
+        check_group: Optional[GroupCheck] = None,
+        check_columns: Optional[ColumnCheck] = None,
+    ) -> None:
+        """
+        AvailabilityRuleの初期化
+
+        Args:
+            rule_id: ルールID
+            resource_type: 評価するリソースタイプ
+            severity: 重要度（high/medium/low）
+            category: 言語ごとのカテゴリ名
+            description: 言語ごとの説明（{address}はリソースのアドレスに置き換える）
+            recommendation: 言語ごとの推奨対応
+            check: リソース単位の判定関数
+            check_group: リソースタイプ単位の判定関数
+            check_columns: 列指向のテーブルによる判定関数
+        """
+        if (check is None) == (check_group is None):
+            raise ValueError(f"checkとcheck_groupのいずれか一方を指定してください: {rule_id}")
+        self.rule_id = rule_id
+        self.resource_type = resource_type
+        self.severity = severity
+        self.category = category
+        self.description = description
+        self.recommendation = recommendation
+        self.check = check
+        self.check_group = check_group
+        self.check_columns = check_columns
+
+    def evaluate(
+        self, table: ResourceTypeTable, context: RuleContext, columnar: bool = False
+    ) -> Tuple[List[str], Set[str]]:
+        """
+        リソースを評価する
+
+        Args:
+            table: 評価するリソースタイプのテーブル
+            context: 解析結果全体の索引
+            columnar: 列指向のテーブルによる判定関数がある場合に使用するかどうか
+
+        Returns:
+            問題があるリソースのアドレスのリストと、判定できたリソースのアドレスの集合
+        """
+        if columnar and self.check_columns is not None:
+            violated, decided_rows = self.check_columns(table)
+            return table.where(violated), set(table.where(decided_rows))
+
+        if self.check_group is not None:
+            return self.check_group(table.resources(), context)
+
+        assert self.check is not None
+        violations: List[str] = []
+        decided: Set[str] = set()
+        for address, block in zip(table.addresses, table.blocks):
+            result = self.check(block)
+            if result is None:
+                continue
+            decided.add(address)
+            if result:
+                violations.append(address)
+        return violations, decided
+
+    def finding(self, address: str, language: str) -> Dict[str, Any]:
+        """
+        問題点をBedrockの分析結果と同じ形式で作成
+
+        Args:
+            address: 問題があるリソースのアドレス
+            language: 言語（ja/en）
+
+        Returns:
+            問題点
+        """
+        lang = "ja" if language == "ja" else "en"
+        return {
+            "category": self.category[lang],
+            "severity": SEVERITY_LABELS[lang][self.severity],
+            "description": self.description[lang].format(address=address),
+            "recommendation": self.recommendation[lang],
+            "resource": address,
+            "rule_id": self.rule_id,
+            "source": "rule",
+        }
+
+
+# 組み込みのルール
+DEFAULT_RULES: List[AvailabilityRule] = []
+
+
+def availability_rule(
+    rule_id: str,
+    resource_type: str,
+    severity: str,
+    category: Dict[str, str],
+    description: Dict[str, str],
+    recommendation: Dict[str, str],
+    group: bool = False,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    判定関数を組み込みのルールとして登録するデコレーター
+
+    Args:
+        rule_id: ルールID
+        resource_type: 評価するリソースタイプ
+        severity: 重要度（high/medium/low）
+        category: 言語ごとのカテゴリ名
+        description: 言語ごとの説明（{address}はリソースのアドレスに置き換える）
+        recommendation: 言語ごとの推奨対応
+        group: リソースタイプ単位の判定関数の場合はTrue
+
+    Returns:
+        判定関数をそのまま返すデコレーター
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        DEFAULT_RULES.append(
+            AvailabilityRule(
+                rule_id,
+                resource_type,
+                severity,
+                category,
+                description,
+                recommendation,
+                check=None if group else func,
+                check_group=func if group else None,
+            )
+        )
+        return func
+
+    return decorator
+
+
+def columnar_check(rule_id: str) -> Callable[[ColumnCheck], ColumnCheck]:
+    """
+    組み込みのルールに列指向のテーブルによる判定関数を追加するデコレーター
+
+    Args:
+        rule_id: 判定関数を追加するルールのID（登録済みのもの）
+
+    Returns:
+        判定関数をそのまま返すデコレーター
+    """
+
+    def decorator(func: ColumnCheck) -> ColumnCheck:
+        for rule in DEFAULT_RULES:
+            if rule.rule_id == rule_id:
+                rule.check_columns = func
+                return func
+        raise ValueError(f"ルールが登録されていません: {rule_id}")
+
+    return decorator
+
+
+def _known(value: Any) -> bool:
+    """
+    属性値が解決済みかどうかを判定
+
+    Args:
+        value: 属性値
+
+    Returns:
+        変数や他のリソースの属性への参照が解決できていない場合はFalse
+    """
+    if value is None:
+        return False
+    if isinstance(value, dict) and "__attribute__" in value:
+        return False
+    return not (isinstance(value, str) and value.startswith("${"))
+
+
+def _as_bool(value: Any) -> Optional[bool]:
+    """
+    属性値を真偽値に変換
+
+    Args:
+        value: 属性値
+
+    Returns:
+        真偽値（変換できない場合はNone）
+    """
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    return None
+
+
+def _as_int(value: Any) -> Optional[int]:
+    """
+    属性値を整数に変換
+
+    Args:
+        value: 属性値
+
+    Returns:
+        整数（変換できない場合はNone）
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    return None
+
+
+def _nested_blocks(value: Any) -> List[Dict[str, Any]]:
+    """
+    ネストしたブロックをリストとして取得（tfparseは1つの場合は辞書、複数の場合はリストを返す）
+
+    Args:
+        value: ネストしたブロックの属性値
+
+    Returns:
+        ブロックのリスト
+    """
+    if isinstance(value, dict) and "__attribute__" not in value:
+        return [value]
+    if isinstance(value, list):
+        return [item for item in value if isinstance(item, dict)]
+    return []
+
+
+@availability_rule(
+    "rds-single-az",
+    "aws_db_instance",
+    "high",
+    category={"ja": "マルチAZ構成", "en": "Multi-AZ"},
+    description={
+        "ja": "{address} はマルチAZ配置が無効です（multi_az = false）。"
+        "アベイラビリティーゾーンの障害時にデータベースが停止します。",
+        "en": "{address} is not deployed in Multi-AZ mode (multi_az = false). "
+        "The database becomes unavailable if its Availability Zone fails.",
+    },
+    recommendation={
+        "ja": "multi_az = true を設定し、スタンバイインスタンスへの自動フェイルオーバーを有効にしてください。",
+        "en": "Set multi_az = true to enable automatic failover to a standby instance.",
+    },
+)
+def _rds_single_az(block: Dict[str, Any]) -> Optional[bool]:
+    # リードレプリカはソースのインスタンスで評価する
+    if _known(block.get("replicate_source_db")):
+        return False
+    if "multi_az" not in block:
+        return True
+    multi_az = _as_bool(block["multi_az"])
+    return None if multi_az is None else not multi_az
+
+
+@columnar_check("rds-single-az")
+def _rds_single_az_columns(table: ResourceTypeTable) -> Tuple[Mask, Mask]:
+    replica = table.column("replicate_source_db", "str").is_known()
+    multi_az = table.column("multi_az", "bool")
+    violated = ~replica & (multi_az.is_missing() | multi_az.is_false())
+    return violated, replica | multi_az.is_missing() | multi_az.has_value()
+
+
+@availability_rule(
+    "rds-no-backup",
+    "aws_db_instance",
+    "high",
+    category={"ja": "バックアップ", "en": "Backup"},
+    description={
+        "ja": "{address} の自動バックアップが無効です（backup_retention_period = 0）。",
+        "en": "{address} has automated backups disabled (backup_retention_period = 0).",
+    },
+    recommendation={
+        "ja": "backup_retention_period を1以上（本番環境では7以上）に設定してください。",
+        "en": "Set backup_retention_period to 1 or more (7 or more for production).",
+    },
+)
+def _rds_no_backup(block: Dict[str, Any]) -> Optional[bool]:
+    if _known(block.get("replicate_source_db")):
+        return False
+    if "backup_retention_period" not in block:
+        return False
+    retention = _as_int(block["backup_retention_period"])
+    return None if retention is None else retention == 0
+
+
+@columnar_check("rds-no-backup")
+def _rds_no_backup_columns(table: ResourceTypeTable) -> Tuple[Mask, Mask]:
+    replica = table.column("replicate_source_db", "str").is_known()
+    retention = table.column("backup_retention_period", "int")
+    violated = ~replica & retention.eq(0)
+    return violated, replica | retention.is_missing() | retention.has_value()
+
+
+@availability_rule(
+    "asg-single-instance",
+    "aws_autoscaling_group",
+    "high",
+    category={"ja": "オートスケーリング", "en": "Auto Scaling"},
+    description={
+        "ja": "{address} の最小インスタンス数が1以下です（min_size <= 1）。"
+        "インスタンスの置き換え中はサービスが停止します。",
+        "en": "{address} has a minimum size of 1 or less (min_size <= 1). "
+        "The service is unavailable while the instance is being replaced.",
+    },
+    recommendation={
+        "ja": "min_size を2以上に設定し、複数のアベイラビリティーゾーンに分散してください。",
+        "en": "Set min_size to 2 or more and spread instances across Availability Zones.",
+    },
+)
+def _asg_single_instance(block: Dict[str, Any]) -> Optional[bool]:
+    min_size = _as_int(block.get("min_size"))
+    return None if min_size is None else min_size <= 1
+
+
+@columnar_check("asg-single-instance")
+def _asg_single_instance_columns(table: ResourceTypeTable) -> Tuple[Mask, Mask]:
+    min_size = table.column("min_size", "int")
+    return min_size.le(1), min_size.has_value()
+
+
+@availability_rule(
+    "asg-single-subnet",
+    "aws_autoscaling_group",
+    "high",
+    category={"ja": "マルチAZ構成", "en": "Multi-AZ"},
+    description={
+        "ja": "{address} は1つのサブネット（アベイラビリティーゾーン）のみを使用しています。",
+        "en": "{address} uses only one subnet (Availability Zone).",
+    },
+    recommendation={
+        "ja": "vpc_zone_identifier に異なるアベイラビリティーゾーンのサブネットを複数指定してください。",
+        "en": "Specify subnets in multiple Availability Zones in vpc_zone_identifier.",
+    },
+)
+def _asg_single_subnet(block: Dict[str, Any]) -> Optional[bool]:
+    for key in ("vpc_zone_identifier", "availability_zones"):
+        value = block.get(key)
+        if isinstance(value, list) and all(_known(item) for item in value):
+            return len(value) <= 1
+    return None
+
+
+@columnar_check("asg-single-subnet")
+def _asg_single_subnet_columns(table: ResourceTypeTable) -> Tuple[Mask, Mask]:
+    subnets = table.column("vpc_zone_identifier", "length")
+    zones = table.column("availability_zones", "length")
+    violated = subnets.le(1) | (~subnets.has_value() & zones.le(1))
+    return violated, subnets.has_value() | zones.has_value()
+
+
+@availability_rule(
+    "subnets-single-az",
+    "aws_subnet",
+    "high",
+    category={"ja": "マルチAZ構成", "en": "Multi-AZ"},
+    description={
+        "ja": "{address} を含むVPCのサブネットがすべて同じアベイラビリティーゾーンにあります。",
+        "en": "All subnets in the VPC of {address} are in the same Availability Zone.",
+    },
+    recommendation={
+        "ja": "複数のアベイラビリティーゾーンにサブネットを作成し、リソースを分散してください。",
+        "en": "Create subnets in multiple Availability Zones and distribute resources across them.",
+    },
+    group=True,
+)
+def _subnets_single_az(
+    resources: List[Resource], context: RuleContext
+) -> Tuple[List[str], Set[str]]:
+    # VPCごとにサブネットのアベイラビリティーゾーンを集計する
+    vpcs: Dict[str, List[Tuple[str, Any]]] = {}
+    for address, block in resources:
+        vpc_id = block.get("vpc_id")
+        vpc_key = vpc_id if isinstance(vpc_id, str) else ""
+        zone = block.get("availability_zone")
+        if not _known(zone):
+            zone = block.get("availability_zone_id")
+        vpcs.setdefault(vpc_key, []).append((address, zone))
+
+    violations: List[str] = []
+    decided: Set[str] = set()
+    for vpc_key, subnets in vpcs.items():
+        if not vpc_key or not all(_known(zone) for _, zone in subnets):
+            continue
+        decided.update(address for address, _ in subnets)
+        if len({zone for _, zone in subnets}) == 1:
+            # VPCごとに1件の問題点とする
+            violations.append(subnets[0][0])
+    return violations, decided
+
+
+@availability_rule(
+    "nat-gateway-single",
+    "aws_nat_gateway",
+    "medium",
+    category={"ja": "単一障害点（SPOF）", "en": "Single point of failure"},
+    description={
+        "ja": "{address} がVPCで唯一のNATゲートウェイです。"
+        "配置されたアベイラビリティーゾーンの障害時にプライベートサブネットから外部に接続できなくなります。",
+        "en": "{address} is the only NAT gateway in its VPC. Private subnets lose outbound "
+        "connectivity if its Availability Zone fails.",
+    },
+    recommendation={
+        "ja": "アベイラビリティーゾーンごとにNATゲートウェイを作成し、ルートテーブルを分けてください。",
+        "en": "Create a NAT gateway per Availability Zone with separate route tables.",
+    },
+    group=True,
+)
+def _nat_gateway_single(
+    resources: List[Resource], context: RuleContext
+) -> Tuple[List[str], Set[str]]:
+    # 配置先のサブネットからVPCを特定し、VPCごとにNATゲートウェイを集計する
+    vpcs: Dict[str, List[str]] = {}
+    decided: Set[str] = set()
+    for address, block in resources:
+        subnet = context.resolve(block.get("subnet_id"))
+        vpc_id = subnet[1].get("vpc_id") if subnet is not None else None
+        if not isinstance(vpc_id, str):
+            continue
+        vpcs.setdefault(vpc_id, []).append(address)
+        decided.add(address)
+
+    violations = [addresses[0] for addresses in vpcs.values() if len(addresses) == 1]
+    return violations, decided
+
+
+@availability_rule(
+    "dynamodb-no-pitr",
+    "aws_dynamodb_table",
+    "medium",
+    category={"ja": "バックアップ", "en": "Backup"},
+    description={
+        "ja": "{address} のポイントインタイムリカバリ（PITR）が無効です。",
+        "en": "{address} does not have point-in-time recovery (PITR) enabled.",
+    },
+    recommendation={
+        "ja": "point_in_time_recovery { enabled = true } を設定してください。",
+        "en": "Add point_in_time_recovery { enabled = true }.",
+    },
+)
+def _dynamodb_no_pitr(block: Dict[str, Any]) -> Optional[bool]:
+    if "point_in_time_recovery" not in block:
+        return True
+    settings = _nested_blocks(block["point_in_time_recovery"])
+    if not settings:
+        return None
+    enabled = _as_bool(settings[0].get("enabled", False))
+    return None if enabled is None else not enabled
+
+
+@columnar_check("dynamodb-no-pitr")
+def _dynamodb_no_pitr_columns(table: ResourceTypeTable) -> Tuple[Mask, Mask]:
+    # ブロックがない場合とenabledがない場合はどちらも無効とみなす
+    enabled = table.column("point_in_time_recovery.enabled", "bool")
+    return enabled.is_missing() | enabled.is_false(), enabled.is_missing() | enabled.has_value()
+
+
+@availability_rule(
+    "lambda-no-reserved-concurrency",
+    "aws_lambda_function",
+    "low",
+    category={"ja": "サーバーレスの可用性", "en": "Serverless availability"},
+    description={
+        "ja": "{address} に予約済み同時実行数が設定されていません。"
+        "他の関数がアカウントの同時実行数を使い切るとスロットリングされます。",
+        "en": "{address} has no reserved concurrency. It can be throttled when other "
+        "functions exhaust the account concurrency limit.",
+    },
+    recommendation={
+        "ja": "reserved_concurrent_executions を設定して必要な同時実行数を確保してください。",
+        "en": "Set reserved_concurrent_executions to guarantee the concurrency it needs.",
+    },
+)
+def _lambda_no_reserved_concurrency(block: Dict[str, Any]) -> Optional[bool]:
+    if "reserved_concurrent_executions" not in block:
+        return True
+    value = block["reserved_concurrent_executions"]
+    if not _known(value):
+        return None
+    concurrency = _as_int(value)
+    # -1は予約なし（未設定と同じ）
+    return concurrency is None or concurrency < 0
+
+
+@columnar_check("lambda-no-reserved-concurrency")
+def _lambda_no_reserved_concurrency_columns(table: ResourceTypeTable) -> Tuple[Mask, Mask]:
+    concurrency = table.column("reserved_concurrent_executions", "int")
+    invalid = concurrency.is_known() & ~concurrency.has_value()
+    violated = concurrency.is_missing() | invalid | concurrency.lt(0)
+    return violated, concurrency.is_missing() | concurrency.is_known()
+
+
+@availability_rule(
+    "lambda-no-dlq",
+    "aws_lambda_function",
+    "medium",
+    category={"ja": "エラーハンドリング", "en": "Error handling"},
+    description={
+        "ja": "{address} にデッドレターキュー（dead_letter_config）が設定されていません。"
+        "非同期呼び出しで失敗したイベントが失われます。",
+        "en": "{address} has no dead-letter queue (dead_letter_config). "
+        "Failed asynchronous invocations are lost.",
+    },
+    recommendation={
+        "ja": "dead_letter_config でSQSキューまたはSNSトピックを指定してください。",
+        "en": "Specify an SQS queue or SNS topic in dead_letter_config.",
+    },
+)
+def _lambda_no_dlq(block: Dict[str, Any]) -> Optional[bool]:
+    if "dead_letter_config" not in block:
+        return True
+    configs = _nested_blocks(block["dead_letter_config"])
+    if not configs:
+        return None
+    return not _known(configs[0].get("target_arn"))
+
+
+@columnar_check("lambda-no-dlq")
+def _lambda_no_dlq_columns(table: ResourceTypeTable) -> Tuple[Mask, Mask]:
+    configs = table.column("dead_letter_config", "blocks")
+    target = table.column("dead_letter_config.target_arn", "str")
+    violated = configs.is_missing() | (configs.gt(0) & ~target.is_known())
+    return violated, configs.is_missing() | configs.gt(0)
+
+
+@availability_rule(
+    "lb-single-subnet",
+    "aws_lb",
+    "high",
+    category={"ja": "ロードバランサー", "en": "Load balancer"},
+    description={
+        "ja": "{address} は1つのサブネット（アベイラビリティーゾーン）のみに配置されています。",
+        "en": "{address} is placed in only one subnet (Availability Zone).",
+    },
+    recommendation={
+        "ja": "異なるアベイラビリティーゾーンのサブネットを2つ以上指定してください。",
+        "en": "Specify two or more subnets in different Availability Zones.",
+    },
+)
+def _lb_single_subnet(block: Dict[str, Any]) -> Optional[bool]:
+    subnets = block.get("subnets")
+    if isinstance(subnets, list) and all(_known(item) for item in subnets):
+        return len(subnets) <= 1
+    mappings = _nested_blocks(block.get("subnet_mapping"))
+    if mappings:
+        return len(mappings) <= 1
+    return None
+
+
+@columnar_check("lb-single-subnet")
+def _lb_single_subnet_columns(table: ResourceTypeTable) -> Tuple[Mask, Mask]:
+    subnets = table.column("subnets", "length")
+    mappings = table.column("subnet_mapping", "blocks")
+    violated = subnets.le(1) | (~subnets.has_value() & mappings.gt(0) & mappings.le(1))
+    return violated, subnets.has_value() | mappings.gt(0)
+
+
+class RuleEngine:
+    """
+    リソースタイプごとに登録したルールで解析結果を評価するクラス
+    """
+
+    def __init__(
+        self,
+        rules: Optional[Iterable[AvailabilityRule]] = None,
+        language: Optional[str] = None,
+        disabled_rules: Optional[Iterable[str]] = None,
+        columnar_threshold: Optional[int] = None,
+    ) -> None:
+        """
+        RuleEngineの初期化
+
+        Args:
+            rules: 使用するルール（Noneの場合は組み込みのルール）
+            language: 問題点の言語（Noneの場合は設定から取得）
+            disabled_rules: 無効にするルールIDのリスト（Noneの場合は設定から取得）
+            columnar_threshold: 列指向のテーブルで評価するリソース数の下限
+                （Noneの場合は設定から取得）
+        """
+        settings = get_settings()
+        self.language = language or settings["app"]["language"]
+        if columnar_threshold is None:
+            columnar_threshold = settings["analysis"]["rules"]["columnar_threshold"]
+        self.columnar_threshold = columnar_threshold
+        if disabled_rules is None:
+            disabled_rules = settings["analysis"]["rules"]["disabled"] or []
+        disabled = set(disabled_rules)
+
+        self.rules: Dict[str, List[AvailabilityRule]] = {}
+        for rule in DEFAULT_RULES if rules is None else rules:
+            if rule.rule_id not in disabled:
+                self.register(rule)
+
+    def register(self, rule: AvailabilityRule) -> None:
+        """
+        ルールを登録する
+
+        Args:
+            rule: 登録するルール
+        """
+        self.rules.setdefault(rule.resource_type, []).append(rule)
+
+    def evaluate(
+        self, terraform_data: Dict[str, Any], columnar: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """
+        解析結果をルールで評価する
+
+        Args:
+            terraform_data: tfparseの解析結果
+            columnar: 列指向のテーブルによる判定関数を使用するかどうか
+                （Noneの場合はリソース数がcolumnar_threshold以上のときに使用）
+
+        Returns:
+            問題点（findings）、評価したリソース数（resource_count）、
+            すべてのルールで判定できたリソースのアドレス（covered）
+        """
+        table = ResourceTable.from_terraform_data(terraform_data, resource_types=self.rules)
+        if columnar is None:
+            columnar = table.resource_count >= self.columnar_threshold
+
+        context = RuleContext(terraform_data)
+        findings: List[Dict[str, Any]] = []
+        covered: Set[str] = set()
+        for resource_type, type_table in table.tables.items():
+            type_covered = set(type_table.addresses)
+            for rule in self.rules[resource_type]:
+                violations, decided = rule.evaluate(type_table, context, columnar)
+                findings.extend(rule.finding(address, self.language) for address in violations)
+                type_covered &= decided
+            covered |= type_covered
+
+        return {"findings": findings, "resource_count": table.resource_count, "covered": covered}
+
+    def create_result(self, evaluation: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        ルールの評価結果をBedrockの分析結果と同じ形式に変換
+
+        Args:
+            evaluation: evaluateの戻り値
+
+        Returns:
+            分析結果
+        """
+        findings = evaluation["findings"]
+        lang = "ja" if self.language == "ja" else "en"
+        labels = {label: severity for severity, label in SEVERITY_LABELS[lang].items()}
+
+        # 推奨事項はルールごとに1件とする
+        recommendations: List[Dict[str, Any]] = []
+        counts: Dict[str, int] = {}
+        for finding in findings:
+            counts[finding["rule_id"]] = counts.get(finding["rule_id"], 0) + 1
+            if counts[finding["rule_id"]] == 1:
+                recommendations.append(
+                    {"priority": finding["severity"], "description": finding["recommendation"]}
+                )
+        recommendations.sort(
+            key=lambda r: list(SEVERITY_PENALTIES).index(labels.get(r["priority"], "low"))
+        )
+
+        score = 100 - sum(SEVERITY_PENALTIES[labels[f["severity"]]] for f in findings)
+        if lang == "ja":
+            overview = (
+                f"ルールによる評価: {evaluation['resource_count']}件のリソースを評価し、"
+                f"{len(findings)}件の問題点を検出しました（Bedrockによる分析は行っていません）。"
+            )
+        else:
+            overview = (
+                f"Rule-based evaluation: checked {evaluation['resource_count']} resources and "
+                f"found {len(findings)} issues (no Bedrock analysis was performed)."
+            )
+
+        return {
+            "overview": overview,
+            "availability_score": max(score, 0),
+            "findings": findings,
+            "recommendations": recommendations,
+        }
+
+    @staticmethod
+    def exclude_resources(terraform_data: Dict[str, Any], addresses: Set[str]) -> Dict[str, Any]:
+        """
+        指定したアドレスのリソースを解析結果から取り除く
+
+        Args:
+            terraform_data: tfparseの解析結果
+            addresses: 取り除くリソースのアドレス
+
+        Returns:
+            リソースを取り除いた解析結果（元のデータは変更しない）
+        """
+        residual: Dict[str, Any] = {}
+        for block_type, blocks in terraform_data.items():
+            if not isinstance(blocks, list):
+                residual[block_type] = blocks
+                continue
+            kept = [
+                block
+                for block in blocks
+                if not isinstance(block, dict)
+                or resource_address(block_type, block) not in addresses
+            ]
+            if kept:
+                residual[block_type] = kept
+        return residual
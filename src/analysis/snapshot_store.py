@@ -0,0 +1,272 @@
+"""
+ルートごとの前回の解析結果と問題点を保存し、差分を求めるモジュール
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, cast
+
+from src.cache.disk_cache import DiskCache
+from src.config import get_settings
+from src.terraform.resource_utils import iter_resources, resource_address
+
+# スナップショットの形式のバージョン（形式を変更した場合に更新する）
+SNAPSHOT_FORMAT_VERSION = 1
+
+# 問題点のテキストに含まれるリソースのアドレスの候補（例: module.vpc.aws_subnet.public[0]）
+ADDRESS_TOKEN_PATTERN = re.compile(
+    r"(?:[\w./\-]+:)?[A-Za-z_][\w\-]*(?:\[[^\]\s]*\])?(?:\.[A-Za-z_][\w\-]*(?:\[[^\]\s]*\])?)+"
+)
+
+
+class SnapshotStore:
+    """
+    ルートごとに、属性を絞り込んだリソースブロックと分析結果（問題点とその対象リソース）を
+    保存するクラス
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_size_mb: Optional[int] = None) -> None:
+        """
+        SnapshotStoreの初期化
+
+        Args:
+            directory: 保存先のディレクトリのパス（Noneの場合は設定から取得）
+            max_size_mb: 保存先の最大サイズ（MB）（Noneの場合は設定から取得）
+        """
+        cache_settings = get_settings()["cache"]
+        snapshot_settings = cache_settings["snapshots"]
+        directory = (
+            directory
+            or snapshot_settings.get("directory")
+            or os.path.join(cache_settings["directory"], "snapshots")
+        )
+        self.store = DiskCache(
+            directory,
+            max_size_bytes=(max_size_mb or snapshot_settings["max_size_mb"]) * 1024 * 1024,
+        )
+
+    @staticmethod
+    def make_key(root: str, variant: Iterable[Any]) -> str:
+        """
+        スナップショットのキーを作成
+
+        Args:
+            root: Terraformルートのパス
+            variant: 分析結果に影響する設定（モデルID、言語など）
+
+        Returns:
+            キー
+        """
+        payload = json.dumps(
+            [SNAPSHOT_FORMAT_VERSION, os.path.abspath(root), *variant],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        スナップショットを読み込む
+
+        Args:
+            key: キー
+
+        Returns:
+            resources（アドレスごとのブロック）、result（分析結果）、created_atを含む辞書
+            （存在しない場合はNone）
+        """
+        value = self.store.get(key)
+        if not isinstance(value, dict) or not isinstance(value.get("resources"), dict):
+            return None
+        return cast(Dict[str, Any], value)
+
+    def save(self, key: str, resources: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """
+        スナップショットを保存する
+
+        問題点と推奨事項には対象リソースのアドレス（resourcesキー）を付与して保存する。
+
+        Args:
+            key: キー
+            resources: アドレスごとの属性を絞り込んだリソースブロック
+            result: 分析結果（ルールによる問題点を統合する前のもの）
+        """
+        addresses = set(resources)
+        findings = []
+        for finding in result.get("findings", []):
+            if not isinstance(finding, dict):
+                continue
+            finding = dict(finding)
+            finding["resources"] = attribute_finding(finding, addresses)
+            findings.append(finding)
+        recommendations = []
+        for rec in result.get("recommendations", []):
+            if not isinstance(rec, dict):
+                continue
+            rec = dict(rec)
+            rec["resources"] = attribute_finding(rec, addresses)
+            recommendations.append(rec)
+
+        snapshot = {
+            "created_at": time.time(),
+            "resources": resources,
+            "result": {
+                "overview": result.get("overview", ""),
+                "availability_score": result.get("availability_score"),
+                "findings": findings,
+                "recommendations": recommendations,
+            },
+        }
+        try:
+            self.store.put(key, snapshot)
+        except Exception as e:
+            # 保存に失敗しても分析結果は利用できるため警告のみ
+            print(f"警告: 分析結果のスナップショットの保存に失敗しました: {e}")
+
+
+def resource_blocks(terraform_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    解析結果のリソースブロックをアドレスごとの辞書にする
+
+    Args:
+        terraform_data: 属性を絞り込んだ解析結果
+
+    Returns:
+        アドレスごとのリソースブロック
+    """
+    return {
+        resource_address(resource_type, block): block
+        for resource_type, block in iter_resources(terraform_data)
+    }
+
+
+def diff_resources(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, List[str]]:
+    """
+    前回と今回のリソースブロックを比較する
+
+    Args:
+        previous: 前回のアドレスごとのリソースブロック
+        current: 今回のアドレスごとのリソースブロック
+
+    Returns:
+        added（追加）、changed（変更）、removed（削除）、unchanged（変更なし）の
+        アドレスのリストを含む辞書
+    """
+    diff: Dict[str, List[str]] = {"added": [], "changed": [], "removed": [], "unchanged": []}
+    for address, block in current.items():
+        if address not in previous:
+            diff["added"].append(address)
+        elif _block_hash(previous[address]) != _block_hash(block):
+            diff["changed"].append(address)
+        else:
+            diff["unchanged"].append(address)
+    diff["removed"] = [address for address in previous if address not in current]
+    return diff
+
+
+def related_addresses(
+    previous: Dict[str, Any], current: Dict[str, Any], removed: List[str]
+) -> List[str]:
+    """
+    削除されたリソースと参照関係にあった、現在も存在するリソースのアドレスを求める
+
+    削除されたリソースが参照していたリソースと、削除されたリソースを参照していたリソースを対象とする。
+
+    Args:
+        previous: 前回のアドレスごとのリソースブロック（参照はアドレスに置き換えたもの）
+        current: 今回のアドレスごとのリソースブロック
+        removed: 削除されたリソースのアドレス
+
+    Returns:
+        アドレスのリスト（ソート済み）
+    """
+    if not removed:
+        return []
+    removed_set = set(removed)
+    related: Set[str] = set()
+    for address in removed:
+        related.update(value for value in _string_values(previous[address]) if value in current)
+    for address, block in previous.items():
+        if address in current and not removed_set.isdisjoint(_string_values(block)):
+            related.add(address)
+    return sorted(related)
+
+
+def attribute_finding(finding: Dict[str, Any], addresses: Set[str]) -> List[str]:
+    """
+    問題点の対象リソースのアドレスを求める
+
+    resourcesキー（モデルが返した対象リソース、または代表から展開したアドレス）のうち
+    解析結果に含まれるもの、resourceキーの順に使用し、いずれもない場合は説明と推奨事項に
+    含まれるアドレスを対象とする。moduleキーがある場合はモジュールのアドレスを省略した形式も
+    対象とする。
+
+    Args:
+        finding: 問題点
+        addresses: 解析結果に含まれるリソースのアドレス
+
+    Returns:
+        対象リソースのアドレスのリスト（特定できない場合は空のリスト）
+    """
+    modules = [
+        module.strip() for module in str(finding.get("module") or "").split(",") if module.strip()
+    ]
+    result: List[str] = []
+    value = finding.get("resources")
+    if isinstance(value, (list, str)):
+        for address in [value] if isinstance(value, str) else value:
+            address = str(address)
+            for candidate in [address] + [f"{module}.{address}" for module in modules]:
+                if candidate in addresses and candidate not in result:
+                    result.append(candidate)
+        if result:
+            return result
+    if finding.get("resource"):
+        return [str(finding["resource"])]
+
+    text = f"{finding.get('description') or ''} {finding.get('recommendation') or ''}"
+    for token in ADDRESS_TOKEN_PATTERN.findall(text):
+        token = token.rstrip(".")
+        for candidate in [token] + [f"{module}.{token}" for module in modules]:
+            if candidate in addresses and candidate not in result:
+                result.append(candidate)
+    return result
+
+
+def _string_values(value: Any) -> Set[str]:
+    """
+    属性値に含まれる文字列を再帰的に集める
+
+    Args:
+        value: 属性値
+
+    Returns:
+        文字列の集合
+    """
+    if isinstance(value, str):
+        return {value}
+    values: Set[str] = set()
+    if isinstance(value, dict):
+        for item in value.values():
+            values |= _string_values(item)
+    elif isinstance(value, list):
+        for item in value:
+            values |= _string_values(item)
+    return values
+
+
+def _block_hash(block: Any) -> str:
+    """
+    リソースブロックのハッシュを計算
+
+    Args:
+        block: 属性を絞り込んだリソースブロック
+
+    Returns:
+        ハッシュ
+    """
+    payload = json.dumps(block, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -0,0 +1,291 @@
+"""
+ストリーミングで受信中の分析結果を逐次解析するモジュール
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.analysis.analysis_parser import REQUIRED_FIELD_TYPES, AnalysisParser, loads_json
+
+# 要素が閉じるたびに返す配列の項目
+STREAMED_FIELDS = ("findings", "recommendations")
+
+# 受信中に値を取り出す配列以外の項目
+SCALAR_FIELDS = tuple(key for key in REQUIRED_FIELD_TYPES if key not in STREAMED_FIELDS)
+
+# 文字列リテラルの外側で走査が必要な文字
+_STRUCTURE_PATTERN = re.compile(r'[{}\[\]",:]')
+
+# 文字列リテラルの内側で走査が必要な文字
+_STRING_PATTERN = re.compile(r'["\\]')
+
+# 走査済みのテキストを破棄する単位（文字数）
+_TRIM_THRESHOLD = 4096
+
+
+class _Frame:
+    """
+    走査中のオブジェクトまたは配列
+    """
+
+    def __init__(self, kind: str, start: int, parent: Optional["_Frame"]) -> None:
+        """
+        _Frameの初期化
+
+        Args:
+            kind: 開き括弧（{ または [）
+            start: 開き括弧の位置
+            parent: 外側のオブジェクトまたは配列
+        """
+        self.kind = kind
+        self.start = start
+        self.parent = parent
+        # オブジェクトの場合、値を走査中のキー
+        self.key: Optional[str] = None
+        # 配列以外の項目の値の開始位置（値を取り出さない場合はNone）
+        self.value_start: Optional[int] = None
+        # 取り出した配列以外の項目の値
+        self.scalars: Dict[str, Any] = {}
+
+    @property
+    def streamed_field(self) -> Optional[str]:
+        """要素を逐次返す配列の場合はその項目名"""
+        if self.kind != "[" or self.parent is None or self.parent.kind != "{":
+            return None
+        return self.parent.key if self.parent.key in STREAMED_FIELDS else None
+
+
+class IncrementalAnalysisParser:
+    """
+    ストリーミングで受信したテキストの差分を逐次走査し、問題点と推奨事項の
+    オブジェクトを閉じた時点で1件ずつ返すクラス
+
+    分析結果のJSONの前後にある文章やコードブロックは読み飛ばす。後から別の分析結果の
+    オブジェクトが始まった場合（例示のJSONが先に出力された場合など）は、それまでに
+    返した項目を破棄して新しいオブジェクトの項目を返し直す。
+    """
+
+    def __init__(self) -> None:
+        """
+        IncrementalAnalysisParserの初期化
+        """
+        self.chunks: List[str] = []
+        # 走査中のテキスト（先頭の位置はwindow_offset）
+        self.window = ""
+        self.window_offset = 0
+        self.position = 0
+        self.in_string = False
+        self.escaped = False
+        self.string_start = 0
+        self.last_string: Optional[Tuple[int, int]] = None
+        self.stack: List[_Frame] = []
+        # 項目を返している分析結果のオブジェクト
+        self.root: Optional[_Frame] = None
+        self.root_span: Optional[Tuple[int, int]] = None
+        self.items: Dict[str, List[Dict[str, Any]]] = {field: [] for field in STREAMED_FIELDS}
+        self.resets = 0
+
+    def feed(self, delta: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        受信したテキストの差分を走査する
+
+        Args:
+            delta: 受信したテキストの差分
+
+        Returns:
+            この差分で閉じた(項目名, オブジェクト)のリスト
+        """
+        self.chunks.append(delta)
+        self.window += delta
+        emitted: List[Tuple[str, Dict[str, Any]]] = []
+
+        end = self.window_offset + len(self.window)
+        while self.position < end:
+            local = self.position - self.window_offset
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                    self.position += 1
+                    continue
+                match = _STRING_PATTERN.search(self.window, local)
+                if match is None:
+                    self.position = end
+                    break
+                self.position = self.window_offset + match.end()
+                if match.group() == "\\":
+                    self.escaped = True
+                else:
+                    self.in_string = False
+                    self.last_string = (self.string_start, self.position)
+                continue
+
+            if not self.stack:
+                # オブジェクトの外側では次の開き括弧まで読み飛ばす（文章中の引用符は無視する）
+                index = self.window.find("{", local)
+                if index < 0:
+                    self.position = end
+                    break
+                self.position = self.window_offset + index
+            else:
+                match = _STRUCTURE_PATTERN.search(self.window, local)
+                if match is None:
+                    self.position = end
+                    break
+                self.position = self.window_offset + match.start()
+
+            self._handle(self.window[self.position - self.window_offset], emitted)
+            self.position += 1
+
+        self._trim()
+        return emitted
+
+    def _handle(self, char: str, emitted: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        文字列リテラルの外側の構造文字を処理する
+
+        Args:
+            char: 構造文字
+            emitted: 閉じたオブジェクトを追加するリスト
+        """
+        top = self.stack[-1] if self.stack else None
+        if char == '"':
+            self.in_string = True
+            self.string_start = self.position
+        elif char in "{[":
+            if top is not None and top.value_start is not None:
+                # 配列以外の項目の値がオブジェクトや配列の場合は取り出さない
+                top.value_start = None
+            frame = _Frame(char, self.position, top)
+            self.stack.append(frame)
+            if frame.streamed_field is not None and frame.parent is not self.root:
+                # 別の分析結果のオブジェクトが始まった場合はそれまでの項目を破棄する
+                self._reset_root(frame.parent)
+        elif char in "}]":
+            if top is None or top.kind != ("{" if char == "}" else "["):
+                # 括弧の対応がとれない場合は走査をやり直す
+                self.stack = []
+                return
+            self._end_value(top)
+            self.stack.pop()
+            parent = top.parent
+            if top.kind == "{" and parent is not None and parent.streamed_field is not None:
+                item = self._decode(top.start, self.position + 1)
+                if isinstance(item, dict):
+                    field = parent.streamed_field
+                    self.items[field].append(item)
+                    emitted.append((field, item))
+            if top is self.root:
+                self.root_span = (top.start, self.position + 1)
+        elif char == ":" and top is not None and top.kind == "{":
+            top.key = self._decode(*self.last_string) if self.last_string else None
+            if top.key in SCALAR_FIELDS:
+                top.value_start = self.position + 1
+        elif char == "," and top is not None:
+            self._end_value(top)
+
+    def _end_value(self, frame: _Frame) -> None:
+        """
+        オブジェクトの値の終わりで、配列以外の項目の値を取り出す
+
+        Args:
+            frame: 値を走査していたオブジェクト
+        """
+        if frame.kind != "{" or frame.value_start is None:
+            return
+        value = self._decode(frame.value_start, self.position)
+        if value is not None and isinstance(frame.key, str):
+            frame.scalars[frame.key] = value
+        frame.value_start = None
+
+    def _reset_root(self, root: Optional[_Frame]) -> None:
+        """
+        項目を返す分析結果のオブジェクトを切り替える
+
+        Args:
+            root: 新しい分析結果のオブジェクト
+        """
+        if self.root is not None:
+            self.resets += 1
+        self.root = root
+        self.root_span = None
+        self.items = {field: [] for field in STREAMED_FIELDS}
+
+    def _decode(self, start: int, end: int) -> Any:
+        """
+        走査中のテキストの範囲をJSONとしてデコードする
+
+        Args:
+            start: 開始位置
+            end: 終了位置
+
+        Returns:
+            デコードした値（デコードできない場合はNone）
+        """
+        text = self.window[start - self.window_offset : end - self.window_offset].strip()
+        try:
+            return loads_json(text)
+        except ValueError:
+            return None
+
+    def _trim(self) -> None:
+        """
+        今後デコードする可能性のない走査済みのテキストを破棄する
+        """
+        keep = self.position
+        if self.in_string:
+            keep = min(keep, self.string_start)
+        elif self.last_string is not None and self.stack and self.stack[-1].kind == "{":
+            # 次の「:」でキーとしてデコードする可能性がある
+            keep = min(keep, self.last_string[0])
+        for frame in self.stack:
+            if frame.value_start is not None:
+                keep = min(keep, frame.value_start)
+            if frame.parent is not None and frame.parent.streamed_field is not None:
+                keep = min(keep, frame.start)
+
+        if keep - self.window_offset >= _TRIM_THRESHOLD:
+            self.window = self.window[keep - self.window_offset :]
+            self.window_offset = keep
+
+    @property
+    def text(self) -> str:
+        """これまでに受信したテキスト"""
+        return "".join(self.chunks)
+
+    def partial_result(self) -> Dict[str, Any]:
+        """
+        これまでに受信した範囲の分析結果を取得（レスポンスが途中で途切れた場合など）
+
+        Returns:
+            受信済みの配列以外の項目と、閉じた問題点・推奨事項を含む分析結果
+        """
+        result: Dict[str, Any] = dict(self.root.scalars) if self.root is not None else {}
+        for field in STREAMED_FIELDS:
+            result[field] = list(self.items[field])
+        return result
+
+    def finish(self, text: str, parser: AnalysisParser) -> Dict[str, Any]:
+        """
+        受信を終えたレスポンスの分析結果を取得
+
+        分析結果のオブジェクトが閉じていて、受信したテキストがレスポンスと一致する場合は
+        そのオブジェクトの範囲のみをデコードする。それ以外の場合（途中で括弧の対応が
+        とれなくなった場合や、続きの生成で結合されたテキストが異なる場合など）は
+        テキスト全体をparserで解析する。
+
+        Args:
+            text: レスポンスのテキスト
+            parser: 逐次解析できない場合に使用するAnalysisParser
+
+        Returns:
+            分析結果
+        """
+        if self.root_span is not None and text == self.text:
+            start, end = self.root_span
+            try:
+                result = loads_json(text[start:end])
+            except ValueError:
+                result = None
+            if isinstance(result, dict):
+                return result
+        return parser.parse(text)
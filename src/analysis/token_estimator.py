@@ -0,0 +1,62 @@
+"""
+プロンプトのトークン数を概算するモジュール
+"""
+
+from typing import Any, Dict
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    テキストのトークン数を概算する
+
+    正確なトークナイザーを使わずに、ASCII文字は約4文字で1トークン、
+    日本語などの非ASCII文字は1文字で約1トークンとして概算する。
+
+    Args:
+        text: 対象のテキスト
+
+    Returns:
+        概算トークン数
+    """
+    if not text:
+        return 0
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    ascii_chars = len(text) - non_ascii
+    return (ascii_chars + 3) // 4 + non_ascii
+
+
+def estimate_max_output_tokens(resource_count: int, output_settings: Dict[str, Any]) -> int:
+    """
+    分析対象のリソース数から、1回の呼び出しで生成させる最大トークン数を決める
+
+    小規模な入力で過大な上限を指定しないように、リソース数に比例した値を
+    設定の最小値と最大値の範囲に収める。
+
+    Args:
+        resource_count: 分析対象のリソース数
+        output_settings: 出力トークン数の設定（analysis.output_tokens）
+
+    Returns:
+        最大出力トークン数
+    """
+    tokens = int(output_settings["base"]) + int(output_settings["per_resource"]) * resource_count
+    return max(int(output_settings["min"]), min(int(output_settings["max"]), tokens))
+
+
+def model_output_limit(model_id: str, output_settings: Dict[str, Any]) -> int:
+    """
+    モデルが1回の呼び出しで生成できる最大トークン数を取得
+
+    Args:
+        model_id: BedrockモデルID（クロスリージョン推論プロファイルのIDを含む）
+        output_settings: 出力トークン数の設定（analysis.output_tokens）
+
+    Returns:
+        最大出力トークン数（model_limitsに一致しない場合はdefault_model_limit）
+    """
+    # より具体的な（長い）名前を優先して照合する
+    limits = output_settings.get("model_limits") or {}
+    for name in sorted(limits, key=len, reverse=True):
+        if name in model_id:
+            return int(limits[name])
+    return int(output_settings["default_model_limit"])
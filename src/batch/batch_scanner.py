@@ -0,0 +1,271 @@
+"""
+複数のTerraformルートを1プロセスでまとめて解析・分析するモジュール
+"""
+
+import glob
+import hashlib
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from rich.console import Console
+
+from src.analysis.availability_checker import AvailabilityChecker
+from src.config import get_settings
+from src.terraform.resource_utils import count_resources
+from src.terraform.terraform_exporter import TerraformExporter
+
+# Richコンソールを初期化
+console = Console()
+
+# 解析ステージの終了を分析ステージに伝えるための番兵
+_END_OF_QUEUE = object()
+
+
+class BatchScanner:
+    """
+    複数のTerraformルートの解析とBedrockによる分析をパイプライン実行するクラス
+
+    解析ステージと分析ステージはそれぞれ固定数のスレッドで動作し、
+    サイズ上限付きのキューで接続される。分析が追いつかない場合は
+    解析ステージが待機するため、メモリ使用量が一定の範囲に収まる。
+    """
+
+    def __init__(
+        self,
+        checker: Optional[AvailabilityChecker] = None,
+        output_dir: Optional[str] = None,
+        parse_workers: Optional[int] = None,
+        analysis_workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        use_parse_cache: Optional[bool] = None,
+        html: bool = False,
+        html_mode: Optional[str] = None,
+    ) -> None:
+        """
+        BatchScannerの初期化
+
+        Args:
+            checker: 分析に使用するAvailabilityChecker（Noneの場合は分析をスキップ）
+            output_dir: レポートの出力ディレクトリ（Noneの場合は設定から取得）
+            parse_workers: 解析ステージのスレッド数（Noneの場合は設定から取得）
+            analysis_workers: 分析ステージのスレッド数（Noneの場合は設定から取得）
+            queue_size: 解析済みで分析待ちのルートの最大数（Noneの場合は設定から取得）
+            use_parse_cache: 解析結果のキャッシュを使用するかどうか（Noneの場合は設定から取得）
+            html: ルートごとにHTMLレポートも出力するかどうか
+            html_mode: HTMLレポートの問題点の表示方式（Noneの場合は設定から取得）
+        """
+        settings = get_settings()
+        scan_settings = settings["scan"]
+        self.checker = checker
+        self.output_dir = output_dir or os.path.join(settings["output"]["directory"], "scan")
+        self.parse_workers = parse_workers or scan_settings["parse_workers"]
+        self.analysis_workers = analysis_workers or scan_settings["analysis_workers"]
+        self.queue_size = queue_size or scan_settings["queue_size"]
+        self.use_parse_cache = use_parse_cache
+        self.html = html
+        self.html_mode = html_mode
+        self._results: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def expand_roots(patterns: List[str]) -> List[str]:
+        """
+        globパターンを展開してTerraformルートのリストを作成
+
+        Args:
+            patterns: globパターン（例: repos/*/environments/*）
+
+        Returns:
+            重複を除いたルートディレクトリのリスト
+        """
+        roots: List[str] = []
+        seen = set()
+        for pattern in patterns:
+            for path in sorted(glob.glob(os.path.expanduser(pattern), recursive=True)):
+                if not os.path.isdir(path):
+                    continue
+                key = os.path.realpath(path)
+                if key in seen:
+                    continue
+                seen.add(key)
+                roots.append(path)
+        return roots
+
+    def scan(self, roots: List[str]) -> List[Dict[str, Any]]:
+        """
+        各ルートを解析・分析し、ルートごとのレポートを出力する
+
+        Args:
+            roots: Terraformルートのリスト
+
+        Returns:
+            ルートごとの実行結果のリスト（rootsと同じ順序）
+        """
+        self._results = [self._new_result(root) for root in roots]
+        parsed_queue: "queue.Queue[Any]" = queue.Queue(maxsize=self.queue_size)
+
+        # 分析ステージのスレッドを起動
+        analysis_threads = [
+            threading.Thread(target=self._analysis_worker, args=(parsed_queue,), daemon=True)
+            for _ in range(self.analysis_workers)
+        ]
+        for thread in analysis_threads:
+            thread.start()
+
+        # 解析ステージ（キューが一杯の場合はputで待機する）
+        with ThreadPoolExecutor(max_workers=self.parse_workers) as executor:
+            for index in range(len(roots)):
+                executor.submit(self._parse_root, index, parsed_queue)
+
+        for _ in analysis_threads:
+            parsed_queue.put(_END_OF_QUEUE)
+        for thread in analysis_threads:
+            thread.join()
+
+        return self._results
+
+    def _parse_root(self, index: int, parsed_queue: "queue.Queue[Any]") -> None:
+        """
+        ルートを解析して分析キューに渡す（解析ステージ）
+
+        Args:
+            index: ルートのインデックス
+            parsed_queue: 分析待ちのキュー
+        """
+        result = self._results[index]
+        root = result["root"]
+        report_dir = result["report_dir"]
+
+        start_time = time.time()
+        try:
+            exporter = TerraformExporter(
+                output_dir=report_dir, use_parse_cache=self.use_parse_cache
+            )
+            terraform_data, json_file = exporter.export_to_json(root)
+        except Exception as e:
+            terraform_data, json_file = None, None
+            console.print(f"[bold red]エラー: {root} の解析に失敗しました: {e}[/bold red]")
+        result["parse_time"] = time.time() - start_time
+
+        if terraform_data is None:
+            result["status"] = "parse_error"
+            return
+
+        result["json_file"] = json_file
+        result["resource_count"] = count_resources(terraform_data)
+
+        if self.checker is None:
+            result["status"] = "parsed"
+            return
+
+        parsed_queue.put((index, terraform_data))
+
+    def _analysis_worker(self, parsed_queue: "queue.Queue[Any]") -> None:
+        """
+        キューから解析済みのルートを取り出して分析する（分析ステージ）
+
+        Args:
+            parsed_queue: 分析待ちのキュー
+        """
+        while True:
+            item = parsed_queue.get()
+            if item is _END_OF_QUEUE:
+                return
+            index, terraform_data = item
+            try:
+                self._analyze_root(index, terraform_data)
+            except Exception as e:
+                self._results[index]["status"] = "analysis_error"
+                self._results[index]["error"] = str(e)
+
+    def _analyze_root(self, index: int, terraform_data: Dict[str, Any]) -> None:
+        """
+        ルートの可用性を分析してレポートを保存する
+
+        Args:
+            index: ルートのインデックス
+            terraform_data: ルートの解析結果
+        """
+        assert self.checker is not None
+        result = self._results[index]
+
+        settings = get_settings()
+        start_time = time.time()
+        analysis_results = self.checker.analyze_with_bedrock(
+            terraform_data,
+            partial_report_file=os.path.join(
+                result["report_dir"], settings["output"]["partial_report_filename"]
+            ),
+            root=result["root"],
+        )
+        result["analysis_time"] = time.time() - start_time
+
+        report_file = os.path.join(
+            result["report_dir"], settings["output"]["default_report_filename"]
+        )
+        result["report_file"] = self.checker.save_json_report(analysis_results, report_file)
+        if self.html:
+            html_file = os.path.join(
+                result["report_dir"], settings["output"]["default_html_filename"]
+            )
+            result["html_file"] = self.checker.export_as_html(
+                analysis_results, html_file, self.html_mode
+            )
+
+        if "error" in analysis_results:
+            result["status"] = "analysis_error"
+            result["error"] = analysis_results["error"]
+        elif "raw_analysis" in analysis_results:
+            result["status"] = "unstructured"
+        else:
+            result["status"] = "partial" if analysis_results.get("partial") else "ok"
+            result["availability_score"] = analysis_results.get("availability_score")
+            result["findings"] = len(analysis_results.get("findings", []))
+
+        with self._lock:
+            console.print(
+                f"分析完了: [bold]{result['root']}[/bold] "
+                f"[bold green]{result['analysis_time']:.1f}秒[/bold green]"
+            )
+
+    def _new_result(self, root: str) -> Dict[str, Any]:
+        """
+        ルートごとの実行結果の初期値を作成
+
+        Args:
+            root: Terraformルートのパス
+
+        Returns:
+            実行結果の辞書
+        """
+        return {
+            "root": root,
+            "report_dir": os.path.abspath(os.path.join(self.output_dir, self._slug(root))),
+            "status": "pending",
+            "resource_count": 0,
+            "parse_time": 0.0,
+            "analysis_time": 0.0,
+        }
+
+    @staticmethod
+    def _slug(root: str) -> str:
+        """
+        ルートのパスからレポートディレクトリ名を作成
+
+        記号の置き換えで異なるルートが同じ名前にならないよう、絶対パスのハッシュを付加する。
+
+        Args:
+            root: Terraformルートのパス
+
+        Returns:
+            ディレクトリ名
+        """
+        normalized = os.path.normpath(root).strip(os.sep).replace(os.sep, "__")
+        slug = re.sub(r"[^A-Za-z0-9_.-]", "_", normalized).lstrip(".") or "root"
+        digest = hashlib.sha256(os.path.abspath(root).encode("utf-8")).hexdigest()[:8]
+        return f"{slug}-{digest}"
@@ -0,0 +1,429 @@
+"""
+gitリポジトリの過去のリビジョンごとに可用性を評価し、スコアと問題点の推移を求めるモジュール
+"""
+
+import hashlib
+import os
+import posixpath
+import subprocess
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from rich.console import Console
+
+from src.analysis.availability_checker import AvailabilityChecker
+from src.config import get_settings
+from src.terraform.git_changes import is_terraform_file, run_git
+from src.terraform.parse_cache import LOCAL_MODULE_SOURCE_PATTERN
+from src.terraform.resource_utils import count_resources
+from src.terraform.terraform_exporter import TerraformExporter
+
+# Richコンソールを初期化
+console = Console()
+
+# git logの項目の区切り文字
+_FIELD_SEPARATOR = "\x1f"
+
+# 内容が同じリビジョンで共有する結果の項目
+_SHARED_KEYS = (
+    "status",
+    "resource_count",
+    "availability_score",
+    "report_file",
+    "error",
+    "findings",
+)
+
+
+class HistoryAnalyzer:
+    """
+    直近のコミットのリビジョンごとにTerraformプロジェクトを解析・分析するクラス
+
+    リビジョンごとにプロジェクト（参照するローカルモジュールを含む）のTerraformファイルの
+    blobのハッシュから内容のハッシュを求め、内容が同じリビジョンは解析・分析を省略して
+    結果を共有する。内容が異なるリビジョンのみを再利用する作業ツリーにチェックアウトして
+    解析し、前のリビジョンの分析結果との差分のみを分析する（analysis.incremental）。
+    """
+
+    def __init__(
+        self,
+        checker: Optional[AvailabilityChecker] = None,
+        output_dir: Optional[str] = None,
+        worktree_dir: Optional[str] = None,
+        use_parse_cache: Optional[bool] = None,
+        parallel: Optional[bool] = None,
+        workers: Optional[int] = None,
+    ) -> None:
+        """
+        HistoryAnalyzerの初期化
+
+        Args:
+            checker: 分析に使用するAvailabilityChecker（Noneの場合は解析のみ）
+            output_dir: レポートの出力ディレクトリ（Noneの場合は設定から取得）
+            worktree_dir: チェックアウトに使用する作業ツリーのディレクトリ
+                （Noneの場合は設定から取得）
+            use_parse_cache: 解析結果のキャッシュを使用するかどうか（Noneの場合は設定から取得）
+            parallel: ルートごとに並列解析するかどうか（Noneの場合は設定から取得）
+            workers: 並列解析のワーカー数（Noneの場合は設定から取得）
+        """
+        settings = get_settings()
+        history_settings = settings["history"]
+        self.checker = checker
+        self.output_dir = output_dir or os.path.join(settings["output"]["directory"], "history")
+        self.worktree_dir = (
+            worktree_dir
+            or history_settings.get("worktree_directory")
+            or os.path.join(settings["cache"]["directory"], "history")
+        )
+        self.use_parse_cache = use_parse_cache
+        self.parallel = parallel
+        self.workers = workers
+        self._blobs: Dict[str, str] = {}
+
+    def analyze(
+        self, terraform_path: str, ref: str = "HEAD", count: Optional[int] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        直近のリビジョンを古い順に解析・分析し、リビジョンごとの結果を出力する
+
+        Args:
+            terraform_path: Terraformプロジェクトのパス（gitリポジトリ内）
+            ref: 起点のリビジョン
+            count: 対象とするリビジョンの数（Noneの場合は設定から取得）
+
+        Returns:
+            リビジョンごとの結果のリスト（古い順）。gitの実行に失敗した場合はNone
+        """
+        count = count or get_settings()["history"]["revisions"]
+        top_level = run_git(terraform_path, ["rev-parse", "--show-toplevel"])
+        if top_level is None:
+            return None
+        top_level = os.path.realpath(top_level.strip())
+        project = os.path.relpath(os.path.realpath(terraform_path), top_level).replace(
+            os.sep, "/"
+        )
+
+        revisions = self._list_revisions(top_level, ref, count)
+        if revisions is None:
+            return None
+        console.print(f"対象リビジョン数: [bold]{len(revisions)}[/bold] ({ref} から)")
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        worktree = None
+        results: List[Dict[str, Any]] = []
+        analyzed: Dict[str, Dict[str, Any]] = {}
+        for revision in revisions:
+            content_hash = self._content_hash(top_level, revision["revision"], project)
+            revision["content_hash"] = content_hash
+            if content_hash is None:
+                # 内容を特定できないリビジョンは他のリビジョンと同一とみなさない
+                revision["status"] = "hash_error"
+                results.append(revision)
+                continue
+            previous = analyzed.get(content_hash)
+            if previous is not None:
+                # Terraformファイルが同じリビジョンは解析・分析を省略して結果を共有する
+                revision.update({key: previous[key] for key in _SHARED_KEYS if key in previous})
+                revision["reused_from"] = previous["short"]
+                results.append(revision)
+                continue
+
+            if worktree is None:
+                worktree = self._prepare_worktree(top_level)
+                if worktree is None:
+                    return None
+            self._analyze_revision(revision, worktree, project)
+            analyzed[content_hash] = revision
+            results.append(revision)
+
+        return self._timeline(results)
+
+    def _list_revisions(
+        self, top_level: str, ref: str, count: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        起点のリビジョンから最初の親をたどったリビジョンを取得
+
+        Args:
+            top_level: リポジトリのルートディレクトリ
+            ref: 起点のリビジョン
+            count: リビジョンの数
+
+        Returns:
+            revision、short、date、subjectを含む辞書のリスト（古い順）
+        """
+        log = run_git(
+            top_level,
+            [
+                "log",
+                "--first-parent",
+                f"--max-count={count}",
+                f"--format=%H{_FIELD_SEPARATOR}%h{_FIELD_SEPARATOR}%cI{_FIELD_SEPARATOR}%s",
+                ref,
+                "--",
+            ],
+        )
+        if log is None:
+            return None
+        revisions = []
+        for line in log.splitlines():
+            fields = line.split(_FIELD_SEPARATOR)
+            if len(fields) == 4:
+                revisions.append(
+                    {
+                        "revision": fields[0],
+                        "short": fields[1],
+                        "date": fields[2],
+                        "subject": fields[3],
+                    }
+                )
+        revisions.reverse()
+        return revisions
+
+    def _content_hash(self, top_level: str, revision: str, project: str) -> Optional[str]:
+        """
+        リビジョンのプロジェクトのTerraformファイルの内容のハッシュを計算
+
+        プロジェクトのディレクトリ配下と、.tfファイルから参照されるローカルモジュールの
+        ディレクトリ配下のファイルのパスとblobのハッシュを対象とする（解析結果のキャッシュと
+        同じ範囲）。チェックアウトは行わず、モジュールの参照の抽出に必要なblobのみを読み込む。
+
+        Args:
+            top_level: リポジトリのルートディレクトリ
+            revision: リビジョン
+            project: リポジトリのルートからのプロジェクトの相対パス
+
+        Returns:
+            内容のハッシュ。gitの実行に失敗した場合はNone
+        """
+        listing = run_git(top_level, ["ls-tree", "-r", "-z", revision])
+        if listing is None:
+            return None
+        entries: Dict[str, str] = {}
+        for item in listing.split("\0"):
+            meta, _, path = item.partition("\t")
+            fields = meta.split()
+            if len(fields) == 3 and fields[1] == "blob" and is_terraform_file(path):
+                entries[path] = fields[2]
+
+        files: Dict[str, str] = {}
+        pending = [project]
+        visited = set()
+        while pending:
+            directory = posixpath.normpath(pending.pop())
+            if directory in visited or directory.startswith(".."):
+                continue
+            visited.add(directory)
+            prefix = "" if directory == "." else directory + "/"
+            scoped = {path: blob for path, blob in entries.items() if path.startswith(prefix)}
+            files.update(scoped)
+            tf_files = [(path, blob) for path, blob in scoped.items() if path.endswith(".tf")]
+            if not self._read_blobs(top_level, [blob for _, blob in tf_files]):
+                return None
+            for path, blob in tf_files:
+                for source in LOCAL_MODULE_SOURCE_PATTERN.findall(self._blobs.get(blob, "")):
+                    pending.append(posixpath.join(posixpath.dirname(path), source))
+
+        digest = hashlib.sha256()
+        for path in sorted(files):
+            digest.update(f"{path}\0{files[path]}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _read_blobs(self, top_level: str, blobs: List[str]) -> bool:
+        """
+        読み込んでいないblobの内容をまとめて読み込む
+
+        Args:
+            top_level: リポジトリのルートディレクトリ
+            blobs: blobのハッシュのリスト
+
+        Returns:
+            読み込みに成功したかどうか
+        """
+        missing = sorted({blob for blob in blobs if blob not in self._blobs})
+        if not missing:
+            return True
+        try:
+            completed = subprocess.run(
+                ["git", "-C", top_level, "cat-file", "--batch"],
+                input="\n".join(missing).encode("utf-8") + b"\n",
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                check=True,
+            )
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"警告: gitのblobの読み込みに失敗しました: {e}")
+            return False
+
+        output = completed.stdout
+        position = 0
+        while position < len(output):
+            header_end = output.index(b"\n", position)
+            header = output[position:header_end].decode("utf-8", errors="replace").split()
+            position = header_end + 1
+            if len(header) != 3:
+                # 存在しないオブジェクト（"<hash> missing"）
+                continue
+            size = int(header[2])
+            self._blobs[header[0]] = output[position:position + size].decode(
+                "utf-8", errors="replace"
+            )
+            position += size + 1
+        return True
+
+    def _prepare_worktree(self, top_level: str) -> Optional[str]:
+        """
+        チェックアウトに使用する作業ツリーを用意する（前回の実行のものがあれば再利用）
+
+        Args:
+            top_level: リポジトリのルートディレクトリ
+
+        Returns:
+            作業ツリーのパス（作成に失敗した場合はNone）
+        """
+        key = hashlib.sha256(top_level.encode("utf-8")).hexdigest()[:16]
+        worktree = os.path.join(os.path.expanduser(self.worktree_dir), key)
+        if os.path.exists(os.path.join(worktree, ".git")):
+            return worktree
+
+        os.makedirs(os.path.dirname(worktree), exist_ok=True)
+        run_git(top_level, ["worktree", "prune"])
+        if run_git(top_level, ["worktree", "add", "--detach", "--force", worktree]) is None:
+            console.print("[bold red]エラー: 作業ツリーを作成できませんでした。[/bold red]")
+            return None
+        return worktree
+
+    def _analyze_revision(self, revision: Dict[str, Any], worktree: str, project: str) -> None:
+        """
+        リビジョンをチェックアウトして解析・分析する
+
+        Args:
+            revision: リビジョンの情報（結果が追加される）
+            worktree: 作業ツリーのパス
+            project: リポジトリのルートからのプロジェクトの相対パス
+        """
+        short = revision["short"]
+        console.print(f"\n[bold]{short}[/bold] {revision['subject']}")
+        revision["findings"] = []
+        checkout = ["checkout", "--detach", "--force", "--quiet", revision["revision"]]
+        if run_git(worktree, checkout) is None:
+            revision["status"] = "checkout_error"
+            return
+
+        project_path = os.path.normpath(os.path.join(worktree, project))
+        start_time = time.time()
+        terraform_data = None
+        if os.path.isdir(project_path):
+            exporter = TerraformExporter(
+                output_dir=self.output_dir,
+                use_parse_cache=self.use_parse_cache,
+                parallel=self.parallel,
+                workers=self.workers,
+            )
+            terraform_data, _ = exporter.export_to_json(
+                project_path,
+                os.path.join(os.path.abspath(self.output_dir), f"terraform_parsed_{short}.json"),
+            )
+        revision["parse_time"] = time.time() - start_time
+        if terraform_data is None:
+            revision["status"] = "parse_error"
+            return
+        revision["resource_count"] = count_resources(terraform_data)
+        if self.checker is None:
+            revision["status"] = "parsed"
+            return
+
+        settings = get_settings()
+        start_time = time.time()
+        # 作業ツリーのパスは実行ごとに同じため、前のリビジョンの分析結果との差分のみを分析する
+        results = self.checker.analyze_with_bedrock(
+            terraform_data,
+            partial_report_file=os.path.join(
+                self.output_dir, settings["output"]["partial_report_filename"]
+            ),
+            root=project_path,
+        )
+        revision["analysis_time"] = time.time() - start_time
+        revision["report_file"] = self.checker.save_json_report(
+            results, os.path.join(os.path.abspath(self.output_dir), f"report_{short}.json")
+        )
+        if "error" in results:
+            revision["status"] = "analysis_error"
+            revision["error"] = results["error"]
+        elif "raw_analysis" in results:
+            revision["status"] = "unstructured"
+        else:
+            revision["status"] = "partial" if results.get("partial") else "ok"
+            revision["availability_score"] = results.get("availability_score")
+            revision["findings"] = [
+                finding for finding in results.get("findings", []) if isinstance(finding, dict)
+            ]
+
+    @staticmethod
+    def _timeline(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        リビジョンごとの結果に、前のリビジョンからのスコアと問題点の変化を追加する
+
+        Args:
+            results: リビジョンごとの結果（古い順）
+
+        Returns:
+            問題点の一覧をfinding_count・added_findings・resolved_findingsに置き換えた結果
+        """
+        timeline = []
+        previous: Optional[Dict[Tuple[str, str], str]] = None
+        previous_score = None
+        for result in results:
+            findings = result.pop("findings", [])
+            entry = dict(result)
+            if result.get("status") not in ("ok", "parsed"):
+                timeline.append(entry)
+                continue
+
+            current = {_finding_key(finding): _finding_label(finding) for finding in findings}
+            entry["finding_count"] = len(current)
+            score = result.get("availability_score")
+            if previous is not None:
+                entry["added_findings"] = [
+                    label for key, label in current.items() if key not in previous
+                ]
+                entry["resolved_findings"] = [
+                    label for key, label in previous.items() if key not in current
+                ]
+                if isinstance(score, (int, float)) and isinstance(previous_score, (int, float)):
+                    entry["score_delta"] = score - previous_score
+            previous = current
+            previous_score = score
+            timeline.append(entry)
+        return timeline
+
+
+def _finding_key(finding: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    リビジョン間で同じ問題点を識別するキーを作成
+
+    Args:
+        finding: 問題点
+
+    Returns:
+        ルールの問題点はルールIDと対象リソース、それ以外はカテゴリと説明のタプル
+    """
+    if finding.get("rule_id"):
+        return str(finding["rule_id"]), str(finding.get("resource") or "")
+    return (
+        str(finding.get("category") or "").strip().lower(),
+        " ".join(str(finding.get("description") or "").split()).lower(),
+    )
+
+
+def _finding_label(finding: Dict[str, Any]) -> str:
+    """
+    問題点の表示用の文字列を作成
+
+    Args:
+        finding: 問題点
+
+    Returns:
+        「[重要度] 説明」の形式の文字列
+    """
+    return f"[{finding.get('severity', '')}] {finding.get('description', '')}"
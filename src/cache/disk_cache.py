@@ -0,0 +1,159 @@
+"""
+ディスク上にJSONデータをキャッシュするモジュール
+"""
+
+import json
+import os
+import tempfile
+import time
+from typing import Any, List, Optional, Tuple
+
+
+class DiskCache:
+    """
+    サイズ上限付きのLRUディスクキャッシュ
+
+    各エントリは1つのJSONファイルとして保存され、ファイルの更新時刻を
+    最終アクセス時刻として扱うことでLRU方式の削除を行う。
+    """
+
+    def __init__(
+        self, directory: str, max_size_bytes: int, ttl_seconds: Optional[float] = None
+    ) -> None:
+        """
+        DiskCacheの初期化
+
+        Args:
+            directory: キャッシュディレクトリのパス
+            max_size_bytes: キャッシュ全体の最大サイズ（バイト）
+            ttl_seconds: エントリの有効期間（秒）。Noneの場合は無期限
+        """
+        self.directory = os.path.expanduser(directory)
+        self.max_size_bytes = max_size_bytes
+        self.ttl_seconds = ttl_seconds
+        os.makedirs(self.directory, exist_ok=True)
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        キャッシュからエントリを取得する
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            キャッシュされた値（存在しない・期限切れ・破損している場合はNone）
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(entry, dict) or "value" not in entry:
+            return None
+
+        # 有効期限の確認
+        if self.ttl_seconds is not None:
+            created_at = entry.get("created_at", 0)
+            if time.time() - created_at > self.ttl_seconds:
+                self._remove(path)
+                return None
+
+        # 最終アクセス時刻を更新（LRU用）
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+        return entry["value"]
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        エントリをキャッシュに保存する
+
+        一時ファイルに書き込んでからリネームすることで、
+        並行して動作する別プロセスが書きかけのファイルを読まないようにする。
+
+        Args:
+            key: キャッシュキー
+            value: 保存する値（JSONシリアライズ可能であること）
+        """
+        entry = {"created_at": time.time(), "value": value}
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False, separators=(",", ":"), default=str)
+            os.replace(tmp_path, self._entry_path(key))
+        except Exception:
+            self._remove(tmp_path)
+            raise
+
+        self._evict()
+
+    def delete(self, key: str) -> None:
+        """
+        エントリを削除する（存在しない場合は何もしない）
+
+        Args:
+            key: キャッシュキー
+        """
+        self._remove(self._entry_path(key))
+
+    def _evict(self) -> None:
+        """
+        キャッシュ全体のサイズが上限を超えている場合、古いエントリから削除する
+        """
+        entries: List[Tuple[float, int, str]] = []
+        total_size = 0
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+
+        for name in names:
+            if not name.endswith(".json") or name.startswith(".tmp-"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_size += stat.st_size
+
+        if total_size <= self.max_size_bytes:
+            return
+
+        # 最終アクセスが古い順に削除
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.max_size_bytes:
+                break
+            self._remove(path)
+            total_size -= size
+
+    def _entry_path(self, key: str) -> str:
+        """
+        キャッシュキーに対応するファイルパスを取得
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            エントリのファイルパス
+        """
+        return os.path.join(self.directory, f"{key}.json")
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        """
+        ファイルを削除する（既に削除されている場合は無視）
+
+        Args:
+            path: 削除するファイルのパス
+        """
+        try:
+            os.remove(path)
+        except OSError:
+            pass
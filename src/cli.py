@@ -9,13 +9,23 @@ import argparse
 import os
 import sys
 import time
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from rich.console import Console
 from rich.panel import Panel
 
+from src.terraform.git_changes import (
+    affected_roots,
+    changed_resource_addresses,
+    changed_terraform_files,
+)
+from src.terraform.parallel_parser import find_terraform_roots
 from src.terraform.terraform_exporter import TerraformExporter
 from src.analysis.availability_checker import AvailabilityChecker
+from src.batch.batch_scanner import BatchScanner
+from src.batch.history_analyzer import HistoryAnalyzer
+from src.reporting.report_generator import ReportGenerator
+from src.ui.console_renderer import ConsoleRenderer
 from src.config import get_settings, reset_settings
 
 # Richコンソールを初期化
@@ -49,8 +59,50 @@ Terraform解析結果をJSONファイルに保存:
 Terraform解析のみを実行 (可用性分析をスキップ):
     python -m src.cli ./terraform_project --skip-analysis --json-output terraform_plan.json
 
+解析結果のキャッシュを使わずに再解析:
+    python -m src.cli ./terraform_project --no-parse-cache
+
+Bedrockレスポンスのキャッシュを使わずに分析:
+    python -m src.cli ./terraform_project --cache-mode off
+
+Bedrockのレスポンスをストリーミングせずに一括で受信:
+    python -m src.cli ./terraform_project --no-stream
+
+小規模なプロジェクトを高速モデルで分析:
+    python -m src.cli ./terraform_project --fast-model anthropic.claude-3-haiku-20240307-v1:0
+
+Bedrockを呼び出さずにルールのみで評価:
+    python -m src.cli ./terraform_project --rules-only
+
+ルールで判定できないリソースのみをBedrockで分析:
+    python -m src.cli ./terraform_project --rules-residual
+
+モジュールごとに分析し、同じ内容のモジュールの分析結果を共有:
+    python -m src.cli ./terraform_project --module-analysis
+
+mainブランチから変更されたルートとリソースのみを分析（pre-commitフックやCI向け）:
+    python -m src.cli ./terraform_project --changed-since main --rules-only
+
+前回の分析結果との差分ではなく、すべてのリソースを再分析:
+    python -m src.cli ./terraform_project --full
+
+大規模なプロジェクトをグループに分割して分析:
+    python -m src.cli ./terraform_project --chunked on
+
+モジュール・環境ごとに並列解析:
+    python -m src.cli ./terraform_project --parallel-parse --parse-workers 4
+
 設定ファイルの使用:
     python -m src.cli ./terraform_project --config path/to/config.yaml
+
+複数のTerraformルートを一括スキャン:
+    python -m src.cli scan 'repos/*/environments/*' --output-dir scan_reports --html
+
+問題点の多いレポートをページ送り・絞り込みのできるHTMLで出力:
+    python -m src.cli scan 'repos/*/environments/*' --html --html-mode paginated
+
+直近20コミットの可用性スコアと問題点の推移を表示:
+    python -m src.cli history ./terraform_project --revisions 20
 """
     console.print(Panel(examples, title="[bold]コマンドライン使用例[/bold]", border_style="cyan"))
 
@@ -94,8 +146,299 @@ app:
     console.print(Panel(config_help, title="[bold]設定ヘルプ[/bold]", border_style="green"))
 
 
+def apply_common_options(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    設定を読み込み、共通のコマンドラインオプションで上書きする
+
+    Args:
+        args: 解析済みのコマンドライン引数
+
+    Returns:
+        設定辞書
+    """
+    # 設定の初期化（configファイルのパスが指定されている場合は環境変数に設定）
+    if args.config:
+        os.environ["CONFIG_FILE"] = args.config
+
+    # 設定を読み込む
+    settings = get_settings()
+
+    # コマンドラインオプションで上書き
+    if args.debug:
+        settings["app"]["debug"] = True
+        os.environ["APP_DEBUG"] = "true"
+
+    if args.region:
+        settings["aws"]["region"] = args.region
+        os.environ["AWS_REGION"] = args.region
+
+    if args.model:
+        settings["aws"]["model_id"] = args.model
+        os.environ["AWS_MODEL_ID"] = args.model
+
+    if args.language:
+        settings["app"]["language"] = args.language
+        os.environ["APP_LANGUAGE"] = args.language
+
+    return settings
+
+
+def scan_main(argv: List[str]) -> None:
+    """
+    scanサブコマンドのメイン関数
+
+    Args:
+        argv: サブコマンド以降のコマンドライン引数
+    """
+    parser = argparse.ArgumentParser(
+        prog="terraform-availability scan",
+        description="複数のTerraformルートを1プロセスでまとめて解析・可用性評価",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "patterns", nargs="+", help="Terraformルートのglobパターン（例: 'repos/*/environments/*'）"
+    )
+    parser.add_argument("--output-dir", help="ルートごとのレポートを出力するディレクトリ")
+    parser.add_argument("--html", action="store_true", help="ルートごとにHTMLレポートも出力")
+    parser.add_argument(
+        "--html-mode",
+        choices=["auto", "table", "paginated"],
+        help="HTMLレポートの問題点の表示方式（paginated: ページ送り・絞り込みのできる一覧）",
+    )
+    parser.add_argument("--parse-workers", type=int, help="解析ステージの並列数")
+    parser.add_argument("--analysis-workers", type=int, help="分析ステージの並列数")
+    parser.add_argument("--queue-size", type=int, help="解析済みで分析待ちのルートの最大数")
+    parser.add_argument("--region", help="AWS リージョン")
+    parser.add_argument("--model", help="Bedrock モデルID")
+    parser.add_argument(
+        "--fast-model", help="小規模な入力の分析に使用する高速モデルのID（モデルの振り分けを有効化）"
+    )
+    parser.add_argument("--language", help="使用する言語（ja/en）", choices=["ja", "en"])
+    parser.add_argument(
+        "--skip-analysis", action="store_true", help="Bedrockによる分析をスキップし、解析のみを実行"
+    )
+    parser.add_argument(
+        "--cache-mode",
+        choices=["off", "read", "write", "readwrite"],
+        help="Bedrockレスポンスキャッシュのモード",
+    )
+    parser.add_argument(
+        "--no-parse-cache", action="store_true", help="Terraform解析結果のキャッシュを使用しない"
+    )
+    parser.add_argument(
+        "--no-stream", action="store_true", help="Bedrockのレスポンスをストリーミングで受信しない"
+    )
+    parser.add_argument(
+        "--rules-only", action="store_true", help="ルールのみで評価し、Bedrockを呼び出さない"
+    )
+    parser.add_argument(
+        "--rules-residual",
+        action="store_true",
+        help="すべてのルールで判定できたリソースを除いてBedrockに送信",
+    )
+    parser.add_argument(
+        "--module-analysis",
+        action="store_true",
+        help="モジュールごとに分析し、同じ内容のモジュールの分析結果を共有",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="前回の分析結果との差分ではなく、すべてのリソースを分析",
+    )
+    parser.add_argument("--debug", action="store_true", help="デバッグモードを有効化")
+    parser.add_argument("--config", help="設定ファイルのパス")
+
+    args = parser.parse_args(argv)
+    settings = apply_common_options(args)
+
+    console.print("\n[bold blue]AWS Terraform可用性チェックツール (一括スキャン)[/bold blue]")
+    console.rule()
+
+    roots = BatchScanner.expand_roots(args.patterns)
+    if not roots:
+        console.print("[bold red]エラー: 指定されたパターンに一致するディレクトリがありません。[/bold red]")
+        sys.exit(1)
+    console.print(f"対象ルート数: [bold]{len(roots)}[/bold]")
+
+    checker = None
+    if not args.skip_analysis:
+        checker = AvailabilityChecker(
+            model_id=args.model,
+            region_name=args.region,
+            language=args.language,
+            debug=args.debug if args.debug else None,
+            cache_mode=args.cache_mode,
+            stream=False if args.no_stream else None,
+            fast_model_id=args.fast_model,
+            rules_only=True if args.rules_only else None,
+            rules_residual=True if args.rules_residual else None,
+            module_analysis=True if args.module_analysis else None,
+            full=args.full,
+        )
+
+    output_dir = args.output_dir or os.path.join(settings["output"]["directory"], "scan")
+    scanner = BatchScanner(
+        checker=checker,
+        output_dir=output_dir,
+        parse_workers=args.parse_workers,
+        analysis_workers=args.analysis_workers,
+        queue_size=args.queue_size,
+        use_parse_cache=False if args.no_parse_cache else None,
+        html=args.html,
+        html_mode=args.html_mode,
+    )
+
+    start_time = time.time()
+    results = scanner.scan(roots)
+    total_time = time.time() - start_time
+
+    renderer = ConsoleRenderer()
+    renderer.print_scan_summary(results)
+    summary: Dict[str, Any] = {"roots": results, "total_time": total_time}
+    if checker is not None:
+        summary["bedrock"] = checker.bedrock_client.get_retry_stats()
+        renderer.print_retry_stats(summary["bedrock"])
+        module_stats = checker.get_module_cache_stats()
+        if module_stats is not None:
+            summary["modules"] = module_stats
+            console.print(
+                f"モジュール単位の分析: キャッシュ ヒット {module_stats['hits']} / "
+                f"ミス {module_stats['misses']}"
+            )
+
+    summary_path = os.path.abspath(os.path.join(output_dir, "scan_summary.json"))
+    summary_file = ReportGenerator(output_dir=output_dir).save_json_report(
+        summary, summary_path
+    )
+    console.print(f"\nスキャン結果のサマリーを保存しました: [bold]{summary_file}[/bold]")
+    console.print(f"\n総実行時間: [bold green]{total_time:.1f}秒[/bold green]")
+
+    if any(result["status"] not in ("ok", "parsed") for result in results):
+        sys.exit(1)
+
+
+def history_main(argv: List[str]) -> None:
+    """
+    historyサブコマンドのメイン関数
+
+    Args:
+        argv: サブコマンド以降のコマンドライン引数
+    """
+    parser = argparse.ArgumentParser(
+        prog="terraform-availability history",
+        description="直近のリビジョンごとに可用性を評価し、スコアと問題点の推移を表示",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("terraform_dir", help="Terraformプロジェクトのディレクトリパス（gitリポジトリ内）")
+    parser.add_argument("--revisions", type=int, help="対象とする直近のリビジョンの数")
+    parser.add_argument("--ref", default="HEAD", help="起点のリビジョン（デフォルト: HEAD）")
+    parser.add_argument("--output-dir", help="リビジョンごとのレポートを出力するディレクトリ")
+    parser.add_argument("--worktree-dir", help="チェックアウトに使用する作業ツリーのディレクトリ")
+    parser.add_argument("--region", help="AWS リージョン")
+    parser.add_argument("--model", help="Bedrock モデルID")
+    parser.add_argument("--language", help="使用する言語（ja/en）", choices=["ja", "en"])
+    parser.add_argument(
+        "--skip-analysis", action="store_true", help="Bedrockによる分析をスキップし、解析のみを実行"
+    )
+    parser.add_argument(
+        "--cache-mode",
+        choices=["off", "read", "write", "readwrite"],
+        help="Bedrockレスポンスキャッシュのモード",
+    )
+    parser.add_argument(
+        "--no-parse-cache", action="store_true", help="Terraform解析結果のキャッシュを使用しない"
+    )
+    parser.add_argument(
+        "--no-stream", action="store_true", help="Bedrockのレスポンスをストリーミングで受信しない"
+    )
+    parser.add_argument(
+        "--rules-only", action="store_true", help="ルールのみで評価し、Bedrockを呼び出さない"
+    )
+    parser.add_argument(
+        "--rules-residual",
+        action="store_true",
+        help="すべてのルールで判定できたリソースを除いてBedrockに送信",
+    )
+    parser.add_argument(
+        "--parallel-parse",
+        action="store_true",
+        help="モジュール・環境のルートごとにTerraformコードを並列解析",
+    )
+    parser.add_argument(
+        "--parse-workers", type=int, help="並列解析のワーカー数（デフォルト: CPUコア数）"
+    )
+    parser.add_argument("--debug", action="store_true", help="デバッグモードを有効化")
+    parser.add_argument("--config", help="設定ファイルのパス")
+
+    args = parser.parse_args(argv)
+    settings = apply_common_options(args)
+
+    console.print("\n[bold blue]AWS Terraform可用性チェックツール (リビジョンごとの評価)[/bold blue]")
+    console.rule()
+
+    checker = None
+    if not args.skip_analysis:
+        checker = AvailabilityChecker(
+            model_id=args.model,
+            region_name=args.region,
+            language=args.language,
+            debug=args.debug if args.debug else None,
+            cache_mode=args.cache_mode,
+            stream=False if args.no_stream else None,
+            rules_only=True if args.rules_only else None,
+            rules_residual=True if args.rules_residual else None,
+        )
+
+    output_dir = args.output_dir or os.path.join(settings["output"]["directory"], "history")
+    analyzer = HistoryAnalyzer(
+        checker=checker,
+        output_dir=output_dir,
+        worktree_dir=args.worktree_dir,
+        use_parse_cache=False if args.no_parse_cache else None,
+        parallel=True if args.parallel_parse else None,
+        workers=args.parse_workers,
+    )
+
+    start_time = time.time()
+    timeline = analyzer.analyze(args.terraform_dir, ref=args.ref, count=args.revisions)
+    total_time = time.time() - start_time
+    if timeline is None:
+        console.print("[bold red]エラー: リビジョンの一覧を取得できませんでした。[/bold red]")
+        sys.exit(1)
+
+    ConsoleRenderer().print_history_timeline(timeline)
+    summary: Dict[str, Any] = {
+        "terraform_dir": args.terraform_dir,
+        "ref": args.ref,
+        "revisions": timeline,
+        "analyzed_revisions": sum(1 for entry in timeline if not entry.get("reused_from")),
+        "total_time": total_time,
+    }
+    if checker is not None:
+        summary["bedrock"] = checker.bedrock_client.get_retry_stats()
+
+    summary_path = os.path.abspath(os.path.join(output_dir, "history.json"))
+    summary_file = ReportGenerator(output_dir=output_dir).save_json_report(
+        summary, summary_path
+    )
+    console.print(
+        f"\n解析・分析したリビジョン: [bold]{summary['analyzed_revisions']}[/bold]/{len(timeline)}"
+    )
+    console.print(f"リビジョンごとの評価を保存しました: [bold]{summary_file}[/bold]")
+    console.print(f"\n総実行時間: [bold green]{total_time:.1f}秒[/bold green]")
+
+
 def main() -> None:
     """メイン関数"""
+    # サブコマンドの処理
+    if len(sys.argv) > 1 and sys.argv[1] == "scan":
+        scan_main(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "history":
+        history_main(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(
         description="AWSリソースの可用性チェックツール (Terraform解析 + Bedrockによる可用性評価)",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -107,12 +450,67 @@ def main() -> None:
     parser.add_argument("--json-output", help="Terraform解析結果を保存するJSONファイルパス")
     parser.add_argument("--report-output", help="可用性評価レポートを保存するJSONファイルパス")
     parser.add_argument("--html", help="可用性評価結果をHTMLファイルとして出力するパス")
+    parser.add_argument(
+        "--html-mode",
+        choices=["auto", "table", "paginated"],
+        help="HTMLレポートの問題点の表示方式（paginated: ページ送り・絞り込みのできる一覧）",
+    )
     parser.add_argument("--region", help="AWS リージョン")
     parser.add_argument("--model", help="Bedrock モデルID")
+    parser.add_argument(
+        "--fast-model", help="小規模な入力の分析に使用する高速モデルのID（モデルの振り分けを有効化）"
+    )
     parser.add_argument("--language", help="使用する言語（ja/en）", choices=["ja", "en"])
     parser.add_argument(
         "--skip-analysis", action="store_true", help="Bedrockによる分析をスキップし、JSONエクスポートのみを実行"
     )
+    parser.add_argument(
+        "--no-parse-cache", action="store_true", help="Terraform解析結果のキャッシュを使用しない"
+    )
+    parser.add_argument(
+        "--no-stream", action="store_true", help="Bedrockのレスポンスをストリーミングで受信しない"
+    )
+    parser.add_argument(
+        "--rules-only", action="store_true", help="ルールのみで評価し、Bedrockを呼び出さない"
+    )
+    parser.add_argument(
+        "--rules-residual",
+        action="store_true",
+        help="すべてのルールで判定できたリソースを除いてBedrockに送信",
+    )
+    parser.add_argument(
+        "--module-analysis",
+        action="store_true",
+        help="モジュールごとに分析し、同じ内容のモジュールの分析結果を共有",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="前回の分析結果との差分ではなく、すべてのリソースを分析",
+    )
+    parser.add_argument(
+        "--changed-since",
+        metavar="GIT_REF",
+        help="指定したリビジョンから変更されたファイルを含むルートとリソースのみを解析・分析",
+    )
+    parser.add_argument(
+        "--cache-mode",
+        choices=["off", "read", "write", "readwrite"],
+        help="Bedrockレスポンスキャッシュのモード",
+    )
+    parser.add_argument(
+        "--chunked",
+        choices=["auto", "on", "off"],
+        help="リソースをグループに分割して並列分析（auto: プロンプトが大きい場合のみ）",
+    )
+    parser.add_argument(
+        "--parallel-parse",
+        action="store_true",
+        help="モジュール・環境のルートごとにTerraformコードを並列解析",
+    )
+    parser.add_argument(
+        "--parse-workers", type=int, help="並列解析のワーカー数（デフォルト: CPUコア数）"
+    )
     parser.add_argument("--debug", action="store_true", help="デバッグモードを有効化")
     parser.add_argument("--example", action="store_true", help="使用例を表示")
     parser.add_argument("--config", help="設定ファイルのパス")
@@ -137,29 +535,8 @@ def main() -> None:
         print_config_help()
         return
 
-    # 設定の初期化（configファイルのパスが指定されている場合は環境変数に設定）
-    if args.config:
-        os.environ["CONFIG_FILE"] = args.config
-
-    # 設定を読み込む
-    settings = get_settings()
-
-    # コマンドラインオプションで上書き
-    if args.debug:
-        settings["app"]["debug"] = True
-        os.environ["APP_DEBUG"] = "true"
-
-    if args.region:
-        settings["aws"]["region"] = args.region
-        os.environ["AWS_REGION"] = args.region
-
-    if args.model:
-        settings["aws"]["model_id"] = args.model
-        os.environ["AWS_MODEL_ID"] = args.model
-
-    if args.language:
-        settings["app"]["language"] = args.language
-        os.environ["APP_LANGUAGE"] = args.language
+    # 設定の読み込みとコマンドラインオプションによる上書き
+    apply_common_options(args)
 
     # terraform_dirが指定されていない場合はヘルプを表示
     if args.terraform_dir is None:
@@ -177,11 +554,39 @@ def main() -> None:
     console.print(f"Terraformプロジェクトのパス: [bold]{args.terraform_dir}[/bold]")
 
     # Terraformエクスポーターの初期化
-    terraform_exporter = TerraformExporter()
+    terraform_exporter = TerraformExporter(
+        use_parse_cache=False if args.no_parse_cache else None,
+        parallel=True if args.parallel_parse else None,
+        workers=args.parse_workers,
+    )
+
+    # 指定したリビジョンから変更されたファイルを含むルートのみを解析
+    roots = None
+    affected = None
+    if args.changed_since:
+        changed_files = changed_terraform_files(args.terraform_dir, args.changed_since)
+        if changed_files is None:
+            console.print("[bold red]エラー: gitの変更ファイルを取得できませんでした。終了します。[/bold red]")
+            sys.exit(1)
+        candidates = (
+            find_terraform_roots(args.terraform_dir)
+            if terraform_exporter.parallel_parser is not None
+            else [os.path.realpath(args.terraform_dir)]
+        )
+        affected = affected_roots(candidates, changed_files)
+        console.print(
+            f"{args.changed_since} からの変更: Terraformファイル {len(changed_files)}件, "
+            f"対象のルート {len(affected)}/{len(candidates)}個"
+        )
+        if not affected:
+            console.print("変更されたファイルを含むルートがないため、解析と分析をスキップします。")
+            return
+        if terraform_exporter.parallel_parser is not None:
+            roots = list(affected)
 
     start_time = time.time()
     terraform_data, json_file = terraform_exporter.export_to_json(
-        args.terraform_dir, args.json_output
+        args.terraform_dir, args.json_output, roots
     )
 
     if terraform_data is None:
@@ -189,7 +594,14 @@ def main() -> None:
         sys.exit(1)
 
     export_time = time.time() - start_time
-    console.print(f"解析完了: [bold green]{export_time:.1f}秒[/bold green]")
+    cache_stats = terraform_exporter.get_cache_stats()
+    if cache_stats is not None:
+        console.print(
+            f"解析完了: [bold green]{export_time:.1f}秒[/bold green] "
+            f"(キャッシュ ヒット: {cache_stats['hits']} / ミス: {cache_stats['misses']})"
+        )
+    else:
+        console.print(f"解析完了: [bold green]{export_time:.1f}秒[/bold green]")
 
     # Bedrockによる分析をスキップする場合はここで終了
     if args.skip_analysis:
@@ -199,6 +611,14 @@ def main() -> None:
         console.print(f"JSONファイルを確認してください: [bold]{json_file}[/bold]")
         sys.exit(0)
 
+    # 変更されたファイルで定義されたリソースのみを分析
+    focus = None
+    if affected is not None:
+        focus = changed_resource_addresses(terraform_data, args.terraform_dir, affected)
+        if not focus:
+            console.print("変更されたファイルで定義されたリソースがないため、分析をスキップします。")
+            return
+
     # ステップ2: Bedrockによる可用性分析
     console.print("\n[bold]ステップ2: Bedrockによる可用性分析[/bold]")
 
@@ -208,14 +628,26 @@ def main() -> None:
         region_name=args.region,
         language=args.language,
         debug=args.debug if args.debug else None,
+        chunked=args.chunked,
+        cache_mode=args.cache_mode,
+        stream=False if args.no_stream else None,
+        fast_model_id=args.fast_model,
+        rules_only=True if args.rules_only else None,
+        rules_residual=True if args.rules_residual else None,
+        module_analysis=True if args.module_analysis else None,
+        full=args.full,
     )
 
     # 分析実行
     analysis_start_time = time.time()
-    analysis_results = checker.analyze_with_bedrock(terraform_data)
+    analysis_results = checker.analyze_with_bedrock(
+        terraform_data, root=args.terraform_dir, focus=focus
+    )
     analysis_time = time.time() - analysis_start_time
 
     console.print(f"分析完了: [bold green]{analysis_time:.1f}秒[/bold green]")
+    if not checker.rules_only:
+        checker.print_retry_stats()
 
     # 結果表示
     checker.print_analysis_results(analysis_results)
@@ -227,7 +659,7 @@ def main() -> None:
 
     # HTML形式で出力
     if args.html:
-        html_file = checker.export_as_html(analysis_results, args.html)
+        html_file = checker.export_as_html(analysis_results, args.html, args.html_mode)
         console.print(f"\n可用性評価レポートをHTMLファイルに保存しました: [bold]{html_file}[/bold]")
 
     # 総実行時間
@@ -2,14 +2,30 @@
 AWS Bedrock APIとのインタラクションを担当するモジュール
 """
 
+import asyncio
+import functools
 import json
 import os
+import threading
 import time
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
 import boto3
+from botocore.config import Config
 from rich.console import Console
 
+from src.analysis.token_estimator import estimate_tokens, model_output_limit
+from src.client.rate_limiter import get_shared_rate_limiter
+from src.client.response_cache import ResponseCache
+from src.client.throttling import (
+    BedrockStreamError,
+    get_shared_limiter,
+    get_shared_retry_budget,
+    is_retryable,
+    is_throttling,
+    is_timeout,
+)
 from src.config import get_settings
 
 # Richコンソールを初期化
@@ -26,6 +42,8 @@ class BedrockClient:
         bedrock_client: Any = None,
         model_id: Optional[str] = None,
         region_name: Optional[str] = None,
+        cache_mode: Optional[str] = None,
+        read_timeout: Optional[int] = None,
     ) -> None:
         """
         BedrockClientの初期化
@@ -34,28 +52,102 @@ class BedrockClient:
             bedrock_client: 既存のboto3 Bedrock clientインスタンス（指定がなければ新規作成）
             model_id: 使用するBedrockモデルID（Noneの場合は設定から取得）
             region_name: AWSリージョン名（Noneの場合は設定から取得）
+            cache_mode: レスポンスキャッシュのモード（off/read/write/readwrite）
+                （Noneの場合は設定から取得）
+            read_timeout: 読み込みタイムアウト（秒）（Noneの場合は設定から取得）
         """
         settings = get_settings()
         self.region_name = region_name or settings["aws"]["region"]
-        self.bedrock_client = bedrock_client or boto3.client(
-            service_name="bedrock-runtime", region_name=self.region_name
+        client_settings = dict(settings["aws"]["client"])
+        if read_timeout:
+            client_settings["read_timeout"] = read_timeout
+        self.bedrock_client = bedrock_client or self._create_boto3_client(
+            self.region_name, client_settings
         )
         self.model_id = model_id or settings["aws"]["model_id"]
+        self.max_output_tokens = model_output_limit(
+            self.model_id, settings["analysis"]["output_tokens"]
+        )
+        self.response_cache = ResponseCache(mode=cache_mode)
+        self.streaming = settings["aws"]["streaming"]
+        self.max_continuations = settings["aws"]["max_continuations"]
+        self.retry_budget = get_shared_retry_budget()
+        self.limiter = get_shared_limiter()
+        self.rate_limiter = get_shared_rate_limiter(self.region_name, self.model_id)
+        self.max_workers = client_settings["max_workers"]
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    @staticmethod
+    def _create_boto3_client(region_name: str, client_settings: Dict[str, Any]) -> Any:
+        """
+        接続プールとタイムアウトを設定したbedrock-runtimeクライアントを作成
+
+        Args:
+            region_name: AWSリージョン名
+            client_settings: クライアント設定（aws.client）
+
+        Returns:
+            boto3のbedrock-runtimeクライアント
+        """
+        config = Config(
+            max_pool_connections=client_settings["max_pool_connections"],
+            connect_timeout=client_settings["connect_timeout"],
+            read_timeout=client_settings["read_timeout"],
+            tcp_keepalive=client_settings["tcp_keepalive"],
+            # 再試行はこのクラスで制御するため、botocoreによる再試行は無効にする
+            retries={"total_max_attempts": 1, "mode": "standard"},
+        )
+        return boto3.client(service_name="bedrock-runtime", region_name=region_name, config=config)
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """並列呼び出しに使用するスレッドプール（初回使用時に作成）"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="bedrock"
+                )
+            return self._executor
+
+    def close(self) -> None:
+        """
+        並列呼び出しに使用するスレッドプールを終了する
+        """
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
 
     def invoke(
-        self, prompt: str, max_tokens: int = 4096, temperature: float = 0.2
+        self,
+        prompt: str,
+        max_tokens: int = 4096,
+        temperature: float = 0.2,
+        stream: Optional[bool] = None,
+        on_delta: Optional[Callable[[str], None]] = None,
+        max_continuations: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Bedrockモデルを呼び出す
 
+        レスポンスが最大トークン数に達して途中で終わった場合は、それまでの出力を
+        アシスタントの応答の先頭として渡して続きを生成させ、結合したテキストを返す。
+
         Args:
             prompt: Bedrockモデルに送信するプロンプト
-            max_tokens: 生成するトークンの最大数
+            max_tokens: 1回の呼び出しで生成するトークンの最大数
             temperature: 生成テキストのランダム性（0.0-1.0）
+            stream: ストリーミングでレスポンスを受信するかどうか（Noneの場合は設定から取得）
+            on_delta: ストリーミング時にテキストの差分を受け取るコールバック
+            max_continuations: 続きを要求する最大回数（Noneの場合は設定から取得）
 
         Returns:
-            モデルからのレスポンス
+            モデルからのレスポンス（キャッシュのキーをcache_keyに含む）
         """
+        # モデルの上限を超える値はBedrockに拒否されるため上限に収める
+        max_tokens = min(max_tokens, self.max_output_tokens)
+
         # Bedrockリクエストの作成
         request_body = {
             "anthropic_version": "bedrock-2023-05-31",
@@ -66,21 +158,418 @@ class BedrockClient:
 
         start_time = time.time()
 
-        try:
-            # Bedrockへリクエスト送信
-            response = self.bedrock_client.invoke_model(
-                modelId=self.model_id, body=json.dumps(request_body)
+        # キャッシュの確認
+        cache_key = ResponseCache.make_key(self.model_id, prompt, temperature, max_tokens)
+        cached = self.response_cache.get(cache_key)
+        if cached is not None and "text" in cached:
+            elapsed_time = time.time() - start_time
+            console.print(
+                f"Bedrock呼び出し完了: [bold green]{elapsed_time:.1f}秒[/bold green] (キャッシュヒット)"
             )
+            return {
+                "text": cached["text"],
+                "elapsed_time": elapsed_time,
+                "stop_reason": cached["stop_reason"],
+                "cached": True,
+                "cache_key": cache_key,
+            }
 
-            # レスポンスのデコード
-            response_body = json.loads(response.get("body").read().decode("utf-8"))
-            analysis_text = response_body.get("content", [{}])[0].get("text", "")
+        use_stream = self.streaming if stream is None else stream
+        if max_continuations is None:
+            max_continuations = self.max_continuations
 
-            elapsed_time = time.time() - start_time
-            console.print(f"Bedrock呼び出し完了: [bold green]{elapsed_time:.1f}秒[/bold green]")
+        try:
+            response = self._invoke_with_retry(request_body, start_time, use_stream, on_delta)
+
+            # 最大トークン数に達した場合は続きを要求する
+            continuations = 0
+            while response["stop_reason"] == "max_tokens" and continuations < max_continuations:
+                continuations += 1
+                console.print(
+                    f"[bold yellow]レスポンスが最大トークン数に達したため、続きを要求します"
+                    f"（{continuations}/{max_continuations}回目）[/bold yellow]"
+                )
+                # アシスタントの応答の先頭は末尾に空白を含めることができない
+                partial_text = response["text"].rstrip()
+                request_body["messages"] = [
+                    {"role": "user", "content": prompt},
+                    {"role": "assistant", "content": partial_text},
+                ]
+                continuation = self._invoke_with_retry(
+                    request_body, time.time(), use_stream, on_delta
+                )
+                response = self._merge_continuation(response, partial_text, continuation)
+            response["metrics"]["total_latency"] = time.time() - start_time
 
-            return {"text": analysis_text, "elapsed_time": elapsed_time}
+            metrics = response["metrics"]
+            if metrics.get("time_to_first_token") is not None:
+                console.print(
+                    f"Bedrock呼び出し完了: [bold green]{metrics['total_latency']:.1f}秒[/bold green] "
+                    f"(最初のトークンまで: {metrics['time_to_first_token']:.1f}秒, "
+                    f"{metrics['tokens_per_second']:.1f}トークン/秒)"
+                )
+            else:
+                console.print(
+                    f"Bedrock呼び出し完了: [bold green]{metrics['total_latency']:.1f}秒[/bold green]"
+                )
+
+            # 続きの要求回数の上限に達して途切れたレスポンスは保存されない
+            self.response_cache.put(
+                cache_key, {"text": response["text"], "stop_reason": response["stop_reason"]}
+            )
+
+            return {
+                "text": response["text"],
+                "elapsed_time": metrics["total_latency"],
+                "stop_reason": response["stop_reason"],
+                "continuations": continuations,
+                "metrics": metrics,
+                "cache_key": cache_key,
+            }
 
         except Exception as e:
             console.print(f"[bold red]エラー: Bedrockの呼び出しに失敗しました: {e}[/bold red]")
-            return {"error": str(e)}
+            return {"error": str(e), "timeout": is_timeout(e)}
+
+    def discard_cached(self, response: Dict[str, Any]) -> None:
+        """
+        レスポンスをキャッシュから削除する
+
+        解析・検証に失敗したレスポンスを、次回の同じ呼び出しで再利用しないために使用する。
+
+        Args:
+            response: invokeの戻り値
+        """
+        if response.get("cache_key"):
+            self.response_cache.delete(response["cache_key"])
+
+    @staticmethod
+    def _merge_continuation(
+        response: Dict[str, Any], partial_text: str, continuation: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        続きの生成結果をそれまでのレスポンスに結合する
+
+        Args:
+            response: それまでのレスポンス
+            partial_text: 続きの生成に渡したそれまでの出力
+            continuation: 続きの生成結果
+
+        Returns:
+            結合したレスポンス（メトリクスは最初の呼び出しの値をもとに更新）
+        """
+        metrics = dict(response["metrics"])
+        metrics["output_tokens"] += continuation["metrics"]["output_tokens"]
+        generation_time = (
+            metrics["total_latency"]
+            - (metrics["time_to_first_token"] or 0.0)
+            + continuation["metrics"]["total_latency"]
+        )
+        if generation_time > 0:
+            metrics["tokens_per_second"] = metrics["output_tokens"] / generation_time
+        metrics["total_latency"] += continuation["metrics"]["total_latency"]
+        return {
+            "text": partial_text + continuation["text"],
+            "stop_reason": continuation["stop_reason"],
+            "metrics": metrics,
+        }
+
+    def invoke_many(
+        self,
+        prompts: List[str],
+        max_tokens: int = 4096,
+        temperature: float = 0.2,
+        stream: Optional[bool] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        複数のプロンプトを並列にBedrockモデルへ送信する
+
+        呼び出しはクライアントが保持するスレッドプールで実行され、
+        同じ接続プールを共有する。
+
+        Args:
+            prompts: Bedrockモデルに送信するプロンプトのリスト
+            max_tokens: 生成するトークンの最大数
+            temperature: 生成テキストのランダム性（0.0-1.0）
+            stream: ストリーミングでレスポンスを受信するかどうか（Noneの場合は設定から取得）
+            max_concurrency: この呼び出しで同時に実行する最大数（Noneの場合はスレッドプールの上限）
+
+        Returns:
+            プロンプトと同じ順序のレスポンスのリスト
+        """
+        semaphore = threading.Semaphore(max_concurrency) if max_concurrency else None
+
+        def run(prompt: str) -> Dict[str, Any]:
+            if semaphore is None:
+                return self.invoke(prompt, max_tokens, temperature, stream=stream)
+            with semaphore:
+                return self.invoke(prompt, max_tokens, temperature, stream=stream)
+
+        futures = [self.executor.submit(run, prompt) for prompt in prompts]
+        return [future.result() for future in futures]
+
+    async def invoke_async(
+        self,
+        prompt: str,
+        max_tokens: int = 4096,
+        temperature: float = 0.2,
+        stream: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        """
+        asyncioのイベントループからBedrockモデルを呼び出す
+
+        呼び出し自体はクライアントが保持するスレッドプールで実行する。
+
+        Args:
+            prompt: Bedrockモデルに送信するプロンプト
+            max_tokens: 生成するトークンの最大数
+            temperature: 生成テキストのランダム性（0.0-1.0）
+            stream: ストリーミングでレスポンスを受信するかどうか（Noneの場合は設定から取得）
+
+        Returns:
+            モデルからのレスポンス
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            functools.partial(self.invoke, prompt, max_tokens, temperature, stream=stream),
+        )
+
+    def _invoke_with_retry(
+        self,
+        request_body: Dict[str, Any],
+        start_time: float,
+        use_stream: bool,
+        on_delta: Optional[Callable[[str], None]],
+    ) -> Dict[str, Any]:
+        """
+        スロットリングや一時的な障害の場合は指数バックオフで再試行しながらBedrockを呼び出す
+
+        同時実行数はプロセス内で共有するAdaptiveConcurrencyLimiterで制御する。
+        レート制限が設定されている場合は、呼び出しの前に入力トークン数と最大出力トークン数を
+        確保し（上限に達している場合は待機）、使用しなかった出力トークン数を後で返却する。
+        ストリーミングでテキストを受信し始めた後に失敗した場合は再試行しない。
+
+        Args:
+            request_body: リクエストボディ
+            start_time: 呼び出し開始時刻
+            use_stream: ストリーミングで受信するかどうか
+            on_delta: ストリーミング時にテキストの差分を受け取るコールバック
+
+        Returns:
+            テキストとメトリクスを含む辞書
+        """
+        max_output_tokens = int(request_body["max_tokens"])
+        input_tokens = sum(
+            estimate_tokens(message["content"]) for message in request_body["messages"]
+        )
+
+        attempt = 0
+        while True:
+            attempt += 1
+            received: List[str] = []
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(input_tokens + max_output_tokens)
+
+            def collect(delta: str) -> None:
+                received.append(delta)
+                if on_delta is not None:
+                    on_delta(delta)
+
+            try:
+                with self.limiter.slot():
+                    response = self._invoke_once(request_body, start_time, use_stream, collect)
+                if self.rate_limiter is not None:
+                    output_tokens = int(response["metrics"]["output_tokens"])
+                    self.rate_limiter.refund(max_output_tokens - output_tokens)
+                return response
+            except Exception as e:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.refund(max_output_tokens)
+                if received or not is_retryable(e):
+                    raise
+                if not self.retry_budget.try_acquire(attempt, is_throttling(e)):
+                    raise
+                delay = self.retry_budget.backoff(attempt)
+                console.print(
+                    f"[bold yellow]警告: Bedrockの呼び出しに失敗しました（{e}）。"
+                    f"{delay:.1f}秒後に再試行します（{attempt}/"
+                    f"{self.retry_budget.max_attempts - 1}回目）[/bold yellow]"
+                )
+                time.sleep(delay)
+
+    def _invoke_once(
+        self,
+        request_body: Dict[str, Any],
+        start_time: float,
+        use_stream: bool,
+        on_delta: Callable[[str], None],
+    ) -> Dict[str, Any]:
+        """
+        Bedrockを1回呼び出す
+
+        ストリーミングの呼び出しが再試行できないエラーで受信開始前に失敗した場合は、
+        非ストリーミングで呼び出す。
+
+        Args:
+            request_body: リクエストボディ
+            start_time: 呼び出し開始時刻
+            use_stream: ストリーミングで受信するかどうか
+            on_delta: ストリーミング時にテキストの差分を受け取るコールバック
+
+        Returns:
+            テキストとメトリクスを含む辞書
+        """
+        if not use_stream:
+            return self._invoke_blocking(request_body, start_time)
+
+        received = False
+
+        def collect(delta: str) -> None:
+            nonlocal received
+            received = True
+            on_delta(delta)
+
+        try:
+            return self._invoke_streaming(request_body, start_time, collect)
+        except Exception as e:
+            # 受信開始前に失敗した場合は非ストリーミングで再実行する
+            if received or is_retryable(e):
+                raise
+            console.print(
+                f"[bold yellow]警告: ストリーミング呼び出しに失敗したため、"
+                f"通常の呼び出しで再試行します: {e}[/bold yellow]"
+            )
+        return self._invoke_blocking(request_body, start_time)
+
+    def get_retry_stats(self) -> Dict[str, Any]:
+        """
+        プロセス全体の再試行と同時実行数の統計を取得
+
+        Returns:
+            再試行回数・スロットリング回数・残りの再試行回数・同時実行数の上限・
+            レート制限による待機時間など
+        """
+        stats: Dict[str, Any] = self.retry_budget.get_stats()
+        stats.update(self.limiter.get_stats())
+        if self.rate_limiter is not None:
+            stats.update(self.rate_limiter.get_stats())
+        return stats
+
+    def _invoke_blocking(self, request_body: Dict[str, Any], start_time: float) -> Dict[str, Any]:
+        """
+        invoke_modelでBedrockを呼び出し、レスポンス全体を受信する
+
+        Args:
+            request_body: リクエストボディ
+            start_time: 呼び出し開始時刻
+
+        Returns:
+            テキストとメトリクスを含む辞書
+        """
+        # Bedrockへリクエスト送信
+        response = self.bedrock_client.invoke_model(
+            modelId=self.model_id, body=json.dumps(request_body)
+        )
+
+        # レスポンスのデコード
+        response_body = json.loads(response.get("body").read().decode("utf-8"))
+        analysis_text = response_body.get("content", [{}])[0].get("text", "")
+
+        total_latency = time.time() - start_time
+        output_tokens = response_body.get("usage", {}).get("output_tokens") or estimate_tokens(
+            analysis_text
+        )
+        return {
+            "text": analysis_text,
+            "stop_reason": response_body.get("stop_reason"),
+            "metrics": {
+                "time_to_first_token": None,
+                "tokens_per_second": output_tokens / total_latency if total_latency > 0 else 0.0,
+                "total_latency": total_latency,
+                "output_tokens": output_tokens,
+                "streaming": False,
+            },
+        }
+
+    def _invoke_streaming(
+        self,
+        request_body: Dict[str, Any],
+        start_time: float,
+        on_delta: Callable[[str], None],
+    ) -> Dict[str, Any]:
+        """
+        invoke_model_with_response_streamでBedrockを呼び出し、差分を受信しながら結合する
+
+        Args:
+            request_body: リクエストボディ
+            start_time: 呼び出し開始時刻
+            on_delta: テキストの差分を受け取るコールバック
+
+        Returns:
+            テキストとメトリクスを含む辞書
+        """
+        response = self.bedrock_client.invoke_model_with_response_stream(
+            modelId=self.model_id, body=json.dumps(request_body)
+        )
+
+        parts: List[str] = []
+        first_token_time: Optional[float] = None
+        output_tokens: Optional[int] = None
+        stop_reason: Optional[str] = None
+
+        for event in self._iter_stream_events(response):
+            event_type = event.get("type")
+            if event_type == "content_block_delta":
+                text = event.get("delta", {}).get("text", "")
+                if not text:
+                    continue
+                if first_token_time is None:
+                    first_token_time = time.time()
+                parts.append(text)
+                on_delta(text)
+            elif event_type == "message_delta":
+                output_tokens = event.get("usage", {}).get("output_tokens", output_tokens)
+                stop_reason = event.get("delta", {}).get("stop_reason", stop_reason)
+
+        end_time = time.time()
+        analysis_text = "".join(parts)
+        if output_tokens is None:
+            output_tokens = estimate_tokens(analysis_text)
+
+        time_to_first_token = (first_token_time or end_time) - start_time
+        generation_time = end_time - (first_token_time or end_time)
+        tokens_per_second = output_tokens / generation_time if generation_time > 0 else 0.0
+        return {
+            "text": analysis_text,
+            "stop_reason": stop_reason,
+            "metrics": {
+                "time_to_first_token": time_to_first_token,
+                "tokens_per_second": tokens_per_second,
+                "total_latency": end_time - start_time,
+                "output_tokens": output_tokens,
+                "streaming": True,
+            },
+        }
+
+    @staticmethod
+    def _iter_stream_events(response: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        ストリーミングレスポンスのイベントをデコードして順に返す
+
+        Args:
+            response: invoke_model_with_response_streamのレスポンス
+
+        Yields:
+            デコードされたイベント
+        """
+        for event in response.get("body", []):
+            chunk = event.get("chunk")
+            if chunk is None:
+                # ストリーム中のエラー（throttlingExceptionなど）
+                for key, value in event.items():
+                    message = value.get("message", "") if isinstance(value, dict) else value
+                    raise BedrockStreamError(key[:1].upper() + key[1:], str(message))
+                continue
+            yield json.loads(chunk["bytes"].decode("utf-8"))
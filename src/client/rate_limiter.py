@@ -0,0 +1,188 @@
+"""
+複数のプロセスで共有するBedrockのレート制限（トークンバケット方式）を行うモジュール
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from src.config import get_settings
+
+try:
+    import fcntl
+except ImportError:  # Windowsではプロセス内のみで制限する
+    fcntl = None  # type: ignore
+
+# 待機中に状態ファイルを再確認する最大間隔（秒）
+MAX_POLL_INTERVAL = 1.0
+
+
+class TokenBucketRateLimiter:
+    """
+    1分あたりのリクエスト数とトークン数をトークンバケット方式で制限するクラス
+
+    バケットの状態はロックしたファイルに保存するため、同じホストで実行される
+    複数のプロセスで上限を共有できる。上限に達した場合は失敗せずに待機する。
+    """
+
+    def __init__(
+        self,
+        state_file: str,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        scope: str = "",
+    ) -> None:
+        """
+        TokenBucketRateLimiterの初期化
+
+        Args:
+            state_file: バケットの状態を保存するファイルのパス
+            requests_per_minute: 1分あたりの最大リクエスト数（0の場合は制限しない）
+            tokens_per_minute: 1分あたりの最大トークン数（0の場合は制限しない）
+            scope: 上限を共有する範囲の名前（リージョンとモデルIDなど）
+        """
+        self.state_file = os.path.expanduser(state_file)
+        self.scope = scope
+        self.capacities = {"requests": requests_per_minute, "tokens": tokens_per_minute}
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_file)), exist_ok=True)
+
+    def acquire(self, tokens: int) -> float:
+        """
+        リクエスト1回分とトークンを確保する（上限に達している場合は空くまで待機）
+
+        Args:
+            tokens: 確保するトークン数（入力トークン数と最大出力トークン数の合計）
+
+        Returns:
+            待機した時間（秒）
+        """
+        request = {"requests": 1.0, "tokens": float(tokens)}
+        waited = 0.0
+        while True:
+            wait = self._update(request)
+            if wait <= 0:
+                break
+            delay = min(wait, MAX_POLL_INTERVAL)
+            time.sleep(delay)
+            waited += delay
+
+        if waited > 0:
+            with self.lock:
+                self.waits += 1
+                self.wait_seconds += waited
+        return waited
+
+    def refund(self, tokens: int) -> None:
+        """
+        確保したものの使用しなかったトークンを返却する
+
+        Args:
+            tokens: 返却するトークン数
+        """
+        if tokens > 0:
+            self._update({"tokens": -float(tokens)})
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        レート制限による待機の統計を取得
+
+        Returns:
+            待機回数と合計待機時間（秒）
+        """
+        with self.lock:
+            return {"rate_limit_waits": self.waits, "rate_limit_wait_seconds": self.wait_seconds}
+
+    def _update(self, amounts: Dict[str, float]) -> float:
+        """
+        状態ファイルをロックしてバケットを補充し、可能であれば指定量を消費する
+
+        Args:
+            amounts: バケットごとの消費量（負の値は返却）
+
+        Returns:
+            消費できなかった場合に必要な待機時間（秒）。消費できた場合は0
+        """
+        with self.lock, open(self.state_file, "a+", encoding="utf-8") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    state = json.loads(f.read() or "{}")
+                except ValueError:
+                    state = {}
+
+                now = time.time()
+                levels: Dict[str, float] = {}
+                wait = 0.0
+                for name, capacity in self.capacities.items():
+                    if capacity <= 0:
+                        continue
+                    bucket = state.get(f"{self.scope}/{name}") or {}
+                    elapsed = max(now - float(bucket.get("updated", now)), 0.0)
+                    level = float(bucket.get("level", capacity)) + elapsed * capacity / 60.0
+                    levels[name] = min(level, float(capacity))
+                    # 上限を超える量は上限まで待てば消費できるものとする
+                    needed = min(amounts.get(name, 0.0), float(capacity))
+                    if needed > levels[name]:
+                        wait = max(wait, (needed - levels[name]) * 60.0 / capacity)
+
+                if wait <= 0:
+                    for name in levels:
+                        needed = min(amounts.get(name, 0.0), float(self.capacities[name]))
+                        levels[name] = min(levels[name] - needed, float(self.capacities[name]))
+
+                for name, level in levels.items():
+                    state[f"{self.scope}/{name}"] = {"level": level, "updated": now}
+                f.seek(0)
+                f.truncate()
+                json.dump(state, f)
+                f.flush()
+                return wait
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+_shared_lock = threading.Lock()
+_shared_limiters: Dict[str, TokenBucketRateLimiter] = {}
+
+
+def get_shared_rate_limiter(
+    region_name: str, model_id: str
+) -> Optional[TokenBucketRateLimiter]:
+    """
+    プロセス内で共有するTokenBucketRateLimiterを取得
+
+    Bedrockのクォータはリージョンとモデルごとに適用されるため、上限もその単位で共有する。
+
+    Args:
+        region_name: AWSリージョン名
+        model_id: BedrockモデルID
+
+    Returns:
+        TokenBucketRateLimiter（レート制限が設定されていない場合はNone）
+    """
+    settings = get_settings()
+    rate_settings = settings["aws"]["rate_limit"]
+    if not rate_settings["requests_per_minute"] and not rate_settings["tokens_per_minute"]:
+        return None
+
+    scope = f"{region_name}/{model_id}"
+    with _shared_lock:
+        if scope not in _shared_limiters:
+            state_file = rate_settings.get("state_file") or os.path.join(
+                settings["cache"]["directory"], "bedrock_rate_limit.json"
+            )
+            _shared_limiters[scope] = TokenBucketRateLimiter(
+                state_file,
+                requests_per_minute=rate_settings["requests_per_minute"],
+                tokens_per_minute=rate_settings["tokens_per_minute"],
+                scope=scope,
+            )
+        return _shared_limiters[scope]
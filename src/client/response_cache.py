@@ -0,0 +1,135 @@
+"""
+Bedrockのレスポンスをディスクにキャッシュするモジュール
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional, cast
+
+from src.cache.disk_cache import DiskCache
+from src.config import get_settings
+
+# キャッシュモード
+CACHE_MODES = ("off", "read", "write", "readwrite")
+
+# キャッシュに保存するレスポンスの停止理由（最大トークン数で途切れたものは保存しない）
+COMPLETE_STOP_REASONS = ("end_turn", "stop_sequence")
+
+
+class ResponseCache:
+    """
+    モデルID・プロンプト・生成パラメータをキーとしてBedrockのレスポンスをキャッシュするクラス
+    """
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        directory: Optional[str] = None,
+        ttl_seconds: Optional[float] = None,
+        max_size_mb: Optional[int] = None,
+    ) -> None:
+        """
+        ResponseCacheの初期化
+
+        Args:
+            mode: キャッシュモード（off/read/write/readwrite）（Noneの場合は設定から取得）
+            directory: キャッシュディレクトリのパス（Noneの場合は設定から取得）
+            ttl_seconds: キャッシュの有効期間（秒）（Noneの場合は設定から取得）
+            max_size_mb: キャッシュの最大サイズ（MB）（Noneの場合は設定から取得）
+        """
+        settings = get_settings()
+        cache_settings = settings["cache"]
+        bedrock_settings = cache_settings["bedrock"]
+
+        self.mode = mode or bedrock_settings["mode"]
+        if self.mode not in CACHE_MODES:
+            raise ValueError(f"不正なキャッシュモードです: {self.mode}")
+
+        self.store: Optional[DiskCache] = None
+        if self.mode != "off":
+            directory = (
+                directory
+                or bedrock_settings.get("directory")
+                or os.path.join(cache_settings["directory"], "bedrock")
+            )
+            self.store = DiskCache(
+                directory,
+                max_size_bytes=(max_size_mb or bedrock_settings["max_size_mb"]) * 1024 * 1024,
+                ttl_seconds=ttl_seconds or bedrock_settings["ttl_seconds"],
+            )
+
+    @property
+    def readable(self) -> bool:
+        """キャッシュからの読み込みが有効かどうか"""
+        return self.store is not None and self.mode in ("read", "readwrite")
+
+    @property
+    def writable(self) -> bool:
+        """キャッシュへの書き込みが有効かどうか"""
+        return self.store is not None and self.mode in ("write", "readwrite")
+
+    @staticmethod
+    def make_key(model_id: str, prompt: str, temperature: float, max_tokens: int) -> str:
+        """
+        キャッシュキーを作成
+
+        Args:
+            model_id: BedrockモデルID
+            prompt: プロンプト
+            temperature: 生成テキストのランダム性
+            max_tokens: 生成するトークンの最大数
+
+        Returns:
+            キャッシュキー
+        """
+        payload = json.dumps(
+            [model_id, prompt, temperature, max_tokens], ensure_ascii=False, separators=(",", ":")
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        キャッシュからレスポンスを取得
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            キャッシュされたレスポンス（存在しない場合・完了していないレスポンスの場合はNone）
+        """
+        if not self.readable or self.store is None:
+            return None
+        value = self.store.get(key)
+        if not isinstance(value, dict) or value.get("stop_reason") not in COMPLETE_STOP_REASONS:
+            return None
+        return cast(Dict[str, Any], value)
+
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        """
+        レスポンスをキャッシュに保存
+
+        Args:
+            key: キャッシュキー
+            response: 保存するレスポンス（stop_reasonが完了を示すもののみ保存する）
+        """
+        if not self.writable or self.store is None:
+            return
+        if response.get("stop_reason") not in COMPLETE_STOP_REASONS:
+            return
+        try:
+            self.store.put(key, response)
+        except Exception as e:
+            # キャッシュへの保存に失敗しても分析結果は利用できるため警告のみ
+            print(f"警告: Bedrockレスポンスのキャッシュ保存に失敗しました: {e}")
+
+    def delete(self, key: str) -> None:
+        """
+        レスポンスをキャッシュから削除（解析できなかったレスポンスを再利用しないために使用）
+
+        Args:
+            key: キャッシュキー
+        """
+        if not self.writable or self.store is None:
+            return
+        self.store.delete(key)
@@ -0,0 +1,333 @@
+"""
+Bedrockのスロットリングに対応するためのリトライ制御と同時実行数制御を行うモジュール
+"""
+
+import random
+import threading
+from types import TracebackType
+from typing import Any, Dict, Optional, Type
+
+from botocore.exceptions import (
+    ClientError,
+    ConnectionError,
+    ConnectTimeoutError,
+    ReadTimeoutError,
+)
+
+from src.config import get_settings
+
+# 再試行するエラーコード
+RETRYABLE_ERROR_CODES = frozenset(
+    [
+        "ThrottlingException",
+        "TooManyRequestsException",
+        "ServiceUnavailableException",
+        "ServiceUnavailable",
+        "InternalServerException",
+        "ModelNotReadyException",
+        "ModelTimeoutException",
+        "ModelStreamErrorException",
+    ]
+)
+
+# 同時実行数を減らすきっかけとなるエラーコード
+THROTTLING_ERROR_CODES = frozenset(["ThrottlingException", "TooManyRequestsException"])
+
+
+class BedrockStreamError(Exception):
+    """
+    ストリーミングレスポンスの途中で受信したエラーイベント
+    """
+
+    def __init__(self, code: str, message: str) -> None:
+        """
+        BedrockStreamErrorの初期化
+
+        Args:
+            code: エラーコード（例: ThrottlingException）
+            message: エラーメッセージ
+        """
+        super().__init__(f"{code}: {message}")
+        self.code = code
+
+
+def error_code(error: BaseException) -> Optional[str]:
+    """
+    例外からBedrockのエラーコードを取得
+
+    Args:
+        error: 例外
+
+    Returns:
+        エラーコード（取得できない場合はNone）
+    """
+    if isinstance(error, BedrockStreamError):
+        return error.code
+    if isinstance(error, ClientError):
+        return str(error.response.get("Error", {}).get("Code", "")) or None
+    return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    再試行すべき例外かどうかを判定
+
+    Args:
+        error: 例外
+
+    Returns:
+        スロットリング・一時的なサービス障害・通信エラーの場合はTrue
+    """
+    if isinstance(error, (ConnectionError, ReadTimeoutError)):
+        return True
+    return error_code(error) in RETRYABLE_ERROR_CODES
+
+
+def is_timeout(error: BaseException) -> bool:
+    """
+    タイムアウトによる例外かどうかを判定
+
+    Args:
+        error: 例外
+
+    Returns:
+        接続・読み込みのタイムアウトまたはモデルのタイムアウトの場合はTrue
+    """
+    if isinstance(error, (ConnectTimeoutError, ReadTimeoutError)):
+        return True
+    return error_code(error) == "ModelTimeoutException"
+
+
+def is_throttling(error: BaseException) -> bool:
+    """
+    スロットリングによる例外かどうかを判定
+
+    Args:
+        error: 例外
+
+    Returns:
+        スロットリングの場合はTrue
+    """
+    return error_code(error) in THROTTLING_ERROR_CODES
+
+
+class RetryBudget:
+    """
+    プロセス全体で共有する再試行回数の上限と、再試行の統計を管理するクラス
+    """
+
+    def __init__(self, retry_settings: Dict[str, Any]) -> None:
+        """
+        RetryBudgetの初期化
+
+        Args:
+            retry_settings: 再試行の設定（aws.retry）
+        """
+        self.max_attempts = max(int(retry_settings["max_attempts"]), 1)
+        self.base_delay = float(retry_settings["base_delay"])
+        self.max_delay = float(retry_settings["max_delay"])
+        self.budget = int(retry_settings["budget"])
+        self.retries = 0
+        self.throttled = 0
+        self.exhausted = 0
+        self.lock = threading.Lock()
+
+    def try_acquire(self, attempt: int, throttled: bool) -> bool:
+        """
+        再試行を1回分確保する
+
+        Args:
+            attempt: 失敗した呼び出しの試行回数（1から始まる）
+            throttled: 失敗の原因がスロットリングかどうか
+
+        Returns:
+            再試行できる場合はTrue
+        """
+        with self.lock:
+            if throttled:
+                self.throttled += 1
+            if attempt >= self.max_attempts:
+                return False
+            if self.retries >= self.budget:
+                self.exhausted += 1
+                return False
+            self.retries += 1
+            return True
+
+    def backoff(self, attempt: int) -> float:
+        """
+        再試行までの待機時間を計算（指数バックオフ + フルジッター）
+
+        Args:
+            attempt: 失敗した呼び出しの試行回数（1から始まる）
+
+        Returns:
+            待機時間（秒）
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        再試行の統計を取得
+
+        Returns:
+            再試行回数・スロットリング回数・残りの再試行回数など
+        """
+        with self.lock:
+            return {
+                "retries": self.retries,
+                "throttled": self.throttled,
+                "budget": self.budget,
+                "budget_remaining": max(self.budget - self.retries, 0),
+                "budget_exhausted": self.exhausted,
+            }
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD方式でBedrockへの同時実行数を調整するクラス
+
+    成功するたびに上限を少しずつ増やし（加算的増加）、スロットリングされた場合は
+    上限を一定の割合で減らす（乗算的減少）。同じ上限のもとで開始した呼び出しが
+    続けてスロットリングされても、減少は1回のみとする。
+    """
+
+    def __init__(self, concurrency_settings: Dict[str, Any]) -> None:
+        """
+        AdaptiveConcurrencyLimiterの初期化
+
+        Args:
+            concurrency_settings: 同時実行数の設定（aws.concurrency）
+        """
+        self.enabled = bool(concurrency_settings["adaptive"])
+        self.min_limit = max(float(concurrency_settings["min"]), 1.0)
+        self.max_limit = max(float(concurrency_settings["max"]), self.min_limit)
+        self.decrease_factor = float(concurrency_settings["decrease_factor"])
+        initial = float(concurrency_settings["initial"])
+        self.limit = min(max(initial, self.min_limit), self.max_limit)
+        self.lowest_limit = self.limit
+        self.in_flight = 0
+        self.epoch = 0
+        self.condition = threading.Condition()
+
+    def slot(self) -> "ConcurrencySlot":
+        """
+        同時実行枠を確保するコンテキストを作成
+
+        Returns:
+            ConcurrencySlot
+        """
+        return ConcurrencySlot(self)
+
+    def acquire(self) -> int:
+        """
+        同時実行枠が空くまで待機して確保する
+
+        Returns:
+            確保した時点の世代（上限を減らした回数）
+        """
+        with self.condition:
+            while self.enabled and self.in_flight >= int(self.limit):
+                self.condition.wait()
+            self.in_flight += 1
+            return self.epoch
+
+    def release(self, epoch: int, succeeded: bool, throttled: bool) -> None:
+        """
+        同時実行枠を解放し、結果に応じて上限を調整する
+
+        Args:
+            epoch: 枠を確保した時点の世代
+            succeeded: 呼び出しが成功したかどうか
+            throttled: スロットリングされたかどうか
+        """
+        with self.condition:
+            self.in_flight -= 1
+            if throttled:
+                if epoch == self.epoch:
+                    self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+                    self.lowest_limit = min(self.lowest_limit, self.limit)
+                    self.epoch += 1
+            elif succeeded:
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            self.condition.notify_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        同時実行数の統計を取得
+
+        Returns:
+            現在の上限・これまでの最小の上限・上限を減らした回数
+        """
+        with self.condition:
+            return {
+                "concurrency_limit": int(self.limit),
+                "lowest_concurrency_limit": int(self.lowest_limit),
+                "concurrency_decreases": self.epoch,
+            }
+
+
+class ConcurrencySlot:
+    """
+    AdaptiveConcurrencyLimiterの同時実行枠を1回の呼び出しの間だけ確保するコンテキスト
+    """
+
+    def __init__(self, limiter: AdaptiveConcurrencyLimiter) -> None:
+        """
+        ConcurrencySlotの初期化
+
+        Args:
+            limiter: 枠を確保するAdaptiveConcurrencyLimiter
+        """
+        self.limiter = limiter
+        self.epoch = 0
+
+    def __enter__(self) -> "ConcurrencySlot":
+        self.epoch = self.limiter.acquire()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.limiter.release(
+            self.epoch,
+            succeeded=exc_value is None,
+            throttled=exc_value is not None and is_throttling(exc_value),
+        )
+
+
+_shared_lock = threading.Lock()
+_shared_budget: Optional[RetryBudget] = None
+_shared_limiter: Optional[AdaptiveConcurrencyLimiter] = None
+
+
+def get_shared_retry_budget() -> RetryBudget:
+    """
+    プロセス内で共有するRetryBudgetを取得
+
+    Returns:
+        RetryBudget
+    """
+    global _shared_budget
+    with _shared_lock:
+        if _shared_budget is None:
+            _shared_budget = RetryBudget(get_settings()["aws"]["retry"])
+        return _shared_budget
+
+
+def get_shared_limiter() -> AdaptiveConcurrencyLimiter:
+    """
+    プロセス内で共有するAdaptiveConcurrencyLimiterを取得
+
+    Returns:
+        AdaptiveConcurrencyLimiter
+    """
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = AdaptiveConcurrencyLimiter(get_settings()["aws"]["concurrency"])
+        return _shared_limiter
@@ -16,6 +16,65 @@ DEFAULT_SETTINGS = {
     "aws": {
         "region": "ap-northeast-1",
         "model_id": "anthropic.claude-3-5-sonnet-20240620-v1:0",
+        # ストリーミングでレスポンスを受信するかどうか
+        "streaming": True,
+        # レスポンスが最大トークン数に達した場合に続きを要求する最大回数
+        "max_continuations": 3,
+        # 入力の規模に応じたモデルの振り分け
+        "routing": {
+            # 小規模な入力を高速モデルで分析するかどうか
+            "enabled": False,
+            # 高速モデルのID
+            "fast_model_id": "anthropic.claude-3-haiku-20240307-v1:0",
+            # 高速モデルを使用するプロンプトの最大トークン数（概算）とリソース数
+            "max_prompt_tokens": 8000,
+            "max_resources": 30,
+            # タイムアウトした場合にもう一方のモデルで再実行するかどうか
+            "fallback_on_timeout": True,
+            # 高速モデルの読み込みタイムアウト（秒）
+            "fast_read_timeout": 60,
+        },
+        # bedrock-runtimeクライアントの設定
+        "client": {
+            # 接続プールの最大接続数
+            "max_pool_connections": 32,
+            # 接続タイムアウト・読み込みタイムアウト（秒）
+            "connect_timeout": 10,
+            "read_timeout": 300,
+            # TCPキープアライブを有効にするかどうか
+            "tcp_keepalive": True,
+            # 並列呼び出しに使用するスレッド数
+            "max_workers": 16,
+        },
+        # スロットリング・一時的な障害時の再試行
+        "retry": {
+            # 1回の呼び出しあたりの最大試行回数（初回を含む）
+            "max_attempts": 6,
+            # 指数バックオフの初期待機時間（秒）と最大待機時間（秒）
+            "base_delay": 1.0,
+            "max_delay": 30.0,
+            # プロセス全体での再試行回数の上限
+            "budget": 100,
+        },
+        # 同じホストの全プロセスで共有するレート制限（0の場合は制限しない）
+        "rate_limit": {
+            # 1分あたりの最大リクエスト数
+            "requests_per_minute": 0,
+            # 1分あたりの最大トークン数（入力トークン数と最大出力トークン数の合計）
+            "tokens_per_minute": 0,
+            # 状態ファイルのパス（Noneの場合は cache.directory/bedrock_rate_limit.json）
+            "state_file": None,
+        },
+        # Bedrockへの同時実行数（AIMD方式で自動調整）
+        "concurrency": {
+            # スロットリングに応じて同時実行数を調整するかどうか
+            "adaptive": True,
+            "initial": 4,
+            "min": 1,
+            "max": 16,
+            # スロットリングされた場合に同時実行数に掛ける係数
+            "decrease_factor": 0.5,
+        },
     },
     # 出力設定
     "output": {
@@ -23,12 +82,211 @@ DEFAULT_SETTINGS = {
         "default_json_filename": "terraform_parsed.json",
         "default_report_filename": "availability_report.json",
         "default_html_filename": "availability_report.html",
+        # ストリーミング受信中の問題点・推奨事項を逐次保存するファイル（失敗した場合のみ残す）
+        "partial_report_filename": "partial_report.jsonl",
+        # HTMLレポートの問題点の表示方式
+        # （table: 表、paginated: 埋め込んだJSONをスクリプトで表示、auto: 件数に応じて選択）
+        "html_mode": "auto",
+        # html_modeがautoの場合にpaginatedで出力する問題点の件数の下限
+        "html_paginate_threshold": 1000,
+        # paginatedの場合の1ページあたりの問題点の件数
+        "html_page_size": 500,
     },
     # アプリケーション設定
     "app": {
         "language": "ja",
         "debug": False,
     },
+    # Terraform解析設定
+    "terraform": {
+        # モジュール・環境のルートごとに並列解析するかどうか
+        "parallel": False,
+        # 並列解析のワーカー数（0の場合はCPUコア数）
+        "workers": 0,
+        # ルートごとの解析タイムアウト（秒）
+        "root_timeout": 300,
+    },
+    # プロンプト設定
+    "prompt": {
+        # 可用性評価に関係する属性のみをプロンプトに含めるかどうか
+        "prune_attributes": True,
+        # プロンプトのJSONを空白なしで出力するかどうか
+        "compact_json": True,
+        # リソースタイプごとの許可リスト（組み込みの許可リストを上書き・追加）
+        "attribute_allowlists": {},
+        # 許可リストのあるリソースタイプでも常に残す属性
+        "common_attributes": ["count", "for_each", "provider"],
+        # 許可リストのないリソースタイプから取り除く属性
+        "drop_attributes": [
+            "id",
+            "arn",
+            "tags",
+            "tags_all",
+            "description",
+            "policy",
+            "assume_role_policy",
+            "inline_policy",
+            "source_code_hash",
+            "depends_on",
+        ],
+        # プロンプトに含めないブロックタイプ
+        "drop_block_types": [
+            "variable",
+            "output",
+            "locals",
+            "terraform",
+            "provider",
+            "aws_iam_policy_document",
+        ],
+        # リソース間の参照関係の依存関係グラフ
+        "graph": {
+            # 依存関係グラフの要約と単一障害点の候補をプロンプトに含めるかどうか
+            # （有効な場合はリソースの属性から参照を取り除く）
+            "enabled": True,
+            # プロンプトに含める参照元の最大件数
+            "max_references": 300,
+            # プロンプトに含める単一障害点の候補・唯一の接続となっている参照の最大件数
+            "max_items": 20,
+        },
+        # 名前やタグのみが異なる同じ構成のリソースを代表の1件にまとめる
+        "collapse": {
+            # まとめるかどうか
+            "enabled": True,
+            # まとめるリソースの最小件数
+            "min_count": 3,
+            # 構成の比較で無視する属性
+            "ignore_attributes": [
+                "name",
+                "name_prefix",
+                "function_name",
+                "bucket",
+                "bucket_prefix",
+                "identifier",
+                "identifier_prefix",
+                "table_name",
+                "queue_name",
+                "tags",
+                "tags_all",
+                "description",
+            ],
+        },
+    },
+    # 分析設定
+    "analysis": {
+        # 分割分析のモード（auto: プロンプトが大きい場合のみ / on: 常に / off: 分割しない）
+        "chunked": "auto",
+        # autoモードで分割分析に切り替えるプロンプトのトークン数（概算）
+        "max_prompt_tokens": 60000,
+        # 分割分析の1グループあたりの最大トークン数（概算）
+        "max_chunk_tokens": 20000,
+        # 並列に分析するグループの数
+        "chunk_workers": 4,
+        # モジュール単位の分析
+        "modules": {
+            # 最上位のモジュールのインスタンスごとに分析し、結果をフィンガープリントで共有するかどうか
+            "enabled": False,
+        },
+        # 差分の分析
+        "incremental": {
+            # 前回の分析結果を保存し、追加・変更されたリソースのみをBedrockに送信するかどうか
+            "enabled": True,
+            # 追加・変更されたリソースの割合がこれを超える場合はすべてのリソースを分析する
+            "max_changed_ratio": 0.5,
+        },
+        # Bedrockを呼び出す前のルールによる評価
+        "rules": {
+            # ルールによる評価を行うかどうか
+            "enabled": True,
+            # ルールのみで評価し、Bedrockを呼び出さないかどうか
+            "only": False,
+            # すべてのルールで判定できたリソースをBedrockに送信しないかどうか
+            "residual_only": False,
+            # 無効にするルールIDのリスト
+            "disabled": [],
+            # リソース数がこの値以上の場合は列指向のテーブルで評価する（0の場合は常に使用）
+            "columnar_threshold": 5000,
+        },
+        # ストリーミング受信中に問題点・推奨事項を逐次解析して表示・保存するかどうか
+        "incremental_parse": True,
+        # 分析結果の項目が不足している場合の補完
+        "repair": {
+            # 不足している項目のみをBedrockに要求して補完するかどうか
+            "enabled": True,
+            # 補完用の呼び出しで生成する最大トークン数
+            "max_tokens": 2048,
+        },
+        # 1回の呼び出しで生成する最大トークン数（リソース数から計算）
+        "output_tokens": {
+            # 基本のトークン数とリソース1件あたりのトークン数
+            "base": 1024,
+            "per_resource": 64,
+            # 最小値と最大値
+            "min": 2048,
+            "max": 4096,
+            # モデルごとの出力トークン数の上限（モデルIDに含まれる文字列で照合）
+            # 一致しないモデルは default_model_limit を上限とする
+            "model_limits": {
+                "anthropic.claude-3-haiku": 4096,
+                "anthropic.claude-3-sonnet": 4096,
+                "anthropic.claude-3-opus": 4096,
+                "anthropic.claude-3-5-sonnet-20240620": 4096,
+                "anthropic.claude-3-5-sonnet-20241022": 8192,
+                "anthropic.claude-3-5-haiku": 8192,
+            },
+            "default_model_limit": 4096,
+        },
+    },
+    # 一括スキャン設定
+    "scan": {
+        # 解析ステージの並列数
+        "parse_workers": 2,
+        # 分析ステージの並列数
+        "analysis_workers": 4,
+        # 解析済みで分析待ちのルートの最大数
+        "queue_size": 8,
+    },
+    # リビジョンごとの評価（historyサブコマンド）の設定
+    "history": {
+        # 対象とする直近のリビジョンの数
+        "revisions": 10,
+        # チェックアウトに使用する作業ツリーのディレクトリ（Noneの場合は cache.directory/history）
+        "worktree_directory": None,
+    },
+    # キャッシュ設定
+    "cache": {
+        "directory": "~/.aws_availability/cache",
+        # Terraform解析結果のキャッシュ
+        "parse": {
+            "enabled": True,
+            "max_size_mb": 256,
+        },
+        # Bedrockレスポンスのキャッシュ
+        "bedrock": {
+            # キャッシュモード（off/read/write/readwrite）
+            "mode": "readwrite",
+            # キャッシュディレクトリ（Noneの場合は cache.directory/bedrock）
+            "directory": None,
+            # 有効期間（秒）
+            "ttl_seconds": 86400,
+            "max_size_mb": 128,
+        },
+        # モジュール単位の分析結果のキャッシュ
+        "modules": {
+            # ディスクに保存するかどうか（無効な場合も同じプロセス内では共有する）
+            "enabled": True,
+            # キャッシュディレクトリ（Noneの場合は cache.directory/modules）
+            "directory": None,
+            # 有効期間（秒）
+            "ttl_seconds": 604800,
+            "max_size_mb": 64,
+        },
+        # 差分の分析に使用する前回の分析結果（ルートごとのスナップショット）
+        "snapshots": {
+            # 保存先のディレクトリ（Noneの場合は cache.directory/snapshots）
+            "directory": None,
+            "max_size_mb": 256,
+        },
+    },
 }
 
 # シングルトンインスタンス
@@ -0,0 +1,694 @@
+"""
+HTMLレポートのテンプレートを定義するモジュール
+
+テンプレートはモジュールの読み込み時に1度だけ解析し、すべてのレポート（バッチ実行の
+各ルートを含む）で共有する。
+"""
+
+import re
+from functools import lru_cache
+from html import escape
+from typing import Any, List, Optional, Tuple
+
+# テンプレート内のプレースホルダー（例: ${score}）
+PLACEHOLDER_PATTERN = re.compile(r"\$\{(\w+)\}")
+
+# エスケープ結果をキャッシュする値の最大長（カテゴリ、重要度など繰り返し現れる短い値が対象）
+ESCAPE_CACHE_MAX_LENGTH = 256
+
+
+@lru_cache(maxsize=4096)
+def _cached_escape(value: str) -> str:
+    """
+    短い値のHTMLエスケープ（結果をキャッシュする）
+
+    Args:
+        value: エスケープする文字列
+
+    Returns:
+        エスケープされた文字列
+    """
+    return escape(value)
+
+
+def escape_value(value: Any) -> str:
+    """
+    テンプレートに埋め込む値をHTMLエスケープする
+
+    Args:
+        value: 埋め込む値（Noneの場合は空文字列）
+
+    Returns:
+        エスケープされた文字列
+    """
+    if value is None:
+        return ""
+    if not isinstance(value, str):
+        value = str(value)
+    if len(value) <= ESCAPE_CACHE_MAX_LENGTH:
+        return _cached_escape(value)
+    return escape(value)
+
+
+class HtmlTemplate:
+    """
+    プレースホルダーの位置を解析済みのHTMLテンプレート
+
+    値はすべてHTMLエスケープして埋め込む。
+    """
+
+    def __init__(self, source: str) -> None:
+        """
+        HtmlTemplateの初期化（テンプレートを固定部分とプレースホルダーの位置に分割する）
+
+        Args:
+            source: テンプレートの文字列
+        """
+        self.parts: List[str] = []
+        self.slots: List[Tuple[int, str]] = []
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(source):
+            self.parts.append(source[position:match.start()])
+            self.slots.append((len(self.parts), match.group(1)))
+            self.parts.append("")
+            position = match.end()
+        self.parts.append(source[position:])
+        self.static: Optional[str] = "".join(self.parts) if not self.slots else None
+
+    def render(self, **values: Any) -> str:
+        """
+        テンプレートに値を埋め込む
+
+        Args:
+            **values: プレースホルダー名ごとの値（Noneの場合は空文字列）
+
+        Returns:
+            生成されたHTML文字列
+        """
+        if self.static is not None:
+            return self.static
+        parts = self.parts[:]
+        for index, field in self.slots:
+            value = values[field]
+            # 短い文字列（大半の値）はキャッシュを直接参照する
+            if type(value) is str and len(value) <= ESCAPE_CACHE_MAX_LENGTH:
+                parts[index] = _cached_escape(value)
+            else:
+                parts[index] = escape_value(value)
+        return "".join(parts)
+
+
+# 共通のスタイル
+BASE_STYLE = """
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            max-width: ${max_width};
+            margin: 0 auto;
+            padding: 20px;
+        }"""
+
+# レポートの先頭（スタイルとヘッダー）
+PAGE_HEADER = HtmlTemplate(
+    """<!DOCTYPE html>
+<html lang="ja">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>AWS Terraform可用性分析レポート</title>
+    <style>"""
+    + BASE_STYLE
+    + """
+        header {
+            background-color: #0066cc;
+            color: white;
+            padding: 20px;
+            border-radius: 5px;
+            margin-bottom: 20px;
+        }
+        h1, h2, h3 {
+            margin-top: 0;
+        }
+        .score-container {
+            text-align: center;
+            margin: 30px 0;
+        }
+        .score {
+            font-size: 48px;
+            font-weight: bold;
+        }
+        .score-high {
+            color: #28a745;
+        }
+        .score-medium {
+            color: #ffc107;
+        }
+        .score-low {
+            color: #dc3545;
+        }
+        .partial-notice {
+            background-color: #fff3cd;
+            border-left: 5px solid #ffc107;
+            padding: 15px;
+            margin-bottom: 20px;
+        }
+        .overview {
+            background-color: #f8f9fa;
+            border-left: 5px solid #0066cc;
+            padding: 15px;
+            margin-bottom: 30px;
+        }
+        table {
+            width: 100%;
+            border-collapse: collapse;
+            margin-bottom: 30px;
+        }
+        th, td {
+            border: 1px solid #ddd;
+            padding: 12px;
+            text-align: left;
+        }
+        th {
+            background-color: #f2f2f2;
+        }
+        tr:nth-child(even) {
+            background-color: #f9f9f9;
+        }
+        .severity-high, .priority-high {
+            color: #dc3545;
+            font-weight: bold;
+        }
+        .severity-medium, .priority-medium {
+            color: #ffc107;
+            font-weight: bold;
+        }
+        .severity-low, .priority-low {
+            color: #28a745;
+            font-weight: bold;
+        }
+        .finding-resources {
+            margin-top: 6px;
+            color: #666;
+            font-size: 0.9em;
+            word-break: break-all;
+        }
+        .recommendation {
+            background-color: #f8f9fa;
+            border: 1px solid #ddd;
+            border-radius: 5px;
+            padding: 15px;
+            margin-bottom: 20px;
+        }
+        .recommendation h3 {
+            margin-top: 0;
+            border-bottom: 2px solid #0066cc;
+            padding-bottom: 10px;
+        }
+        pre {
+            background-color: #f5f5f5;
+            padding: 15px;
+            border-radius: 5px;
+            overflow-x: auto;
+        }
+        footer {
+            margin-top: 50px;
+            text-align: center;
+            color: #777;
+            font-size: 0.9em;
+        }
+    </style>
+</head>
+<body>
+    <header>
+        <h1>AWS Terraform可用性分析レポート</h1>
+        <p>AWS Well-Architected Frameworkの信頼性の柱に基づく評価</p>
+    </header>
+"""
+)
+
+# 分割分析の一部のグループが失敗した場合の警告
+PARTIAL_NOTICE = HtmlTemplate(
+    """
+    <div class="partial-notice">
+        <strong>警告:</strong> 一部のグループの分析に失敗したため、結果は不完全です（失敗: ${failed_chunks}）
+    </div>
+"""
+)
+
+# 可用性スコア
+SCORE = HtmlTemplate(
+    """
+    <div class="score-container">
+        <h2>可用性スコア</h2>
+        <div class="score ${score_class}">${score}/100</div>
+    </div>
+"""
+)
+
+# 概要
+OVERVIEW = HtmlTemplate(
+    """
+    <section>
+        <h2>概要</h2>
+        <div class="overview">
+            <p>${overview}</p>
+        </div>
+    </section>
+"""
+)
+
+# 問題点テーブルの開始
+FINDINGS_START = HtmlTemplate(
+    """
+    <section>
+        <h2>検出された問題点</h2>
+        <table>
+            <thead>
+                <tr>
+                    <th>カテゴリ</th>
+                    <th>重要度</th>
+                    <th>説明</th>
+                    <th>推奨対応</th>
+                </tr>
+            </thead>
+            <tbody>
+"""
+)
+
+# 問題点テーブルの行
+FINDING_ROW = HtmlTemplate(
+    """
+                <tr>
+                    <td>${category}</td>
+                    <td class="${severity_class}">${severity}</td>
+                    <td>${description}</td>
+                    <td>${recommendation}</td>
+                </tr>
+"""
+)
+
+# 問題点テーブルの行（代表にまとめて分析したリソースの一覧を含む）
+FINDING_ROW_WITH_RESOURCES = HtmlTemplate(
+    """
+                <tr>
+                    <td>${category}</td>
+                    <td class="${severity_class}">${severity}</td>
+                    <td>${description}<div class="finding-resources">対象: ${resources}</div></td>
+                    <td>${recommendation}</td>
+                </tr>
+"""
+)
+
+# 問題点テーブルの終了
+FINDINGS_END = HtmlTemplate(
+    """
+            </tbody>
+        </table>
+    </section>
+"""
+)
+
+# 問題点のビューアー（埋め込んだJSONをスクリプトで表示する）の開始
+FINDINGS_VIEWER_START = HtmlTemplate(
+    """
+    <section>
+        <h2>検出された問題点</h2>
+        <style>
+            .findings-controls {
+                display: flex;
+                flex-wrap: wrap;
+                gap: 12px;
+                align-items: center;
+                margin-bottom: 10px;
+            }
+            .findings-grid {
+                display: grid;
+                grid-template-columns: 16% 8% 1fr 1fr;
+            }
+            .findings-grid > div {
+                padding: 0 12px;
+                overflow: hidden;
+                white-space: nowrap;
+                text-overflow: ellipsis;
+                border-right: 1px solid #ddd;
+            }
+            .findings-head {
+                background-color: #f2f2f2;
+                font-weight: bold;
+                line-height: 40px;
+                border: 1px solid #ddd;
+            }
+            .findings-viewport {
+                height: 600px;
+                overflow-y: auto;
+                border: 1px solid #ddd;
+                border-top: none;
+                position: relative;
+            }
+            .findings-spacer {
+                position: relative;
+            }
+            .findings-rows {
+                position: absolute;
+                top: 0;
+                left: 0;
+                right: 0;
+            }
+            .finding-row {
+                height: 36px;
+                line-height: 36px;
+                box-sizing: border-box;
+                border-bottom: 1px solid #eee;
+                cursor: pointer;
+            }
+            .finding-row:nth-child(even) {
+                background-color: #f9f9f9;
+            }
+            .finding-row:hover {
+                background-color: #e8f0fa;
+            }
+            .findings-pager {
+                display: flex;
+                gap: 12px;
+                align-items: center;
+                justify-content: center;
+                margin: 10px 0 20px;
+            }
+            .finding-detail {
+                background-color: #f8f9fa;
+                border-left: 5px solid #0066cc;
+                padding: 15px;
+                margin-bottom: 30px;
+                white-space: pre-wrap;
+            }
+        </style>
+        <div class="findings-controls">
+            <label>重要度
+                <select id="findings-severity"><option value="">すべて</option></select>
+            </label>
+            <label>カテゴリ
+                <select id="findings-category"><option value="">すべて</option></select>
+            </label>
+            <label>検索 <input id="findings-text" type="search"></label>
+            <span id="findings-count"></span>
+        </div>
+        <div class="findings-grid findings-head">
+            <div>カテゴリ</div>
+            <div>重要度</div>
+            <div>説明</div>
+            <div>推奨対応</div>
+        </div>
+        <div id="findings-viewport" class="findings-viewport">
+            <div id="findings-spacer" class="findings-spacer">
+                <div id="findings-rows" class="findings-rows"></div>
+            </div>
+        </div>
+        <div class="findings-pager">
+            <button type="button" id="findings-prev">前へ</button>
+            <span id="findings-page"></span>
+            <button type="button" id="findings-next">次へ</button>
+        </div>
+        <div id="findings-detail" class="finding-detail" hidden></div>
+        <noscript>問題点の一覧の表示にはJavaScriptが必要です。JSONレポートを参照してください。</noscript>
+    </section>
+    <script type="application/json" id="findings-data">"""
+)
+
+# 問題点のビューアーの終了（埋め込んだJSONを表示するスクリプト）
+FINDINGS_VIEWER_END = HtmlTemplate(
+    """</script>
+    <script>
+    (function () {
+        var data = JSON.parse(document.getElementById("findings-data").textContent);
+        var ROW_HEIGHT = 36;
+        var OVERSCAN = 10;
+        var rows = data.rows;
+        var viewport = document.getElementById("findings-viewport");
+        var spacer = document.getElementById("findings-spacer");
+        var body = document.getElementById("findings-rows");
+        var severitySelect = document.getElementById("findings-severity");
+        var categorySelect = document.getElementById("findings-category");
+        var textInput = document.getElementById("findings-text");
+        var countLabel = document.getElementById("findings-count");
+        var pageLabel = document.getElementById("findings-page");
+        var prevButton = document.getElementById("findings-prev");
+        var nextButton = document.getElementById("findings-next");
+        var detail = document.getElementById("findings-detail");
+        var filtered = [];
+        var page = 0;
+        var scheduled = false;
+
+        function addOptions(select, values) {
+            for (var i = 0; i < values.length; i++) {
+                var option = document.createElement("option");
+                option.value = String(i);
+                option.textContent = values[i];
+                select.appendChild(option);
+            }
+        }
+
+        function pageCount() {
+            return Math.max(1, Math.ceil(filtered.length / data.page_size));
+        }
+
+        function pageLength() {
+            return Math.max(0, Math.min(data.page_size, filtered.length - page * data.page_size));
+        }
+
+        function applyFilters() {
+            var severity = severitySelect.value === "" ? -1 : Number(severitySelect.value);
+            var category = categorySelect.value === "" ? -1 : Number(categorySelect.value);
+            var text = textInput.value.toLowerCase();
+            filtered = [];
+            for (var i = 0; i < rows.length; i++) {
+                var row = rows[i];
+                if (severity >= 0 && row[1] !== severity) {
+                    continue;
+                }
+                if (category >= 0 && row[0] !== category) {
+                    continue;
+                }
+                var content = row[2] + "\\n" + row[3] + "\\n" + row[4];
+                if (text && content.toLowerCase().indexOf(text) < 0) {
+                    continue;
+                }
+                filtered.push(i);
+            }
+            countLabel.textContent = filtered.length + " / " + rows.length + " 件";
+            showPage(0);
+        }
+
+        function showPage(number) {
+            page = Math.max(0, Math.min(number, pageCount() - 1));
+            spacer.style.height = pageLength() * ROW_HEIGHT + "px";
+            viewport.scrollTop = 0;
+            pageLabel.textContent = page + 1 + " / " + pageCount() + " ページ";
+            prevButton.disabled = page === 0;
+            nextButton.disabled = page >= pageCount() - 1;
+            render();
+        }
+
+        function cell(text, className) {
+            var element = document.createElement("div");
+            element.textContent = text;
+            element.title = text;
+            if (className) {
+                element.className = className;
+            }
+            return element;
+        }
+
+        function createRow(index) {
+            var row = rows[index];
+            var element = document.createElement("div");
+            element.className = "findings-grid finding-row";
+            element.setAttribute("data-index", String(index));
+            element.appendChild(cell(data.categories[row[0]], ""));
+            element.appendChild(cell(data.severities[row[1]], data.severity_classes[row[1]]));
+            element.appendChild(cell(row[2], ""));
+            element.appendChild(cell(row[3], ""));
+            return element;
+        }
+
+        // 表示範囲の行（前後の余裕を含む）のみを作成する
+        function render() {
+            var offset = page * data.page_size;
+            var first = Math.max(0, Math.floor(viewport.scrollTop / ROW_HEIGHT) - OVERSCAN);
+            var last = Math.min(
+                pageLength(),
+                Math.ceil((viewport.scrollTop + viewport.clientHeight) / ROW_HEIGHT) + OVERSCAN
+            );
+            var fragment = document.createDocumentFragment();
+            for (var i = first; i < last; i++) {
+                fragment.appendChild(createRow(filtered[offset + i]));
+            }
+            body.textContent = "";
+            body.appendChild(fragment);
+            body.style.transform = "translateY(" + first * ROW_HEIGHT + "px)";
+        }
+
+        function showDetail(index) {
+            var row = rows[index];
+            detail.textContent =
+                "カテゴリ: " + data.categories[row[0]] + "\\n" +
+                "重要度: " + data.severities[row[1]] + "\\n\\n" +
+                "説明:\\n" + row[2] + "\\n\\n" +
+                "推奨対応:\\n" + row[3] +
+                (row[4] ? "\\n\\n対象:\\n" + row[4] : "");
+            detail.hidden = false;
+        }
+
+        viewport.addEventListener("scroll", function () {
+            if (!scheduled) {
+                scheduled = true;
+                window.requestAnimationFrame(function () {
+                    scheduled = false;
+                    render();
+                });
+            }
+        });
+        body.addEventListener("click", function (event) {
+            var target = event.target.closest(".finding-row");
+            if (target) {
+                showDetail(Number(target.getAttribute("data-index")));
+            }
+        });
+        severitySelect.addEventListener("change", applyFilters);
+        categorySelect.addEventListener("change", applyFilters);
+        textInput.addEventListener("input", applyFilters);
+        prevButton.addEventListener("click", function () {
+            showPage(page - 1);
+        });
+        nextButton.addEventListener("click", function () {
+            showPage(page + 1);
+        });
+
+        addOptions(severitySelect, data.severities);
+        addOptions(categorySelect, data.categories);
+        applyFilters();
+    })();
+    </script>
+"""
+)
+
+# 推奨事項の開始
+RECOMMENDATIONS_START = HtmlTemplate(
+    """
+    <section>
+        <h2>改善推奨事項</h2>
+"""
+)
+
+# 推奨事項の項目の開始
+RECOMMENDATION_START = HtmlTemplate(
+    """
+        <div class="recommendation">
+            <h3>推奨事項 ${index}: <span class="${priority_class}">優先度: ${priority}</span></h3>
+            <p>${description}</p>
+"""
+)
+
+# 推奨事項の実装例
+RECOMMENDATION_EXAMPLE = HtmlTemplate(
+    """
+            <h4>実装例:</h4>
+            <pre><code>${example}</code></pre>
+"""
+)
+
+# 推奨事項の項目の終了
+RECOMMENDATION_END = HtmlTemplate(
+    """
+        </div>
+"""
+)
+
+# 推奨事項の終了
+RECOMMENDATIONS_END = HtmlTemplate(
+    """
+    </section>
+"""
+)
+
+# 使用したモデル
+MODEL_USAGE = HtmlTemplate("<p>分析モデル: ${model_id} (${tier})${latency}</p>")
+
+# フッターの開始
+PAGE_FOOTER_START = HtmlTemplate(
+    """
+    <footer>
+        <p>レポート生成: AWS Terraform可用性チェックツール</p>
+        """
+)
+
+# フッターと終了タグ
+PAGE_FOOTER_END = HtmlTemplate(
+    """
+    </footer>
+</body>
+</html>
+"""
+)
+
+# 分析に失敗した場合のページ
+ERROR_PAGE = HtmlTemplate(
+    """<!DOCTYPE html>
+<html lang="ja">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>AWS Terraform可用性分析エラー</title>
+    <style>"""
+    + BASE_STYLE
+    + """
+        .error {
+            background-color: #f8d7da;
+            border: 1px solid #f5c6cb;
+            color: #721c24;
+            padding: 20px;
+            border-radius: 5px;
+            margin: 20px 0;
+        }
+    </style>
+</head>
+<body>
+    <h1>AWS Terraform可用性分析エラー</h1>
+    <div class="error">
+        <h2>分析実行中にエラーが発生しました</h2>
+        <p>${error}</p>
+    </div>
+</body>
+</html>
+"""
+)
+
+# 構造化されていない分析結果のページ
+RAW_ANALYSIS_PAGE = HtmlTemplate(
+    """<!DOCTYPE html>
+<html lang="ja">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>AWS Terraform可用性分析レポート</title>
+    <style>"""
+    + BASE_STYLE
+    + """
+        .raw-analysis {
+            white-space: pre-wrap;
+            background-color: #f8f9fa;
+            border: 1px solid #ddd;
+            padding: 20px;
+            border-radius: 5px;
+        }
+    </style>
+</head>
+<body>
+    <h1>AWS Terraform可用性分析レポート</h1>
+    <div class="raw-analysis">
+        ${raw_analysis}
+    </div>
+</body>
+</html>
+"""
+)
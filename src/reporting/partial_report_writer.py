@@ -0,0 +1,73 @@
+"""
+ストリーミングで受信中の分析結果を逐次ファイルに保存するモジュール
+"""
+
+import json
+import os
+from typing import Any, Dict, IO, List, Optional, Tuple
+
+
+class PartialReportWriter:
+    """
+    受信中に閉じた問題点と推奨事項を1件ずつJSON Lines形式で追記するクラス
+
+    1件ごとにフラッシュするため、レスポンスの途中で接続が切れた場合やプロセスが
+    中断された場合でも、それまでに受信した項目がファイルに残る。
+    """
+
+    def __init__(self, output_file: str) -> None:
+        """
+        PartialReportWriterの初期化
+
+        Args:
+            output_file: 出力ファイルのパス
+        """
+        self.output_file = output_file
+        self.file: Optional[IO[str]] = None
+        self.count = 0
+
+    def write(self, items: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        項目をファイルに追記する
+
+        Args:
+            items: (項目名, オブジェクト)のリスト
+        """
+        if not items:
+            return
+        if self.file is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.output_file)), exist_ok=True)
+            self.file = open(self.output_file, "w", encoding="utf-8")
+        for field, item in items:
+            self.file.write(json.dumps({field: item}, ensure_ascii=False) + "\n")
+        self.file.flush()
+        self.count += len(items)
+
+    def reset(self) -> None:
+        """
+        それまでに書き込んだ項目を破棄する
+        """
+        if self.file is not None:
+            self.file.seek(0)
+            self.file.truncate()
+            self.file.flush()
+        self.count = 0
+
+    def close(self, keep: bool = False) -> Optional[str]:
+        """
+        ファイルを閉じる
+
+        Args:
+            keep: ファイルを残すかどうか（Falseの場合は削除する）
+
+        Returns:
+            残したファイルのパス（項目を書き込んでいない場合や削除した場合はNone）
+        """
+        if self.file is None:
+            return None
+        self.file.close()
+        self.file = None
+        if keep and self.count:
+            return self.output_file
+        os.remove(self.output_file)
+        return None
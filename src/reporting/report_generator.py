@@ -4,9 +4,17 @@
 
 import os
 import json
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, IO, List, Optional
 
+from src.analysis.resource_collapser import format_resources
 from src.config import get_settings
+from src.reporting import html_templates as templates
+
+# HTMLレポートの書き出しに使用するバッファのサイズ（バイト）
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# 問題点テーブルの行をまとめて書き出す単位（行数）
+ROWS_PER_WRITE = 500
 
 
 class ReportGenerator:
@@ -14,15 +22,21 @@ class ReportGenerator:
     分析結果からレポートを生成するクラス
     """
 
-    def __init__(self, output_dir: Optional[str] = None):
+    def __init__(self, output_dir: Optional[str] = None, html_mode: Optional[str] = None):
         """
         ReportGeneratorの初期化
 
         Args:
             output_dir: 出力ディレクトリのパス（Noneの場合は設定から取得）
+            html_mode: HTMLレポートの問題点の表示方式（auto/table/paginated）
+                （Noneの場合は設定から取得）
         """
         settings = get_settings()
-        self.output_dir = output_dir or settings["output"]["directory"]
+        output_settings = settings["output"]
+        self.output_dir = output_dir or output_settings["directory"]
+        self.html_mode = html_mode or output_settings["html_mode"]
+        self.html_paginate_threshold = output_settings["html_paginate_threshold"]
+        self.html_page_size = output_settings["html_page_size"]
         os.makedirs(self.output_dir, exist_ok=True)
 
     def save_json_report(self, results: Dict[str, Any], output_file: str) -> str:
@@ -46,13 +60,19 @@ class ReportGenerator:
 
         return output_file
 
-    def export_as_html(self, results: Dict[str, Any], output_file: str) -> str:
+    def export_as_html(
+        self, results: Dict[str, Any], output_file: str, mode: Optional[str] = None
+    ) -> str:
         """
         分析結果をHTMLファイルとして出力
 
+        HTMLはセクションごとにバッファ付きのファイルへ直接書き出す。書き出しが完了してから
+        出力ファイルに置き換えるため、途中で失敗した場合も既存のファイルは残る。
+
         Args:
             results: HTMLに変換する分析結果
             output_file: 出力HTMLファイルのパス
+            mode: 問題点の表示方式（auto/table/paginated）（Noneの場合は初期化時の値）
 
         Returns:
             保存したファイルのフルパス
@@ -61,363 +81,246 @@ class ReportGenerator:
         if not os.path.isabs(output_file):
             output_file = os.path.join(self.output_dir, os.path.basename(output_file))
 
-        # HTML生成
-        html_content = self._generate_html(results)
-
-        # ファイルに保存
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(html_content)
+        # 同じディレクトリの一時ファイルに書き出してから置き換える
+        tmp_path = f"{output_file}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f:
+                self.write_html(results, f, mode)
+            os.replace(tmp_path, output_file)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
 
         return output_file
 
-    def _generate_html(self, results: Dict[str, Any]) -> str:
+    def write_html(
+        self, results: Dict[str, Any], out: IO[str], mode: Optional[str] = None
+    ) -> None:
         """
-        分析結果からHTMLを生成
+        分析結果からHTMLを生成して書き出す
 
         Args:
             results: HTML形式に変換する分析結果
-
-        Returns:
-            生成されたHTML文字列
+            out: 書き出し先
+            mode: 問題点の表示方式（auto/table/paginated）（Noneの場合は初期化時の値）
         """
         # 解析に失敗した場合
         if "error" in results:
-            return self._generate_error_html(results["error"])
+            out.write(templates.ERROR_PAGE.render(max_width="800px", error=results["error"]))
+            return
 
         # 生のテキスト分析が含まれている場合
         if "raw_analysis" in results:
-            return self._generate_raw_analysis_html(results["raw_analysis"])
-
-        # ヘッダー部分の生成
-        html = """<!DOCTYPE html>
-<html lang="ja">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>AWS Terraform可用性分析レポート</title>
-    <style>
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-        }
-        header {
-            background-color: #0066cc;
-            color: white;
-            padding: 20px;
-            border-radius: 5px;
-            margin-bottom: 20px;
-        }
-        h1, h2, h3 {
-            margin-top: 0;
-        }
-        .score-container {
-            text-align: center;
-            margin: 30px 0;
-        }
-        .score {
-            font-size: 48px;
-            font-weight: bold;
-        }
-        .score-high {
-            color: #28a745;
-        }
-        .score-medium {
-            color: #ffc107;
-        }
-        .score-low {
-            color: #dc3545;
-        }
-        .overview {
-            background-color: #f8f9fa;
-            border-left: 5px solid #0066cc;
-            padding: 15px;
-            margin-bottom: 30px;
-        }
-        table {
-            width: 100%;
-            border-collapse: collapse;
-            margin-bottom: 30px;
-        }
-        th, td {
-            border: 1px solid #ddd;
-            padding: 12px;
-            text-align: left;
-        }
-        th {
-            background-color: #f2f2f2;
-        }
-        tr:nth-child(even) {
-            background-color: #f9f9f9;
-        }
-        .severity-high, .priority-high {
-            color: #dc3545;
-            font-weight: bold;
-        }
-        .severity-medium, .priority-medium {
-            color: #ffc107;
-            font-weight: bold;
-        }
-        .severity-low, .priority-low {
-            color: #28a745;
-            font-weight: bold;
-        }
-        .recommendation {
-            background-color: #f8f9fa;
-            border: 1px solid #ddd;
-            border-radius: 5px;
-            padding: 15px;
-            margin-bottom: 20px;
-        }
-        .recommendation h3 {
-            margin-top: 0;
-            border-bottom: 2px solid #0066cc;
-            padding-bottom: 10px;
-        }
-        pre {
-            background-color: #f5f5f5;
-            padding: 15px;
-            border-radius: 5px;
-            overflow-x: auto;
-        }
-        footer {
-            margin-top: 50px;
-            text-align: center;
-            color: #777;
-            font-size: 0.9em;
-        }
-    </style>
-</head>
-<body>
-    <header>
-        <h1>AWS Terraform可用性分析レポート</h1>
-        <p>AWS Well-Architected Frameworkの信頼性の柱に基づく評価</p>
-    </header>
-"""
+            out.write(
+                templates.RAW_ANALYSIS_PAGE.render(
+                    max_width="800px", raw_analysis=results["raw_analysis"]
+                )
+            )
+            return
+
+        # ヘッダー部分
+        out.write(templates.PAGE_HEADER.render(max_width="1200px"))
 
-        # 可用性スコアの生成
+        # 分割分析の一部のグループが失敗した場合の警告
+        if results.get("partial"):
+            out.write(
+                templates.PARTIAL_NOTICE.render(
+                    failed_chunks=", ".join(results.get("failed_chunks", []))
+                )
+            )
+
+        # 可用性スコア
         if "availability_score" in results:
             score = results["availability_score"]
             score_class = (
                 "score-high" if score >= 80 else "score-medium" if score >= 50 else "score-low"
             )
+            out.write(templates.SCORE.render(score_class=score_class, score=score))
 
-            html += f"""
-    <div class="score-container">
-        <h2>可用性スコア</h2>
-        <div class="score {score_class}">{score}/100</div>
-    </div>
-"""
-
-        # 概要の生成
+        # 概要
         if "overview" in results:
-            html += f"""
-    <section>
-        <h2>概要</h2>
-        <div class="overview">
-            <p>{results["overview"]}</p>
-        </div>
-    </section>
-"""
+            out.write(templates.OVERVIEW.render(overview=results["overview"]))
 
-        # 問題点テーブルの生成
+        # 問題点テーブル
         if "findings" in results and results["findings"]:
-            html += self._generate_findings_html(results["findings"])
+            findings = results["findings"]
+            if self._resolve_html_mode(mode, len(findings)) == "paginated":
+                self._write_findings_viewer_html(findings, out)
+            else:
+                self._write_findings_html(findings, out)
 
-        # 推奨事項の生成
+        # 推奨事項
         if "recommendations" in results and results["recommendations"]:
-            html += self._generate_recommendations_html(results["recommendations"])
-
-        # フッターと終了タグの生成
-        html += """
-    <footer>
-        <p>レポート生成: AWS Terraform可用性チェックツール</p>
-    </footer>
-</body>
-</html>
-"""
-
-        return html
+            self._write_recommendations_html(results["recommendations"], out)
+
+        # フッターと終了タグ（使用したモデルを含む）
+        out.write(templates.PAGE_FOOTER_START.render())
+        usage = results.get("model_usage")
+        if usage:
+            latency = ""
+            if usage.get("latency") is not None:
+                latency = f" / 所要時間: {usage['latency']:.1f}秒"
+            out.write(
+                templates.MODEL_USAGE.render(
+                    model_id=usage.get("model_id"), tier=usage.get("tier"), latency=latency
+                )
+            )
+        out.write(templates.PAGE_FOOTER_END.render())
 
-    def _generate_findings_html(self, findings: List[Dict[str, Any]]) -> str:
+    def _write_findings_html(self, findings: List[Dict[str, Any]], out: IO[str]) -> None:
         """
-        問題点のHTMLテーブルを生成
+        問題点のHTMLテーブルを書き出す
 
         Args:
             findings: 問題点のリスト
-
-        Returns:
-            生成されたHTML文字列
+            out: 書き出し先
         """
-        html = """
-    <section>
-        <h2>検出された問題点</h2>
-        <table>
-            <thead>
-                <tr>
-                    <th>カテゴリ</th>
-                    <th>重要度</th>
-                    <th>説明</th>
-                    <th>推奨対応</th>
-                </tr>
-            </thead>
-            <tbody>
-"""
+        out.write(templates.FINDINGS_START.render())
 
+        # 行はまとめて連結してから書き出す
+        row = templates.FINDING_ROW
+        with_resources = templates.FINDING_ROW_WITH_RESOURCES
+        rows: List[str] = []
         for finding in findings:
             severity = finding.get("severity", "")
-            severity_class = self._get_severity_class(severity)
-
-            html += f"""
-                <tr>
-                    <td>{finding.get("category", "")}</td>
-                    <td class="{severity_class}">{severity}</td>
-                    <td>{finding.get("description", "")}</td>
-                    <td>{finding.get("recommendation", "")}</td>
-                </tr>
-"""
-
-        html += """
-            </tbody>
-        </table>
-    </section>
-"""
+            values = {
+                "category": finding.get("category", ""),
+                "severity_class": self._get_severity_class(severity),
+                "severity": severity,
+                "description": finding.get("description", ""),
+                "recommendation": finding.get("recommendation", ""),
+            }
+            # 代表にまとめて分析したリソースは、同じ構成のすべてのリソースを対象として示す
+            resources = format_resources(finding.get("resources"))
+            if resources:
+                rows.append(with_resources.render(resources=resources, **values))
+            else:
+                rows.append(row.render(**values))
+            if len(rows) >= ROWS_PER_WRITE:
+                out.write("".join(rows))
+                rows = []
+        out.write("".join(rows))
+
+        out.write(templates.FINDINGS_END.render())
+
+    def _write_findings_viewer_html(self, findings: List[Dict[str, Any]], out: IO[str]) -> None:
+        """
+        問題点を1つのJSONとして埋め込み、スクリプトで表示するビューアーを書き出す
 
-        return html
+        カテゴリと重要度は一覧にまとめ、各問題点は
+        [カテゴリの番号, 重要度の番号, 説明, 推奨対応, 対象のリソース] の配列として埋め込む。
 
-    def _generate_recommendations_html(self, recommendations: List[Dict[str, Any]]) -> str:
+        Args:
+            findings: 問題点のリスト
+            out: 書き出し先
+        """
+        categories: Dict[str, int] = {}
+        severities: Dict[str, int] = {}
+        for finding in findings:
+            categories.setdefault(self._text(finding.get("category")), len(categories))
+            severities.setdefault(self._text(finding.get("severity")), len(severities))
+
+        out.write(templates.FINDINGS_VIEWER_START.render())
+        header = {
+            "page_size": self.html_page_size,
+            "categories": list(categories),
+            "severities": list(severities),
+            "severity_classes": [self._get_severity_class(severity) for severity in severities],
+        }
+        out.write(self._script_json(header)[:-1] + ',"rows":[')
+
+        # 行はまとめてJSONに変換し、配列の括弧を除いて書き出す
+        for start in range(0, len(findings), ROWS_PER_WRITE):
+            rows = [
+                [
+                    categories[self._text(finding.get("category"))],
+                    severities[self._text(finding.get("severity"))],
+                    self._text(finding.get("description")),
+                    self._text(finding.get("recommendation")),
+                    format_resources(finding.get("resources")),
+                ]
+                for finding in findings[start:start + ROWS_PER_WRITE]
+            ]
+            out.write(("," if start else "") + self._script_json(rows)[1:-1])
+        out.write("]}")
+
+        out.write(templates.FINDINGS_VIEWER_END.render())
+
+    def _resolve_html_mode(self, mode: Optional[str], finding_count: int) -> str:
         """
-        推奨事項のHTMLを生成
+        問題点の表示方式を決定
 
         Args:
-            recommendations: 推奨事項のリスト
+            mode: 指定された表示方式（Noneの場合は初期化時の値）
+            finding_count: 問題点の件数
 
         Returns:
-            生成されたHTML文字列
+            tableまたはpaginated
         """
-        html = """
-    <section>
-        <h2>改善推奨事項</h2>
-"""
-
-        for i, rec in enumerate(recommendations, 1):
-            priority = rec.get("priority", "")
-            priority_class = self._get_severity_class(priority)
-
-            html += f"""
-        <div class="recommendation">
-            <h3>推奨事項 {i}: <span class="{priority_class}">優先度: {priority}</span></h3>
-            <p>{rec.get("description", "")}</p>
-"""
-
-            if "terraform_example" in rec and rec["terraform_example"]:
-                html += f"""
-            <h4>実装例:</h4>
-            <pre><code>{rec["terraform_example"]}</code></pre>
-"""
+        mode = mode or self.html_mode
+        if mode == "auto":
+            return "paginated" if finding_count >= self.html_paginate_threshold else "table"
+        return "paginated" if mode == "paginated" else "table"
 
-            html += """
-        </div>
-"""
+    @staticmethod
+    def _text(value: Any) -> str:
+        """
+        問題点の値を文字列に変換（Noneの場合は空文字列）
 
-        html += """
-    </section>
-"""
+        Args:
+            value: 値
 
-        return html
+        Returns:
+            文字列
+        """
+        return "" if value is None else str(value)
 
-    def _generate_error_html(self, error: str) -> str:
+    @staticmethod
+    def _script_json(value: Any) -> str:
         """
-        エラーメッセージのHTMLを生成
+        scriptタグに埋め込むJSONを作成（タグの終了などと解釈される文字をエスケープする）
 
         Args:
-            error: エラーメッセージ
+            value: JSONに変換する値
 
         Returns:
-            生成されたHTML文字列
+            JSON文字列
         """
-        return f"""<!DOCTYPE html>
-<html lang="ja">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>AWS Terraform可用性分析エラー</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 800px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-        .error {{
-            background-color: #f8d7da;
-            border: 1px solid #f5c6cb;
-            color: #721c24;
-            padding: 20px;
-            border-radius: 5px;
-            margin: 20px 0;
-        }}
-    </style>
-</head>
-<body>
-    <h1>AWS Terraform可用性分析エラー</h1>
-    <div class="error">
-        <h2>分析実行中にエラーが発生しました</h2>
-        <p>{error}</p>
-    </div>
-</body>
-</html>
-"""
+        text = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        return text.replace("<", "\\u003c").replace(">", "\\u003e").replace("&", "\\u0026")
 
-    def _generate_raw_analysis_html(self, raw_analysis: str) -> str:
+    def _write_recommendations_html(
+        self, recommendations: List[Dict[str, Any]], out: IO[str]
+    ) -> None:
         """
-        生のテキスト分析のHTMLを生成
+        推奨事項のHTMLを書き出す
 
         Args:
-            raw_analysis: 生の分析テキスト
-
-        Returns:
-            生成されたHTML文字列
+            recommendations: 推奨事項のリスト
+            out: 書き出し先
         """
-        return f"""<!DOCTYPE html>
-<html lang="ja">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>AWS Terraform可用性分析レポート</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 800px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-        .raw-analysis {{
-            white-space: pre-wrap;
-            background-color: #f8f9fa;
-            border: 1px solid #ddd;
-            padding: 20px;
-            border-radius: 5px;
-        }}
-    </style>
-</head>
-<body>
-    <h1>AWS Terraform可用性分析レポート</h1>
-    <div class="raw-analysis">
-        {raw_analysis}
-    </div>
-</body>
-</html>
-"""
+        out.write(templates.RECOMMENDATIONS_START.render())
+
+        for i, rec in enumerate(recommendations, 1):
+            priority = rec.get("priority", "")
+            out.write(
+                templates.RECOMMENDATION_START.render(
+                    index=i,
+                    priority_class=self._get_severity_class(priority),
+                    priority=priority,
+                    description=rec.get("description", ""),
+                )
+            )
+
+            if "terraform_example" in rec and rec["terraform_example"]:
+                out.write(templates.RECOMMENDATION_EXAMPLE.render(example=rec["terraform_example"]))
+
+            out.write(templates.RECOMMENDATION_END.render())
+
+        out.write(templates.RECOMMENDATIONS_END.render())
 
-    def _get_severity_class(self, severity: str) -> str:
+    def _get_severity_class(self, severity: Any) -> str:
         """
         重要度に対応するCSSクラスを取得
 
@@ -427,7 +330,7 @@ class ReportGenerator:
         Returns:
             対応するCSSクラス
         """
-        severity = severity.lower()
+        severity = str(severity).lower()
         if severity in ["高", "high"]:
             return "severity-high"
         elif severity in ["中", "medium"]:
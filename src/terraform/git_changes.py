@@ -0,0 +1,159 @@
+"""
+ローカルのgitリポジトリの変更から、解析・分析の対象とするルートとリソースを求めるモジュール
+"""
+
+import os
+import subprocess
+from typing import Any, Dict, List, Optional, Set
+
+from src.terraform.parse_cache import (
+    FINGERPRINT_FILENAMES,
+    FINGERPRINT_SUFFIXES,
+    collect_terraform_files,
+)
+from src.terraform.resource_utils import iter_resources, resource_address
+
+
+def changed_terraform_files(terraform_path: str, ref: str) -> Optional[List[str]]:
+    """
+    指定したリビジョンから変更されたTerraformのファイルを取得
+
+    リビジョンと作業ツリーの差分（コミットしていない変更を含む）と、
+    追跡されていないファイルを対象とする。リモートへのアクセスは行わない。
+
+    Args:
+        terraform_path: Terraformプロジェクトのパス（gitリポジトリ内）
+        ref: 比較するリビジョン（ブランチ名、タグ、コミットなど）
+
+    Returns:
+        変更された（削除を含む）ファイルの絶対パスのリスト（gitの実行に失敗した場合はNone）
+    """
+    top_level = run_git(terraform_path, ["rev-parse", "--show-toplevel"])
+    if top_level is None:
+        return None
+    top_level = top_level.strip()
+    if run_git(top_level, ["rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"]) is None:
+        print(f"エラー: リビジョン {ref} が見つかりません。")
+        return None
+
+    diff = run_git(top_level, ["diff", "--name-only", "-z", ref, "--"])
+    untracked = run_git(top_level, ["ls-files", "--others", "--exclude-standard", "-z"])
+    if diff is None or untracked is None:
+        return None
+
+    files = []
+    for name in (diff + untracked).split("\0"):
+        if name and is_terraform_file(name):
+            files.append(os.path.realpath(os.path.join(top_level, name)))
+    return sorted(set(files))
+
+
+def is_terraform_file(path: str) -> bool:
+    """
+    解析結果に影響するTerraformのファイルかどうかを判定
+
+    Args:
+        path: ファイルのパス
+
+    Returns:
+        .tf・.tfvarsファイルなどの場合はTrue
+    """
+    name = os.path.basename(path)
+    return name.endswith(FINGERPRINT_SUFFIXES) or name in FINGERPRINT_FILENAMES
+
+
+def affected_roots(roots: List[str], changed_files: List[str]) -> Dict[str, List[str]]:
+    """
+    変更されたファイルを含むルートを求める
+
+    ルートのディレクトリと、ルートから参照されるローカルモジュールのディレクトリに
+    含まれるファイルを、そのルートのファイルとみなす（削除されたファイルも
+    ディレクトリで判定する）。
+
+    Args:
+        roots: ルートディレクトリの絶対パスのリスト
+        changed_files: 変更されたファイルの絶対パスのリスト
+
+    Returns:
+        変更されたファイルを含むルートごとの変更されたファイルのリスト（rootsの順序）
+    """
+    result: Dict[str, List[str]] = {}
+    for root in roots:
+        root = os.path.realpath(root)
+        directories = {root}
+        directories.update(
+            os.path.dirname(path) for path in collect_terraform_files(root)
+        )
+        files = [path for path in changed_files if os.path.dirname(path) in directories]
+        if files:
+            result[root] = files
+    return result
+
+
+def changed_resource_addresses(
+    terraform_data: Dict[str, Any], terraform_path: str, affected: Dict[str, List[str]]
+) -> Set[str]:
+    """
+    変更されたファイルで定義されたリソースのアドレスを求める
+
+    リソースを定義していないファイル（変数、.tfvars、削除されたファイルなど）が
+    変更された場合は、そのファイルを含むルートのすべてのリソースを対象とする。
+
+    Args:
+        terraform_data: 変更されたルートの解析結果
+        terraform_path: Terraformプロジェクトのパス
+        affected: affected_rootsの戻り値
+
+    Returns:
+        リソースのアドレスの集合
+    """
+    base_path = os.path.realpath(terraform_path)
+    resources = []
+    for resource_type, block in iter_resources(terraform_data):
+        meta = block.get("__tfmeta")
+        if not isinstance(meta, dict) or not meta.get("filename"):
+            continue
+        # 並列解析のファイル名はプロジェクトから、それ以外はルートからの相対パス
+        root = os.path.realpath(os.path.join(base_path, str(meta.get("root") or ".")))
+        filename = os.path.realpath(os.path.join(base_path, str(meta["filename"])))
+        resources.append((resource_address(resource_type, block), root, filename))
+
+    defined = {filename for _, _, filename in resources}
+    whole_roots = {
+        root for root, files in affected.items() if any(path not in defined for path in files)
+    }
+    changed = {path for files in affected.values() for path in files}
+    return {
+        address
+        for address, root, filename in resources
+        if filename in changed or root in whole_roots
+    }
+
+
+def run_git(directory: str, args: List[str]) -> Optional[str]:
+    """
+    gitコマンドを実行する
+
+    Args:
+        directory: 実行するディレクトリ
+        args: gitコマンドの引数
+
+    Returns:
+        標準出力（失敗した場合はNone）
+    """
+    try:
+        completed = subprocess.run(
+            ["git", "-C", directory, *args],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=False,
+        )
+    except OSError as e:
+        print(f"エラー: gitを実行できません: {e}")
+        return None
+    if completed.returncode != 0:
+        message = completed.stderr.decode("utf-8", errors="replace").strip()
+        if message:
+            print(f"エラー: git {args[0]} に失敗しました: {message}")
+        return None
+    return completed.stdout.decode("utf-8", errors="replace")
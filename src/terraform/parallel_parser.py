@@ -0,0 +1,230 @@
+"""
+複数のTerraformルートをプロセスプールで並列に解析するモジュール
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.config import get_settings
+from src.terraform.parse_cache import local_module_sources
+
+# 走査対象から除外するディレクトリ
+IGNORED_DIRECTORIES = (".git", ".terraform")
+
+# タイムアウト確認の間隔（秒）
+POLL_INTERVAL = 0.5
+
+
+def find_terraform_roots(terraform_path: str) -> List[str]:
+    """
+    Terraformプロジェクト内のルート（モジュール・環境）ディレクトリを検出
+
+    .tfファイルを含むディレクトリをルートとみなす。ただし、他のルートから
+    ローカルモジュールとして参照されているディレクトリは参照元の解析に
+    含まれるため、独立したルートとしては扱わない。
+
+    Args:
+        terraform_path: Terraformプロジェクトのパス
+
+    Returns:
+        ルートディレクトリの絶対パスのリスト
+    """
+    candidates: List[str] = []
+    referenced: Set[str] = set()
+
+    for current_dir, dir_names, file_names in os.walk(os.path.abspath(terraform_path)):
+        dir_names[:] = sorted(d for d in dir_names if d not in IGNORED_DIRECTORIES)
+        tf_files = [name for name in file_names if name.endswith(".tf")]
+        if not tf_files:
+            continue
+        candidates.append(os.path.realpath(current_dir))
+        for name in tf_files:
+            for source in local_module_sources(os.path.join(current_dir, name)):
+                referenced.add(os.path.realpath(os.path.join(current_dir, source)))
+
+    return [root for root in candidates if root not in referenced]
+
+
+def parse_root(root: str) -> Dict[str, Any]:
+    """
+    単一のTerraformルートを解析する（プロセスプールのワーカーで実行）
+
+    Args:
+        root: Terraformルートのパス
+
+    Returns:
+        解析結果
+    """
+    from tfparse import load_from_path
+
+    parsed = load_from_path(root)
+    parsed.pop("__tfmeta", None)
+    return dict(parsed)
+
+
+class ParallelTerraformParser:
+    """
+    Terraformルートごとの解析をプロセスプールで並列実行するクラス
+    """
+
+    def __init__(self, workers: Optional[int] = None, root_timeout: Optional[float] = None):
+        """
+        ParallelTerraformParserの初期化
+
+        Args:
+            workers: ワーカープロセス数（Noneまたは0の場合は設定、次いでCPUコア数）
+            root_timeout: ルートごとの解析タイムアウト（秒）（Noneの場合は設定から取得）
+        """
+        settings = get_settings()
+        terraform_settings = settings["terraform"]
+        self.workers = workers or terraform_settings["workers"] or os.cpu_count() or 1
+        self.root_timeout = root_timeout or terraform_settings["root_timeout"]
+        self.failed_roots: List[Tuple[str, str]] = []
+
+    def parse(self, terraform_path: str, roots: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Terraformプロジェクト内の各ルートを並列に解析し、結果を統合する
+
+        Args:
+            terraform_path: Terraformプロジェクトのパス
+            roots: 解析するルートの絶対パスのリスト（Noneの場合はプロジェクト内のすべてのルート）
+
+        Returns:
+            リソースタイプをキーとする統合された解析結果
+        """
+        base_path = os.path.realpath(terraform_path)
+        if roots is None:
+            roots = find_terraform_roots(terraform_path)
+        self.failed_roots = []
+
+        if not roots:
+            return {}
+
+        print(f"検出されたTerraformルート: {len(roots)}個 (ワーカー数: {self.workers})")
+
+        results = self._run(roots)
+
+        merged: Dict[str, Any] = {}
+        for root in roots:
+            if root in results:
+                self._merge(merged, results[root], os.path.relpath(root, base_path))
+
+        for root, reason in self.failed_roots:
+            print(f"警告: {os.path.relpath(root, base_path)} の解析に失敗しました: {reason}")
+
+        return merged
+
+    def _run(self, roots: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        プロセスプールで各ルートを解析する
+
+        ルートはワーカー数までずつ投入し、空いたワーカーに次のルートを投入する。
+        これにより投入した時点からの経過時間がそのルートの解析時間となる。
+        タイムアウトしたルートがある場合は、ワーカーを停止して
+        未完了のルートを新しいプロセスプールで再実行する。
+
+        Args:
+            roots: 解析するルートのリスト
+
+        Returns:
+            ルートのパスをキーとする解析結果
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        remaining = list(roots)
+
+        while remaining:
+            # tfparseはGoランタイムを使用しておりfork後の子プロセスで停止することがあるため、
+            # ワーカーはspawn方式で起動する
+            max_workers = min(self.workers, len(remaining))
+            executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            queued = remaining
+            remaining = []
+            futures: Dict["Future[Dict[str, Any]]", str] = {}
+            started: Dict["Future[Dict[str, Any]]", float] = {}
+            pending: Set["Future[Dict[str, Any]]"] = set()
+            timed_out = False
+
+            while queued or pending:
+                # 呼び出しキューで待機させないよう、実行中のルートがワーカー数未満の場合のみ投入する
+                while queued and len(pending) < max_workers:
+                    root = queued.pop(0)
+                    future = executor.submit(parse_root, root)
+                    futures[future] = root
+                    started[future] = time.monotonic()
+                    pending.add(future)
+
+                done, pending = wait(pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    root = futures[future]
+                    try:
+                        results[root] = future.result()
+                    except Exception as e:
+                        self.failed_roots.append((root, str(e)))
+
+                now = time.monotonic()
+                expired = [
+                    future for future in pending if now - started[future] > self.root_timeout
+                ]
+                if expired:
+                    for future in expired:
+                        self.failed_roots.append(
+                            (futures[future], f"タイムアウト ({self.root_timeout}秒)")
+                        )
+                    remaining = [
+                        futures[future] for future in pending if future not in expired
+                    ] + queued
+                    timed_out = True
+                    break
+
+            if timed_out:
+                self._terminate(executor)
+            else:
+                executor.shutdown(wait=True)
+
+        return results
+
+    @staticmethod
+    def _terminate(executor: ProcessPoolExecutor) -> None:
+        """
+        応答しないワーカーを含むプロセスプールを強制終了する
+
+        Args:
+            executor: 終了するプロセスプール
+        """
+        processes = getattr(executor, "_processes", None) or {}
+        for process in list(processes.values()):
+            process.terminate()
+        executor.shutdown(wait=False)
+
+    @staticmethod
+    def _merge(merged: Dict[str, Any], parsed: Dict[str, Any], root: str) -> None:
+        """
+        ルートごとの解析結果をリソースタイプ単位で統合する
+
+        各ブロックの __tfmeta にはルートのパスを追加し、ファイル名を
+        プロジェクトからの相対パスに変換する。
+
+        Args:
+            merged: 統合先の解析結果（この辞書が更新される）
+            parsed: ルートの解析結果
+            root: プロジェクトからのルートの相対パス
+        """
+        for resource_type, blocks in parsed.items():
+            if not isinstance(blocks, list):
+                merged.setdefault(resource_type, blocks)
+                continue
+            for block in blocks:
+                meta = block.get("__tfmeta") if isinstance(block, dict) else None
+                if isinstance(meta, dict):
+                    meta["root"] = root.replace(os.sep, "/")
+                    if "filename" in meta:
+                        meta["filename"] = os.path.normpath(
+                            os.path.join(root, meta["filename"])
+                        ).replace(os.sep, "/")
+            merged.setdefault(resource_type, []).extend(blocks)
@@ -0,0 +1,245 @@
+"""
+Terraform解析結果をディスクにキャッシュするモジュール
+"""
+
+import hashlib
+import os
+import re
+from typing import Any, Dict, List, Optional, cast
+
+from src.cache.disk_cache import DiskCache
+from src.config import get_settings
+
+# キャッシュ形式のバージョン（形式を変更した場合は値を上げて古いエントリを無効化する）
+CACHE_FORMAT_VERSION = "2"
+
+# フィンガープリントの対象とするファイル
+FINGERPRINT_SUFFIXES = (".tf", ".tf.json", ".tfvars", ".tfvars.json")
+FINGERPRINT_FILENAMES = (".terraform.lock.hcl",)
+
+# ローカルモジュールの参照（source = "./..." または "../..."）
+LOCAL_MODULE_SOURCE_PATTERN = re.compile(r'source\s*=\s*"(\.{1,2}/[^"]*)"')
+
+
+class TreeFingerprint:
+    """
+    Terraformプロジェクトのファイル構成から計算したフィンガープリント
+
+    ファイルのパス・サイズ・更新時刻から計算するキーを優先的に使い、
+    一致しない場合のみファイル内容のハッシュから計算するキーを使用する。
+    """
+
+    def __init__(self, root: str, files: List[str], mode: str = "") -> None:
+        """
+        TreeFingerprintの初期化
+
+        Args:
+            root: Terraformプロジェクトのパス
+            files: フィンガープリントの対象ファイル（絶対パス）
+            mode: 解析モード（モードごとに別のキャッシュエントリとする）
+        """
+        self.root = root
+        self.files = files
+        self.mode = mode
+        self.stat_key = self._compute_stat_key()
+        self._content_key: Optional[str] = None
+
+    @property
+    def content_key(self) -> str:
+        """
+        ファイル内容のハッシュから計算したキー（初回アクセス時に計算）
+        """
+        if self._content_key is None:
+            digest = self._new_digest()
+            for path in self.files:
+                digest.update(self._relative(path).encode("utf-8"))
+                digest.update(b"\0")
+                try:
+                    with open(path, "rb") as f:
+                        digest.update(hashlib.sha256(f.read()).digest())
+                except OSError:
+                    digest.update(b"<missing>")
+            self._content_key = digest.hexdigest()
+        return self._content_key
+
+    def _compute_stat_key(self) -> str:
+        """
+        ファイルのパス・サイズ・更新時刻からキーを計算
+
+        親ディレクトリとその配下のルートは同じファイル構成になりうるため、
+        ルートの絶対パスもキーに含める。
+
+        Returns:
+            キー文字列
+        """
+        digest = self._new_digest()
+        digest.update(f"{os.path.abspath(self.root)}\0".encode("utf-8"))
+        for path in self.files:
+            digest.update(os.path.abspath(path).encode("utf-8"))
+            try:
+                stat = os.stat(path)
+                digest.update(f"\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+            except OSError:
+                digest.update(b"\0<missing>\n")
+        return digest.hexdigest()
+
+    def _new_digest(self) -> "hashlib._Hash":
+        """
+        キャッシュ形式と解析モードを含めたハッシュオブジェクトを作成
+
+        Returns:
+            ハッシュオブジェクト
+        """
+        digest = hashlib.sha256()
+        digest.update(f"v{CACHE_FORMAT_VERSION}\0{self.mode}\0".encode("utf-8"))
+        return digest
+
+    def _relative(self, path: str) -> str:
+        """
+        プロジェクトのルートからの相対パスを取得
+
+        Args:
+            path: ファイルパス
+
+        Returns:
+            相対パス
+        """
+        return os.path.relpath(path, self.root).replace(os.sep, "/")
+
+
+class ParseCache:
+    """
+    Terraformの解析結果をフィンガープリント単位でキャッシュするクラス
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_size_mb: Optional[int] = None):
+        """
+        ParseCacheの初期化
+
+        Args:
+            directory: キャッシュディレクトリのパス（Noneの場合は設定から取得）
+            max_size_mb: キャッシュの最大サイズ（MB）（Noneの場合は設定から取得）
+        """
+        settings = get_settings()
+        cache_settings = settings["cache"]
+        directory = directory or os.path.join(cache_settings["directory"], "parse")
+        max_size_mb = max_size_mb or cache_settings["parse"]["max_size_mb"]
+        self.store = DiskCache(directory, max_size_bytes=max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprint(self, terraform_path: str, mode: str = "") -> TreeFingerprint:
+        """
+        Terraformプロジェクトのフィンガープリントを計算
+
+        terraform_path配下のファイルに加え、ローカルモジュールとして参照されている
+        ディレクトリのファイルも対象に含める。
+
+        Args:
+            terraform_path: Terraformプロジェクトのパス
+            mode: 解析モード
+
+        Returns:
+            フィンガープリント
+        """
+        root = os.path.abspath(terraform_path)
+        return TreeFingerprint(root, collect_terraform_files(root), mode)
+
+    def get(self, fingerprint: TreeFingerprint) -> Optional[Dict[str, Any]]:
+        """
+        キャッシュから解析結果を取得
+
+        Args:
+            fingerprint: Terraformプロジェクトのフィンガープリント
+
+        Returns:
+            キャッシュされた解析結果（存在しない場合はNone）
+        """
+        # まずパス・サイズ・更新時刻のキーで検索
+        content_key = self.store.get(f"stat-{fingerprint.stat_key}")
+        if content_key is not None:
+            parsed = self.store.get(f"parse-{content_key}")
+            if parsed is not None:
+                self.hits += 1
+                return cast(Dict[str, Any], parsed)
+
+        # 更新時刻だけが変わった場合に備えてファイル内容のキーで検索
+        parsed = self.store.get(f"parse-{fingerprint.content_key}")
+        if parsed is not None:
+            self.store.put(f"stat-{fingerprint.stat_key}", fingerprint.content_key)
+            self.hits += 1
+            return cast(Dict[str, Any], parsed)
+
+        self.misses += 1
+        return None
+
+    def put(self, fingerprint: TreeFingerprint, parsed: Dict[str, Any]) -> None:
+        """
+        解析結果をキャッシュに保存
+
+        Args:
+            fingerprint: Terraformプロジェクトのフィンガープリント
+            parsed: 解析結果
+        """
+        try:
+            self.store.put(f"parse-{fingerprint.content_key}", parsed)
+            self.store.put(f"stat-{fingerprint.stat_key}", fingerprint.content_key)
+        except Exception as e:
+            # キャッシュへの保存に失敗しても解析結果は利用できるため警告のみ
+            print(f"警告: 解析結果のキャッシュ保存に失敗しました: {e}")
+
+
+def collect_terraform_files(root: str) -> List[str]:
+    """
+    フィンガープリントの対象となるファイルを収集
+
+    Args:
+        root: Terraformプロジェクトのパス（絶対パス）
+
+    Returns:
+        ソート済みのファイルパスのリスト
+    """
+    files = set()
+    pending = [root]
+    visited = set()
+
+    while pending:
+        directory = os.path.realpath(pending.pop())
+        if directory in visited or not os.path.isdir(directory):
+            continue
+        visited.add(directory)
+
+        for current_dir, dir_names, file_names in os.walk(directory):
+            dir_names[:] = sorted(d for d in dir_names if d != ".git")
+            for file_name in file_names:
+                if not (
+                    file_name.endswith(FINGERPRINT_SUFFIXES)
+                    or file_name in FINGERPRINT_FILENAMES
+                ):
+                    continue
+                path = os.path.join(current_dir, file_name)
+                files.add(path)
+
+                # ローカルモジュールの参照先も対象に含める
+                if file_name.endswith(".tf"):
+                    for source in local_module_sources(path):
+                        pending.append(os.path.join(current_dir, source))
+
+    return sorted(files)
+
+
+def local_module_sources(path: str) -> List[str]:
+    """
+    .tfファイル内のローカルモジュール参照を抽出
+
+    Args:
+        path: .tfファイルのパス
+
+    Returns:
+        ローカルモジュールの相対パスのリスト
+    """
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return LOCAL_MODULE_SOURCE_PATTERN.findall(f.read())
+    except OSError:
+        return []
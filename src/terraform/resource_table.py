@@ -0,0 +1,555 @@
+"""
+tfparseの解析結果をリソースタイプごとの列指向のテーブルに変換するモジュール
+
+よく参照する属性を列として配列に保持し、「multi_azがfalseのaws_db_instance」のような
+条件をリソースごとのPythonのループではなく、列全体に対する演算で評価する。
+"""
+
+import sys
+from array import array
+from itertools import compress
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.terraform.resource_utils import iter_resources, resource_address
+
+# 列の値の状態
+VALUE = 0  # 値を変換できた
+MISSING = 1  # 属性が存在しない
+UNRESOLVED = 2  # 変数や他のリソースの属性への参照が解決できていない
+INVALID = 3  # 解決済みだが列の種類に変換できない
+
+# 列の種類と値を保持する配列の型コード
+COLUMN_KINDS = {
+    # 真偽値（"true"/"false"の文字列を含む）
+    "bool": "B",
+    # 整数（数値と数字のみの文字列を含む。真偽値は変換しない）
+    "int": "q",
+    # 文字列（StringPoolのコード）
+    "str": "l",
+    # リストの要素数（すべての要素が解決済みの場合のみ）
+    "length": "q",
+    # ネストしたブロックの数
+    "blocks": "q",
+}
+
+# 属性が存在しないことを表す値
+_ABSENT = object()
+
+# ネストしたブロックが未解決であることを表す値
+_UNRESOLVED_BLOCK = object()
+
+
+def _state_table(*states: int) -> bytes:
+    """
+    状態の列をマスクに変換するbytes.translate用の変換表を作成
+
+    Args:
+        states: マスクを1にする状態
+
+    Returns:
+        変換表
+    """
+    return bytes(1 if i in states else 0 for i in range(256))
+
+
+_IS_VALUE = _state_table(VALUE)
+_IS_MISSING = _state_table(MISSING)
+_IS_UNRESOLVED = _state_table(UNRESOLVED)
+_IS_KNOWN = _state_table(VALUE, INVALID)
+_IS_FALSE = _state_table(0)
+
+
+class Mask:
+    """
+    テーブルの行ごとの真偽値（1行1バイトの0/1）
+
+    論理演算はバイト列を整数として一括で計算する。
+    """
+
+    __slots__ = ("bits",)
+
+    def __init__(self, bits: bytes) -> None:
+        """
+        Maskの初期化
+
+        Args:
+            bits: 行ごとの0/1のバイト列
+        """
+        self.bits = bits
+
+    @classmethod
+    def full(cls, size: int, value: bool) -> "Mask":
+        """
+        すべての行が同じ値のマスクを作成
+
+        Args:
+            size: 行数
+            value: 値
+
+        Returns:
+            Mask
+        """
+        return cls((b"\x01" if value else b"\x00") * size)
+
+    def _combine(self, other: "Mask", operator: Callable[[int, int], int]) -> "Mask":
+        size = len(self.bits)
+        if len(other.bits) != size:
+            raise ValueError("行数が異なるマスクは組み合わせられません")
+        value = operator(int.from_bytes(self.bits, "little"), int.from_bytes(other.bits, "little"))
+        return Mask(value.to_bytes(size, "little"))
+
+    def __and__(self, other: "Mask") -> "Mask":
+        return self._combine(other, int.__and__)
+
+    def __or__(self, other: "Mask") -> "Mask":
+        return self._combine(other, int.__or__)
+
+    def __invert__(self) -> "Mask":
+        return Mask(self.bits.translate(_IS_FALSE))
+
+    def __len__(self) -> int:
+        return len(self.bits)
+
+    def count(self) -> int:
+        """
+        値が1の行数を取得
+
+        Returns:
+            行数
+        """
+        return self.bits.count(1)
+
+    def indices(self) -> List[int]:
+        """
+        値が1の行番号を取得
+
+        Returns:
+            行番号のリスト（昇順）
+        """
+        return list(compress(range(len(self.bits)), self.bits))
+
+
+class StringPool:
+    """
+    テーブル全体で共有する文字列の辞書
+
+    同じ文字列は1つのオブジェクトにまとめ（sys.intern）、列には整数のコードを保持する。
+    """
+
+    def __init__(self) -> None:
+        """
+        StringPoolの初期化
+        """
+        self.codes: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def intern(self, value: str) -> int:
+        """
+        文字列を登録してコードを取得
+
+        Args:
+            value: 文字列
+
+        Returns:
+            コード
+        """
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.strings)
+            value = sys.intern(value)
+            self.codes[value] = code
+            self.strings.append(value)
+        return code
+
+    def lookup(self, value: str) -> int:
+        """
+        登録済みの文字列のコードを取得
+
+        Args:
+            value: 文字列
+
+        Returns:
+            コード（登録されていない場合は-1）
+        """
+        return self.codes.get(value, -1)
+
+
+def _is_unresolved(value: Any) -> bool:
+    """
+    属性値が未解決かどうかを判定
+
+    Args:
+        value: 属性値
+
+    Returns:
+        Noneや未解決の参照の場合はTrue
+    """
+    if value is None:
+        return True
+    if isinstance(value, dict) and "__attribute__" in value:
+        return True
+    return isinstance(value, str) and value.startswith("${")
+
+
+def _nested_blocks(value: Any) -> Optional[List[Dict[str, Any]]]:
+    """
+    ネストしたブロックをリストとして取得（tfparseは1つの場合は辞書、複数の場合はリストを返す）
+
+    Args:
+        value: ネストしたブロックの属性値
+
+    Returns:
+        ブロックのリスト（ネストしたブロックでない場合はNone）
+    """
+    if isinstance(value, dict) and "__attribute__" not in value:
+        return [value]
+    if isinstance(value, list):
+        return [item for item in value if isinstance(item, dict)]
+    return None
+
+
+def _nested_value(block: Dict[str, Any], parent: str, child: str) -> Any:
+    """
+    最初のネストしたブロックの属性値を取得
+
+    Args:
+        block: リソースブロック
+        parent: ネストしたブロックの名前
+        child: 属性名
+
+    Returns:
+        属性値（ブロックまたは属性が存在しない場合は_ABSENT、
+        ブロックが未解決の場合は_UNRESOLVED_BLOCK）
+    """
+    nested = block.get(parent, _ABSENT)
+    if nested is _ABSENT:
+        return _ABSENT
+    nested_blocks = _nested_blocks(nested)
+    if not nested_blocks:
+        return _UNRESOLVED_BLOCK
+    return nested_blocks[0].get(child, _ABSENT)
+
+
+def _convert_bool(value: Any, pool: StringPool) -> Tuple[int, int]:
+    """真偽値の列の値に変換（値の状態, 値）"""
+    if isinstance(value, bool):
+        return VALUE, int(value)
+    if isinstance(value, str) and value.lower() in ("true", "false"):
+        return VALUE, int(value.lower() == "true")
+    return (UNRESOLVED if _is_unresolved(value) else INVALID), 0
+
+
+def _convert_int(value: Any, pool: StringPool) -> Tuple[int, int]:
+    """整数の列の値に変換（値の状態, 値）"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return VALUE, int(value)
+    if isinstance(value, str) and value.strip().isdigit():
+        return VALUE, int(value)
+    return (UNRESOLVED if _is_unresolved(value) else INVALID), 0
+
+
+def _convert_str(value: Any, pool: StringPool) -> Tuple[int, int]:
+    """文字列の列の値（StringPoolのコード）に変換（値の状態, 値）"""
+    if _is_unresolved(value):
+        return UNRESOLVED, -1
+    if isinstance(value, str):
+        return VALUE, pool.intern(value)
+    return INVALID, -1
+
+
+def _convert_length(value: Any, pool: StringPool) -> Tuple[int, int]:
+    """リストの要素数の列の値に変換（値の状態, 値）"""
+    if isinstance(value, list):
+        if any(_is_unresolved(item) for item in value):
+            return UNRESOLVED, 0
+        return VALUE, len(value)
+    return (UNRESOLVED if _is_unresolved(value) else INVALID), 0
+
+
+def _convert_blocks(value: Any, pool: StringPool) -> Tuple[int, int]:
+    """ネストしたブロックの数の列の値に変換（値の状態, 値）"""
+    blocks = _nested_blocks(value)
+    if blocks is None:
+        return (UNRESOLVED if _is_unresolved(value) else INVALID), 0
+    return VALUE, len(blocks)
+
+
+_CONVERTERS: Dict[str, Callable[[Any, StringPool], Tuple[int, int]]] = {
+    "bool": _convert_bool,
+    "int": _convert_int,
+    "str": _convert_str,
+    "length": _convert_length,
+    "blocks": _convert_blocks,
+}
+
+
+class Column:
+    """
+    1つの属性の値を保持する列
+
+    値の状態（VALUE/MISSING/UNRESOLVED/INVALID）と値を別々の配列に保持する。
+    値の状態がVALUE以外の行の値は0（文字列の場合は-1）とする。
+    """
+
+    def __init__(self, name: str, kind: str, pool: StringPool) -> None:
+        """
+        Columnの初期化
+
+        Args:
+            name: 属性名（「ブロック名.属性名」の場合は最初のネストしたブロックの属性）
+            kind: 列の種類（COLUMN_KINDSのキー）
+            pool: 文字列の辞書
+        """
+        if kind not in COLUMN_KINDS:
+            raise ValueError(f"未対応の列の種類です: {kind}")
+        self.name = name
+        self.kind = kind
+        self.pool = pool
+        self.states = b""
+        self.values: "array[int]" = array(COLUMN_KINDS[kind])
+
+    def load(self, blocks: Iterable[Dict[str, Any]]) -> None:
+        """
+        リソースブロックから列の値を取り出す
+
+        Args:
+            blocks: リソースブロック（テーブルの行の順序）
+        """
+        convert = _CONVERTERS[self.kind]
+        pool = self.pool
+        empty = -1 if self.kind == "str" else 0
+        parent, _, child = self.name.rpartition(".")
+        if parent:
+            raw = [_nested_value(block, parent, child) for block in blocks]
+        else:
+            raw = [block.get(child, _ABSENT) for block in blocks]
+
+        states: List[int] = []
+        values: List[int] = []
+        for value in raw:
+            if value is _ABSENT:
+                states.append(MISSING)
+                values.append(empty)
+            elif value is _UNRESOLVED_BLOCK:
+                states.append(UNRESOLVED)
+                values.append(empty)
+            else:
+                state, converted = convert(value, pool)
+                states.append(state)
+                values.append(converted)
+        self.states = bytes(states)
+        self.values = array(COLUMN_KINDS[self.kind], values)
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def has_value(self) -> Mask:
+        """値を変換できた行"""
+        return Mask(self.states.translate(_IS_VALUE))
+
+    def is_missing(self) -> Mask:
+        """属性が存在しない行"""
+        return Mask(self.states.translate(_IS_MISSING))
+
+    def is_unresolved(self) -> Mask:
+        """値が未解決の行"""
+        return Mask(self.states.translate(_IS_UNRESOLVED))
+
+    def is_known(self) -> Mask:
+        """属性が存在し、値が解決済みの行（列の種類に変換できない値を含む）"""
+        return Mask(self.states.translate(_IS_KNOWN))
+
+    def is_true(self) -> Mask:
+        """値がtrueの行（真偽値の列）"""
+        self._require("bool")
+        return Mask(self.values.tobytes()) & self.has_value()
+
+    def is_false(self) -> Mask:
+        """値がfalseの行（真偽値の列）"""
+        self._require("bool")
+        return Mask(self.values.tobytes().translate(_IS_FALSE)) & self.has_value()
+
+    def eq(self, value: Any) -> Mask:
+        """
+        値が等しい行
+
+        Args:
+            value: 比較する値（文字列の列の場合は文字列）
+
+        Returns:
+            Mask
+        """
+        if self.kind == "str":
+            code = self.pool.lookup(value)
+            if code < 0:
+                return Mask.full(len(self), False)
+            return Mask(bytes(map(code.__eq__, self.values)))
+        return self._compare(int(value).__eq__)
+
+    def lt(self, value: int) -> Mask:
+        """値が指定した値より小さい行（数値の列）"""
+        return self._compare(int(value).__gt__)
+
+    def le(self, value: int) -> Mask:
+        """値が指定した値以下の行（数値の列）"""
+        return self._compare(int(value).__ge__)
+
+    def gt(self, value: int) -> Mask:
+        """値が指定した値より大きい行（数値の列）"""
+        return self._compare(int(value).__lt__)
+
+    def ge(self, value: int) -> Mask:
+        """値が指定した値以上の行（数値の列）"""
+        return self._compare(int(value).__le__)
+
+    def _compare(self, predicate: Callable[[int], Any]) -> Mask:
+        """
+        値がVALUEの行のうち、条件を満たす行を取得
+
+        Args:
+            predicate: 列の値を受け取る組み込みの比較メソッド（例: int(1).__ge__）
+
+        Returns:
+            Mask
+        """
+        if self.kind == "str":
+            raise ValueError(f"文字列の列は大小比較できません: {self.name}")
+        return Mask(bytes(map(predicate, self.values))) & self.has_value()
+
+    def _require(self, kind: str) -> None:
+        if self.kind != kind:
+            raise ValueError(f"{self.name} は{kind}の列ではありません（{self.kind}）")
+
+
+class ResourceTypeTable:
+    """
+    1つのリソースタイプのリソースを行とするテーブル
+    """
+
+    def __init__(self, resource_type: str, pool: StringPool) -> None:
+        """
+        ResourceTypeTableの初期化
+
+        Args:
+            resource_type: リソースタイプ
+            pool: 文字列の辞書
+        """
+        self.resource_type = resource_type
+        self.pool = pool
+        self.addresses: List[str] = []
+        self.blocks: List[Dict[str, Any]] = []
+        self.columns: Dict[str, Column] = {}
+
+    def __len__(self) -> int:
+        return len(self.addresses)
+
+    def column(self, name: str, kind: str) -> Column:
+        """
+        列を取得（まだ作成していない場合はリソースブロックから作成）
+
+        Args:
+            name: 属性名（「ブロック名.属性名」の場合は最初のネストしたブロックの属性）
+            kind: 列の種類（COLUMN_KINDSのキー）
+
+        Returns:
+            Column
+        """
+        key = f"{name}:{kind}"
+        column = self.columns.get(key)
+        if column is None:
+            column = Column(name, kind, self.pool)
+            column.load(self.blocks)
+            self.columns[key] = column
+        return column
+
+    def where(self, mask: Mask) -> List[str]:
+        """
+        条件を満たす行のリソースのアドレスを取得
+
+        Args:
+            mask: 条件
+
+        Returns:
+            アドレスのリスト（テーブルの行の順序）
+        """
+        return list(compress(self.addresses, mask.bits))
+
+    def resources(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        行ごとの(アドレス, リソースブロック)を取得
+
+        Returns:
+            (アドレス, リソースブロック)のリスト
+        """
+        return list(zip(self.addresses, self.blocks))
+
+
+class ResourceTable:
+    """
+    解析結果のリソースをリソースタイプごとのテーブルにまとめたもの
+    """
+
+    def __init__(self) -> None:
+        """
+        ResourceTableの初期化
+        """
+        self.pool = StringPool()
+        self.tables: Dict[str, ResourceTypeTable] = {}
+        self.resource_count = 0
+
+    @classmethod
+    def from_terraform_data(
+        cls,
+        terraform_data: Dict[str, Any],
+        columns: Optional[Dict[str, Dict[str, str]]] = None,
+        resource_types: Optional[Iterable[str]] = None,
+    ) -> "ResourceTable":
+        """
+        TerraformExporterの解析結果からテーブルを作成
+
+        Args:
+            terraform_data: tfparseの解析結果
+            columns: リソースタイプごとに作成しておく列（{属性名: 列の種類}）
+            resource_types: テーブルを作成するリソースタイプ（Noneの場合はすべて）
+
+        Returns:
+            ResourceTable
+        """
+        table = cls()
+        types = set(resource_types) if resource_types is not None else None
+        for resource_type, block in iter_resources(terraform_data):
+            table.resource_count += 1
+            if types is not None and resource_type not in types:
+                continue
+            type_table = table.tables.get(resource_type)
+            if type_table is None:
+                type_table = ResourceTypeTable(resource_type, table.pool)
+                table.tables[resource_type] = type_table
+            type_table.addresses.append(sys.intern(resource_address(resource_type, block)))
+            type_table.blocks.append(block)
+
+        for resource_type, specs in (columns or {}).items():
+            type_table = table.tables.get(resource_type)
+            if type_table is None:
+                continue
+            for name, kind in specs.items():
+                type_table.column(name, kind)
+        return table
+
+    def __getitem__(self, resource_type: str) -> ResourceTypeTable:
+        return self.tables[resource_type]
+
+    def __contains__(self, resource_type: str) -> bool:
+        return resource_type in self.tables
+
+    def get(self, resource_type: str) -> Optional[ResourceTypeTable]:
+        """
+        リソースタイプのテーブルを取得
+
+        Args:
+            resource_type: リソースタイプ
+
+        Returns:
+            ResourceTypeTable（リソースがない場合はNone）
+        """
+        return self.tables.get(resource_type)
@@ -0,0 +1,120 @@
+"""
+tfparseの解析結果からリソースを取り出すためのユーティリティ
+"""
+
+import re
+from typing import Any, Dict, Iterator, Tuple
+
+# リソース以外のブロック（tfparseの解析結果のトップレベルキー）
+NON_RESOURCE_BLOCK_TYPES = frozenset(
+    ["locals", "module", "output", "provider", "terraform", "variable", "moved", "import"]
+)
+
+# 属性を絞り込んだリソースブロックでアドレスを保持するキー
+PRUNED_ADDRESS_KEY = "__address"
+
+# データソースのアドレス（例: module.ec2.data.aws_ami.main）
+DATA_ADDRESS_PATTERN = re.compile(r"(?:^|[.:])data\.")
+
+# アドレス先頭のモジュール部分（例: module.vpc.module.subnets[0].）
+MODULE_PREFIX_PATTERN = re.compile(r"^((?:[^:]*:)?)((?:module\.[^.\[]+(?:\[[^\]]*\])?\.)*)")
+
+
+def iter_resources(terraform_data: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    解析結果に含まれるリソースブロックを列挙する
+
+    データソースや変数・出力などのブロックは除外する。
+
+    Args:
+        terraform_data: tfparseの解析結果
+
+    Yields:
+        (リソースタイプ, リソースブロック)のタプル
+    """
+    for resource_type, blocks in terraform_data.items():
+        if resource_type in NON_RESOURCE_BLOCK_TYPES or not isinstance(blocks, list):
+            continue
+        for block in blocks:
+            if not isinstance(block, dict):
+                continue
+            meta = block.get("__tfmeta")
+            if isinstance(meta, dict) and meta.get("type", "resource") != "resource":
+                continue
+            if PRUNED_ADDRESS_KEY in block and DATA_ADDRESS_PATTERN.search(
+                block[PRUNED_ADDRESS_KEY]
+            ):
+                continue
+            yield resource_type, block
+
+
+def count_resources(terraform_data: Dict[str, Any]) -> int:
+    """
+    解析結果に含まれるリソースの数を数える
+
+    Args:
+        terraform_data: tfparseの解析結果
+
+    Returns:
+        リソース数
+    """
+    return sum(1 for _ in iter_resources(terraform_data))
+
+
+def resource_address(resource_type: str, block: Dict[str, Any]) -> str:
+    """
+    リソースのアドレス（例: module.vpc.aws_subnet.public[0]）を取得
+
+    Args:
+        resource_type: リソースタイプ
+        block: リソースブロック
+
+    Returns:
+        リソースのアドレス
+    """
+    if PRUNED_ADDRESS_KEY in block:
+        return str(block[PRUNED_ADDRESS_KEY])
+
+    meta = block.get("__tfmeta")
+    if isinstance(meta, dict) and meta.get("path"):
+        address = str(meta["path"])
+        # 並列解析で複数のルートを統合した場合はルートのパスを付与して区別する
+        if meta.get("root") and meta["root"] != ".":
+            address = f"{meta['root']}:{address}"
+        return address
+    return f"{resource_type}.{block.get('id', '')}"
+
+
+def module_path(address: str) -> str:
+    """
+    リソースのアドレスからモジュール部分を取得
+
+    Args:
+        address: リソースのアドレス（例: module.vpc.aws_subnet.public[0]）
+
+    Returns:
+        モジュール部分（例: module.vpc）。ルートモジュールの場合は空文字列
+        （並列解析のルートが付与されている場合は "ルート:" を先頭に含む）
+    """
+    match = MODULE_PREFIX_PATTERN.match(address)
+    if not match:
+        return ""
+    root, modules = match.group(1), match.group(2).rstrip(".")
+    return f"{root}{modules}" if modules or root else ""
+
+
+def relative_address(source: str, target: str) -> str:
+    """
+    参照先のアドレスを参照元からの相対的な形式にする
+
+    Args:
+        source: 参照元のアドレス
+        target: 参照先のアドレス
+
+    Returns:
+        参照元と同じモジュールの場合はモジュール部分を省略したアドレス
+    """
+    module = module_path(source)
+    if module and module_path(target) == module:
+        return target[len(module) + 1:]
+    return target
@@ -4,9 +4,11 @@ Terraformコードを解析してJSONに変換するモジュール
 
 import os
 import json
-from typing import Dict, Any, Tuple, Optional, cast
+from typing import Dict, Any, List, Tuple, Optional, cast
 
 from src.config import get_settings
+from src.terraform.parallel_parser import ParallelTerraformParser
+from src.terraform.parse_cache import ParseCache
 
 
 class TerraformExporter:
@@ -14,17 +16,36 @@ class TerraformExporter:
     Terraformコードを解析しJSONに変換するクラス
     """
 
-    def __init__(self, output_dir: Optional[str] = None):
+    def __init__(
+        self,
+        output_dir: Optional[str] = None,
+        use_parse_cache: Optional[bool] = None,
+        parallel: Optional[bool] = None,
+        workers: Optional[int] = None,
+    ):
         """
         TerraformExporterの初期化
         
         Args:
             output_dir: 出力ディレクトリのパス (Noneの場合は設定から取得)
+            use_parse_cache: 解析結果のキャッシュを使用するかどうか (Noneの場合は設定から取得)
+            parallel: ルートごとに並列解析するかどうか (Noneの場合は設定から取得)
+            workers: 並列解析のワーカー数 (Noneの場合は設定から取得)
         """
         settings = get_settings()
         self.output_dir = output_dir or settings["output"]["directory"]
         self._ensure_output_directory()
 
+        if use_parse_cache is None:
+            use_parse_cache = settings["cache"]["parse"]["enabled"]
+        self.parse_cache: Optional[ParseCache] = ParseCache() if use_parse_cache else None
+
+        if parallel is None:
+            parallel = settings["terraform"]["parallel"]
+        self.parallel_parser: Optional[ParallelTerraformParser] = (
+            ParallelTerraformParser(workers=workers) if parallel else None
+        )
+
     def _ensure_output_directory(self) -> str:
         """
         出力ディレクトリが存在することを確認し、なければ作成する
@@ -36,7 +57,10 @@ class TerraformExporter:
         return self.output_dir
 
     def export_to_json(
-        self, terraform_path: str, output_file: Optional[str] = None
+        self,
+        terraform_path: str,
+        output_file: Optional[str] = None,
+        roots: Optional[List[str]] = None,
     ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         """
         Terraformコードを解析し、結果をJSONファイルとして出力する
@@ -44,6 +68,8 @@ class TerraformExporter:
         Args:
             terraform_path: Terraformプロジェクトのパス
             output_file: 出力JSONファイルのパス（指定がなければ自動生成）
+            roots: 並列解析で解析するルートの絶対パスのリスト
+                （Noneの場合はプロジェクト内のすべてのルート）
             
         Returns:
             (解析結果のデータ, 出力ファイルのパス)のタプル
@@ -58,14 +84,37 @@ class TerraformExporter:
                 print("pip install tfparseを実行してインストールしてください。")
                 return None, None
 
-            # Terraformコードを解析
-            parsed = load_from_path(terraform_path)
-            print("Terraformコードの解析に成功しました！")
-
-            # __tfmetaキーを削除
-            if "__tfmeta" in parsed:
-                del parsed["__tfmeta"]
-                print("'__tfmeta'をエクスポート結果から除外しました。")
+            # キャッシュ済みの解析結果を検索
+            fingerprint = None
+            parsed = None
+            if self.parse_cache is not None:
+                mode = "parallel" if self.parallel_parser is not None else ""
+                if self.parallel_parser is not None and roots is not None:
+                    # 一部のルートのみを解析した結果は、ルートの組み合わせごとにキャッシュする
+                    base_path = os.path.realpath(terraform_path)
+                    mode += ":" + ",".join(sorted(os.path.relpath(r, base_path) for r in roots))
+                fingerprint = self.parse_cache.fingerprint(terraform_path, mode=mode)
+                parsed = self.parse_cache.get(fingerprint)
+                if parsed is not None:
+                    print("キャッシュ済みの解析結果を使用します。")
+
+            if parsed is None:
+                # Terraformコードを解析
+                if self.parallel_parser is not None:
+                    parsed = self.parallel_parser.parse(terraform_path, roots)
+                else:
+                    parsed = load_from_path(terraform_path)
+                print("Terraformコードの解析に成功しました！")
+
+                # __tfmetaキーを削除
+                if "__tfmeta" in parsed:
+                    del parsed["__tfmeta"]
+                    print("'__tfmeta'をエクスポート結果から除外しました。")
+
+                # 一部のルートの解析に失敗した結果はキャッシュしない
+                failed = self.parallel_parser is not None and self.parallel_parser.failed_roots
+                if self.parse_cache is not None and fingerprint is not None and not failed:
+                    self.parse_cache.put(fingerprint, parsed)
 
             # 出力ファイル名が指定されていない場合は、デフォルトのファイル名を使用
             settings = get_settings()
@@ -93,6 +142,17 @@ class TerraformExporter:
             print(f"エラー: {e}")
             return None, None
 
+    def get_cache_stats(self) -> Optional[Dict[str, int]]:
+        """
+        解析結果キャッシュのヒット数・ミス数を取得
+        
+        Returns:
+            ヒット数とミス数の辞書（キャッシュが無効な場合はNone）
+        """
+        if self.parse_cache is None:
+            return None
+        return {"hits": self.parse_cache.hits, "misses": self.parse_cache.misses}
+
     def _print_summary(self, parsed_data: Dict[str, Any]) -> None:
         """
         解析結果の概要を表示
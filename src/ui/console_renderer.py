@@ -2,13 +2,23 @@
 リッチコンソールに結果を表示するためのモジュール
 """
 
-from typing import Dict, Any, List
-from rich.console import Console
+import time
+from types import TracebackType
+from typing import Dict, Any, List, Optional, Type
+from rich.console import Console, Group, RenderableType
+from rich.errors import LiveError
+from rich.live import Live
 from rich.panel import Panel
 from rich.table import Table
 from rich.text import Text
 from rich import box
 
+from src.analysis.resource_collapser import format_resources
+from src.analysis.token_estimator import estimate_tokens
+
+# ストリーミング受信中に表示する問題点の最大件数（新しいものから表示）
+LIVE_FINDINGS_ROWS = 10
+
 
 class ConsoleRenderer:
     """
@@ -21,6 +31,18 @@ class ConsoleRenderer:
         """
         self.console = Console()
 
+    def stream_progress(self, enabled: bool = True) -> "StreamProgress":
+        """
+        ストリーミング受信中の進捗を表示するコンテキストを作成
+
+        Args:
+            enabled: 進捗を表示するかどうか
+
+        Returns:
+            受信したテキストの差分をupdateで受け取るStreamProgress
+        """
+        return StreamProgress(self.console, enabled)
+
     def print_analysis_results(self, results: Dict[str, Any]) -> None:
         """
         分析結果をコンソールに表示
@@ -33,6 +55,18 @@ class ConsoleRenderer:
             self.console.print(
                 f"[bold red]エラー: 分析に失敗しました: {results['error']}[/bold red]"
             )
+            # ストリーミングの途中で失敗した場合は受信済みの問題点を表示
+            partial = results.get("partial_result") or {}
+            if partial.get("findings"):
+                self.console.print(
+                    f"\n[bold yellow]失敗するまでに受信した問題点"
+                    f"（{len(partial['findings'])}件）:[/bold yellow]"
+                )
+                self.console.print(findings_table(partial["findings"]))
+            if results.get("partial_report_file"):
+                self.console.print(
+                    f"受信済みの項目を保存しました: [bold]{results['partial_report_file']}[/bold]"
+                )
             return
 
         # 生のテキスト分析が含まれている場合
@@ -46,6 +80,13 @@ class ConsoleRenderer:
             )
             return
 
+        # 分割分析の一部のグループが失敗した場合は結果が不完全であることを示す
+        if results.get("partial"):
+            self.console.print(
+                "[bold yellow]警告: 一部のグループの分析に失敗したため、結果は不完全です"
+                f"（失敗: {', '.join(results.get('failed_chunks', []))}）[/bold yellow]"
+            )
+
         # 概要
         if "overview" in results:
             self.console.print(
@@ -68,33 +109,52 @@ class ConsoleRenderer:
         if "recommendations" in results and results["recommendations"]:
             self._print_recommendations(results["recommendations"])
 
-    def _print_findings(self, findings: List[Dict[str, Any]]) -> None:
+        # 使用したモデル
+        if results.get("model_usage"):
+            self._print_model_usage(results["model_usage"])
+
+        # 差分の分析
+        if results.get("incremental"):
+            self._print_incremental(results["incremental"])
+
+    def _print_model_usage(self, usage: Dict[str, Any]) -> None:
         """
-        問題点をテーブル形式で表示
+        分析に使用したモデルと所要時間を表示
 
         Args:
-            findings: 問題点のリスト
+            usage: 使用したモデルの情報
         """
-        self.console.print("\n[bold]検出された問題点:[/bold]")
+        text = f"\n[dim]分析モデル: {usage.get('model_id')} ({usage.get('tier')})"
+        if usage.get("latency") is not None:
+            text += f", {usage['latency']:.1f}秒"
+        if usage.get("fallback_from"):
+            text += f", {usage['fallback_from']}のタイムアウトにより切り替え"
+        self.console.print(text + "[/dim]")
 
-        table = Table(box=box.ROUNDED)
-        table.add_column("カテゴリ", style="cyan")
-        table.add_column("重要度", style="bold")
-        table.add_column("説明", style="white")
-        table.add_column("推奨対応", style="green")
+    def _print_incremental(self, stats: Dict[str, Any]) -> None:
+        """
+        前回の分析結果との差分のみを分析した場合の件数を表示
 
-        for finding in findings:
-            severity = finding.get("severity", "")
-            severity_style = self._get_severity_style(severity)
+        Args:
+            stats: 差分の件数
+        """
+        self.console.print(
+            f"[dim]前回の分析との差分のみを分析: 追加 {stats['added']}件, "
+            f"変更 {stats['changed']}件, 削除 {stats['removed']}件 "
+            f"(前回の問題点を再利用 {stats['reused_findings']}件, "
+            f"無効化 {stats['dropped_findings']}件, "
+            f"うち再確認 {stats.get('rechecked_findings', 0)}件)[/dim]"
+        )
 
-            table.add_row(
-                finding.get("category", ""),
-                Text(severity, style=severity_style),
-                finding.get("description", ""),
-                finding.get("recommendation", ""),
-            )
+    def _print_findings(self, findings: List[Dict[str, Any]]) -> None:
+        """
+        問題点をテーブル形式で表示
 
-        self.console.print(table)
+        Args:
+            findings: 問題点のリスト
+        """
+        self.console.print("\n[bold]検出された問題点:[/bold]")
+        self.console.print(findings_table(findings))
 
     def _print_recommendations(self, recommendations: List[Dict[str, Any]]) -> None:
         """
@@ -117,6 +177,164 @@ class ConsoleRenderer:
 
             self.console.print(Panel(content, title=title, border_style="green"))
 
+    def print_token_savings(self, stats: Dict[str, int]) -> None:
+        """
+        プロンプトの属性絞り込みによるトークン削減量を表示
+
+        Args:
+            stats: 絞り込み前後の概算トークン数
+        """
+        if not stats or not stats.get("original_tokens"):
+            return
+
+        original = stats["original_tokens"]
+        ratio = stats["saved_tokens"] / original * 100
+        self.console.print(
+            f"プロンプトのトークン数（概算）: {original:,} → "
+            f"[bold green]{stats['prompt_tokens']:,}[/bold green] "
+            f"({ratio:.0f}%削減)"
+        )
+        if stats.get("collapsed_resources"):
+            self.console.print(
+                f"同じ構成のリソースを代表にまとめて省略: "
+                f"[bold]{stats['collapsed_resources']:,}[/bold]件"
+            )
+
+    def print_retry_stats(self, stats: Dict[str, Any]) -> None:
+        """
+        Bedrock呼び出しの再試行と同時実行数の統計を表示
+
+        Args:
+            stats: 再試行と同時実行数の統計
+        """
+        if not stats:
+            return
+
+        self.console.print(
+            f"Bedrock再試行: [bold]{stats['retries']}[/bold]回 "
+            f"(スロットリング: {stats['throttled']}回, "
+            f"残りの再試行回数: {stats['budget_remaining']}/{stats['budget']}) "
+            f"同時実行数の上限: {stats['concurrency_limit']} "
+            f"(最小: {stats['lowest_concurrency_limit']})"
+        )
+        if stats.get("rate_limit_waits"):
+            self.console.print(
+                f"レート制限による待機: [bold]{stats['rate_limit_waits']}[/bold]回 "
+                f"(合計 {stats['rate_limit_wait_seconds']:.1f}秒)"
+            )
+
+    def print_scan_summary(self, results: List[Dict[str, Any]]) -> None:
+        """
+        一括スキャンの結果をルートごとのテーブル形式で表示
+
+        Args:
+            results: ルートごとの実行結果のリスト
+        """
+        self.console.print("\n[bold]スキャン結果サマリー:[/bold]")
+
+        table = Table(box=box.ROUNDED)
+        table.add_column("ルート", style="cyan")
+        table.add_column("状態", style="bold")
+        table.add_column("リソース数", justify="right")
+        table.add_column("可用性スコア", justify="right")
+        table.add_column("問題点", justify="right")
+        table.add_column("解析時間", justify="right")
+        table.add_column("分析時間", justify="right")
+
+        status_styles = {
+            "ok": "bold green",
+            "parsed": "bold green",
+            "partial": "bold yellow",
+            "unstructured": "bold yellow",
+        }
+
+        for result in results:
+            status = result.get("status", "")
+            score = result.get("availability_score")
+            if isinstance(score, (int, float)):
+                color = "green" if score >= 80 else "yellow" if score >= 50 else "red"
+                score_text = Text(f"{score}/100", style=f"bold {color}")
+            else:
+                score_text = Text("-")
+
+            table.add_row(
+                result.get("root", ""),
+                Text(status, style=status_styles.get(status, "bold red")),
+                str(result.get("resource_count", 0)),
+                score_text,
+                str(result.get("findings", "-")),
+                f"{result.get('parse_time', 0.0):.1f}秒",
+                f"{result.get('analysis_time', 0.0):.1f}秒",
+            )
+
+        self.console.print(table)
+
+    def print_history_timeline(self, timeline: List[Dict[str, Any]]) -> None:
+        """
+        リビジョンごとの可用性スコアと問題点の変化を古い順に表示
+
+        Args:
+            timeline: リビジョンごとの結果のリスト（古い順）
+        """
+        self.console.print("\n[bold]リビジョンごとの評価:[/bold]")
+
+        table = Table(box=box.ROUNDED)
+        table.add_column("リビジョン", style="cyan")
+        table.add_column("日時")
+        table.add_column("可用性スコア", justify="right")
+        table.add_column("変化", justify="right")
+        table.add_column("問題点", justify="right")
+        table.add_column("追加", justify="right")
+        table.add_column("解消", justify="right")
+        table.add_column("件名")
+
+        for entry in timeline:
+            score = entry.get("availability_score")
+            if isinstance(score, (int, float)):
+                color = "green" if score >= 80 else "yellow" if score >= 50 else "red"
+                score_text = Text(f"{score}/100", style=f"bold {color}")
+                # 一部のグループの分析に失敗したリビジョンは問題点の変化を比較しない
+                if entry.get("status") == "partial":
+                    score_text.append(" (partial)", style="yellow")
+            elif entry.get("status") not in ("ok", "parsed"):
+                score_text = Text(str(entry.get("status", "")), style="bold red")
+            else:
+                score_text = Text("-")
+            delta = entry.get("score_delta")
+            delta_text = (
+                Text(f"{delta:+}", style="green" if delta > 0 else "red" if delta < 0 else "")
+                if isinstance(delta, (int, float))
+                else Text("-")
+            )
+            revision = entry.get("short", "")
+            if entry.get("reused_from"):
+                revision += f" (={entry['reused_from']})"
+            table.add_row(
+                revision,
+                str(entry.get("date", ""))[:16].replace("T", " "),
+                score_text,
+                delta_text,
+                str(entry.get("finding_count", "-")),
+                str(len(entry.get("added_findings", []))),
+                str(len(entry.get("resolved_findings", []))),
+                entry.get("subject", ""),
+            )
+
+        self.console.print(table)
+
+        for entry in timeline:
+            added = entry.get("added_findings", [])
+            resolved = entry.get("resolved_findings", [])
+            if not added and not resolved:
+                continue
+            self.console.print(
+                f"\n[bold]{entry.get('short', '')}[/bold] {entry.get('subject', '')}"
+            )
+            for label in added:
+                self.console.print(Text(f"  + {label}", style="red"))
+            for label in resolved:
+                self.console.print(Text(f"  - {label}", style="green"))
+
     def _get_severity_style(self, severity: str) -> str:
         """
         重要度に対応するスタイルを取得
@@ -127,11 +345,148 @@ class ConsoleRenderer:
         Returns:
             対応するスタイル
         """
-        severity = severity.lower()
-        if severity in ["高", "high"]:
-            return "bold red"
-        elif severity in ["中", "medium"]:
-            return "bold yellow"
-        elif severity in ["低", "low"]:
-            return "bold green"
-        return "bold"
+        return severity_style(severity)
+
+
+def findings_table(findings: List[Dict[str, Any]]) -> Table:
+    """
+    問題点のテーブルを作成
+
+    Args:
+        findings: 問題点のリスト
+
+    Returns:
+        問題点のテーブル
+    """
+    table = Table(box=box.ROUNDED)
+    table.add_column("カテゴリ", style="cyan")
+    table.add_column("重要度", style="bold")
+    table.add_column("説明", style="white")
+    table.add_column("推奨対応", style="green")
+
+    for finding in findings:
+        severity = str(finding.get("severity", ""))
+        description = str(finding.get("description", ""))
+        # 代表にまとめて分析したリソースは、同じ構成のすべてのリソースを対象として示す
+        resources = format_resources(finding.get("resources"))
+        if resources:
+            description += f"\n対象: {resources}"
+        table.add_row(
+            str(finding.get("category", "")),
+            Text(severity, style=severity_style(severity)),
+            description,
+            str(finding.get("recommendation", "")),
+        )
+
+    return table
+
+
+def severity_style(severity: str) -> str:
+    """
+    重要度に対応するスタイルを取得
+
+    Args:
+        severity: 重要度（高/中/低またはhigh/medium/low）
+
+    Returns:
+        対応するスタイル
+    """
+    severity = severity.lower()
+    if severity in ["高", "high"]:
+        return "bold red"
+    elif severity in ["中", "medium"]:
+        return "bold yellow"
+    elif severity in ["低", "low"]:
+        return "bold green"
+    return "bold"
+
+
+class StreamProgress:
+    """
+    Bedrockからストリーミングで受信中のテキスト量と経過時間をライブ表示するクラス
+    """
+
+    def __init__(self, console: Console, enabled: bool = True) -> None:
+        """
+        StreamProgressの初期化
+
+        Args:
+            console: 表示に使用するコンソール
+            enabled: 進捗を表示するかどうか
+        """
+        self.console = console
+        self.enabled = enabled
+        self.live: Optional[Live] = None
+        self.chars = 0
+        self.tokens = 0
+        self.start_time = time.time()
+        self.findings: List[Dict[str, Any]] = []
+        self.recommendation_count = 0
+
+    def __enter__(self) -> "StreamProgress":
+        self.start_time = time.time()
+        if self.enabled:
+            self.live = Live(self._render(), console=self.console, transient=True)
+            try:
+                self.live.start()
+            except LiveError:
+                # 他のライブ表示が実行中の場合（一括スキャンなど）は表示しない
+                self.live = None
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if self.live is not None:
+            self.live.stop()
+            self.live = None
+
+    def update(self, delta: str) -> None:
+        """
+        受信したテキストの差分を反映して表示を更新
+
+        Args:
+            delta: 受信したテキストの差分
+        """
+        self.chars += len(delta)
+        self.tokens += estimate_tokens(delta)
+        if self.live is not None:
+            self.live.update(self._render())
+
+    def show_items(self, items: Dict[str, List[Dict[str, Any]]]) -> None:
+        """
+        受信中に閉じた問題点と推奨事項を表示に反映する
+
+        Args:
+            items: 項目名ごとの受信済みのオブジェクトのリスト
+        """
+        self.findings = items.get("findings", [])
+        self.recommendation_count = len(items.get("recommendations", []))
+        if self.live is not None:
+            self.live.update(self._render())
+
+    def _render(self) -> RenderableType:
+        """
+        進捗の表示内容を作成
+
+        Returns:
+            表示する内容
+        """
+        elapsed = time.time() - self.start_time
+        progress = Text.from_markup(
+            f"Bedrockから受信中... [bold]{self.chars:,}[/bold]文字 "
+            f"(約{self.tokens:,}トークン) [dim]{elapsed:.1f}秒[/dim]"
+        )
+        if not self.findings and not self.recommendation_count:
+            return progress
+
+        summary = Text.from_markup(
+            f"受信済み: 問題点 [bold]{len(self.findings)}[/bold]件 / "
+            f"推奨事項 [bold]{self.recommendation_count}[/bold]件"
+        )
+        if not self.findings:
+            return Group(progress, summary)
+        return Group(progress, summary, findings_table(self.findings[-LIVE_FINDINGS_ROWS:]))